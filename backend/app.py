@@ -1,11 +1,14 @@
+import itertools
+import json
 import logging
+import math
 import os
 import sys
 import threading
 import time
 import uuid
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from flask import Flask, jsonify, request, send_file
 from flask_cors import CORS
@@ -17,10 +20,15 @@ from werkzeug.utils import secure_filename
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(ROOT)
 
+from src.activity import find_active_segments, segment_frame_ranges, segment_gaps, segment_progress
 from src.feedback_generator import FeedbackGenerator
+from src.overlay_track import encode_overlay_track
+from src.pose_cache import PoseCache
 from src.pose_detector import PoseDetector
+from src.pose_track import PoseTrack
+from src.preview import quick_look
 from src.stroke_analyzer import StrokeAnalyzer
-from src.video_processor import VideoProcessor
+from src.video_processor import KeyframeIndex, VideoProcessor, get_capabilities
 from src.visualizer import Visualizer
 
 # ---------------------------------------------------------------------------
@@ -59,7 +67,39 @@ RESULTS_FOLDER = os.path.join(ROOT, 'backend', 'results')
 ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov'}
 MAX_FILE_SIZE = 200 * 1024 * 1024   # 200 MB — keeps memory & processing time sane
 MAX_WORKERS = 3                      # Max concurrent video analyses
+# Pose-detection processes per analysis — share the CPU cores between concurrent jobs
+POSE_WORKERS = int(os.getenv('POSE_WORKERS', max(1, (os.cpu_count() or 1) // MAX_WORKERS)))
+# Annotated-video render processes per analysis (chunks joined with ffmpeg)
+RENDER_WORKERS = int(os.getenv('RENDER_WORKERS', POSE_WORKERS))
+ANALYSIS_FPS = float(os.getenv('ANALYSIS_FPS', 15))  # Pose samples per second of video
+# Stroke-rate-aware sampling density (overrides ANALYSIS_FPS when enabled)
+ADAPTIVE_SAMPLING = os.getenv('ADAPTIVE_SAMPLING', 'false').lower() in ('1', 'true', 'yes')
+INFERENCE_SIZE = int(os.getenv('INFERENCE_SIZE', 640)) or None  # Longest side fed to MediaPipe, 0 = full res
 FILE_TTL_HOURS = 24                  # Auto-delete files older than this
+# Pose extraction results keyed by video content, so re-uploads skip MediaPipe
+POSE_CACHE_FOLDER = os.getenv('POSE_CACHE_DIR', os.path.join(ROOT, 'backend', 'cache', 'poses'))
+POSE_CACHE_MAX_MB = int(os.getenv('POSE_CACHE_MAX_MB', 512))  # 0 disables the cache
+# Keyframe indexes of uploads, which make seeking into them cheap
+KEYFRAME_CACHE_FOLDER = os.getenv('KEYFRAME_CACHE_DIR', os.path.join(ROOT, 'backend', 'cache', 'keyframes'))
+# Publish provisional results at 10/25/50/100% of the video.  With
+# POSE_WORKERS > 1 they are published as the shards complete in order,
+# otherwise detected frames stream straight into the analyzer (ignored with
+# ADAPTIVE_SAMPLING, which needs two passes).
+PROGRESSIVE_RESULTS = os.getenv('PROGRESSIVE_RESULTS', 'true').lower() in ('1', 'true', 'yes')
+# 'server' burns the overlay into an annotated video.  'client' skips
+# rendering: the upload is kept and served with a compact landmark/angle
+# track that the browser draws during playback; the annotated video is only
+# rendered on request (POST /api/result/<id>/render).  'highlights' renders
+# only short clips around each detected issue, joined into a summary reel
+# served as the result video (the full video when there is no reel).
+# Uploads may override this with a render_mode form field.
+RENDER_MODE = os.getenv('RENDER_MODE', 'server').lower()
+RENDER_MODES = ('server', 'client', 'highlights')
+# Find the stretches of actual swimming with a cheap motion/pose pre-pass and
+# only run full detection and analysis inside them (rest at the wall, push
+# offs and an empty pool are skipped).  The segments are listed in the
+# report and in the job status.
+ACTIVE_SEGMENTS = os.getenv('ACTIVE_SEGMENTS', 'false').lower() in ('1', 'true', 'yes')
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['RESULTS_FOLDER'] = RESULTS_FOLDER
@@ -68,6 +108,9 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(RESULTS_FOLDER, exist_ok=True)
 
+pose_cache = PoseCache(POSE_CACHE_FOLDER, POSE_CACHE_MAX_MB * 1024 * 1024) if POSE_CACHE_MAX_MB > 0 else None
+KeyframeIndex.cache_dir = KEYFRAME_CACHE_FOLDER
+
 # ---------------------------------------------------------------------------
 # Thread-safe job status store
 # ---------------------------------------------------------------------------
@@ -90,6 +133,27 @@ def _get_status(video_id: str) -> dict:
 # Thread pool — limits concurrent analyses to MAX_WORKERS
 # ---------------------------------------------------------------------------
 executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+# Quick-look previews get their own pool so they never queue behind full analyses
+preview_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+# Quick looks still reading their upload, by video id
+preview_futures: dict = {}
+
+
+def _finish_preview(video_id: str):
+    """
+    Make sure no quick look still reads the upload before it is moved or deleted.
+
+    A preview that has not started yet is cancelled (the full results are
+    about to be ready); a running one is waited for.
+    """
+    with status_lock:
+        future = preview_futures.pop(video_id, None)
+    if future is None:
+        return
+    if future.cancel():
+        _set_status(video_id, preview={'status': 'failed', 'error': 'Full analysis finished first'})
+    else:
+        wait([future])
 
 # ---------------------------------------------------------------------------
 # Simple in-memory rate limiter (per IP, sliding window)
@@ -114,6 +178,16 @@ def _is_rate_limited(ip: str) -> bool:
 # ---------------------------------------------------------------------------
 # File helpers
 # ---------------------------------------------------------------------------
+def _parse_seconds(value):
+    """Optional non-negative number of seconds from a form field (missing/blank = None)."""
+    if value is None or not value.strip():
+        return None
+    seconds = float(value)
+    if not math.isfinite(seconds) or seconds < 0:
+        raise ValueError(f"not a valid time: {value}")
+    return seconds
+
+
 def _allowed_file(filename: str) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -157,35 +231,239 @@ def _cleanup_old_files():
 # Run cleanup once at startup
 _cleanup_old_files()
 
+# Probe video encoders once, so jobs open their writer directly
+video_capabilities = get_capabilities()
+
 
 # ---------------------------------------------------------------------------
 # Video processing (runs in thread pool worker)
 # ---------------------------------------------------------------------------
-def _process_video(video_id: str, input_path: str, output_path: str, report_path: str):
-    """Full analysis pipeline executed in a pool worker thread."""
-    try:
-        _set_status(video_id, status='processing', progress=10,
-                    message='Detecting poses...')
-
-        pose_detector = PoseDetector()
-        stroke_analyzer = StrokeAnalyzer()
-        visualizer = Visualizer()
-        feedback_generator = FeedbackGenerator()
-
-        poses = pose_detector.process_video(input_path)
+def _snapshot_payload(results: dict, feedback_generator: FeedbackGenerator) -> dict:
+    """JSON form of a StrokeAnalyzer snapshot for /api/status."""
+    payload = {
+        'progress': int(round(results['progress'] * 100)),
+        'confidence': results['confidence'],
+    }
+    if 'error' in results:
+        payload['error'] = results['error']
+        return payload
+    payload.update(
+        score=feedback_generator.calculate_score(results),
+        summary=feedback_generator.generate_summary(results),
+        metrics=results['metrics'],
+        issues=[issue.to_dict() for issue in results['issues']],
+    )
+    return payload
+
+
+def _detect_and_analyze(video_id, input_path, pose_detector, stroke_analyzer, feedback_generator,
+                        frame_range=None, segments=None):
+    """
+    Pose detection plus stroke analysis; returns (pose track, analysis results).
+
+    Cached poses are analyzed in one go.  Otherwise, with PROGRESSIVE_RESULTS,
+    detected frames (or shards, with POSE_WORKERS > 1) are fed to the
+    analyzer as they arrive and each checkpoint snapshot is published as
+    ``partial_results`` in the job status.  Only source frames
+    `frame_range` (default: all) are decoded, or only the active `segments`
+    (src.activity) when given, which are then added to the analysis results.
+    """
+    ranges = segment_frame_ranges(segments) if segments else [frame_range]
+    cache_key = None
+    if pose_cache is not None:
+        cache_key = pose_cache.key_for(
+            pose_detector, input_path, target_fps=ANALYSIS_FPS, adaptive=ADAPTIVE_SAMPLING,
+            frame_range=frame_range, segments=ranges if segments else None
+        )
+        poses = pose_cache.get(cache_key)
+        if poses is not None:
+            logger.info(f"[{video_id}] Pose cache hit: {len(poses)} frames")
+            _set_status(video_id, progress=50, message='Analyzing stroke mechanics...')
+            analysis = stroke_analyzer.analyze_video(poses)
+            if segments and 'error' not in analysis:
+                analysis['segments'] = segments
+            return poses, analysis
+
+    if PROGRESSIVE_RESULTS and not ADAPTIVE_SAMPLING:
+        def _publish(results):
+            snapshot = _snapshot_payload(results, feedback_generator)
+            _set_status(video_id, partial_results=snapshot,
+                        progress=10 + int(40 * results['progress']),
+                        message=f"Detecting poses... ({snapshot['progress']}% of video analyzed)")
+
+        start_frame, end_frame = frame_range or (0, VideoProcessor(input_path).frame_count)
+        checkpoints = dict(
+            total_frames=end_frame - start_frame, on_checkpoint=_publish, keep_track=True,
+            start_frame=start_frame, progress_of=segment_progress(segments) if segments else None
+        )
+        if POSE_WORKERS > 1:
+            # Keep the shards; checkpoints are published as they complete in order
+            def _detect(on_shard):
+                for window in ranges:
+                    pose_detector.process_video(
+                        input_path, workers=POSE_WORKERS, target_fps=ANALYSIS_FPS,
+                        frame_range=window, on_shard=on_shard
+                    )
+
+            analysis = stroke_analyzer.analyze_shards(_detect, **checkpoints)
+        else:
+            analysis = stroke_analyzer.analyze_stream(
+                itertools.chain.from_iterable(
+                    pose_detector.stream_video(input_path, target_fps=ANALYSIS_FPS, frame_range=window)
+                    for window in ranges
+                ),
+                **checkpoints
+            )
+        poses = stroke_analyzer.track
+    else:
+        tracks = [
+            pose_detector.process_video(
+                input_path, workers=POSE_WORKERS, target_fps=ANALYSIS_FPS,
+                adaptive=ADAPTIVE_SAMPLING, frame_range=window
+            )
+            for window in ranges
+        ]
+        poses = tracks[0] if len(tracks) == 1 else PoseTrack.merge(tracks)
+        analysis = None
+
+    logger.info(f"[{video_id}] Pose track: {len(poses)} frames, {poses.nbytes / 1024:.0f} KiB")
+    if cache_key is not None and len(poses):
+        pose_cache.put(cache_key, poses)
+
+    if analysis is None:
         _set_status(video_id, progress=50, message='Analyzing stroke mechanics...')
-
         analysis = stroke_analyzer.analyze_video(poses)
-        _set_status(video_id, progress=65, message='Generating annotated video...')
+    if segments and 'error' not in analysis:
+        analysis['segments'] = segments
+    return poses, analysis
+
 
-        visualizer.create_annotated_video(poses, output_path, analysis, input_path)
-        _set_status(video_id, progress=85, message='Re-encoding for browser...')
+def _process_preview(video_id: str, input_path: str, frame_range=None):
+    """Quick-look preview executed in a preview pool thread."""
+    try:
+        preview = quick_look(input_path, frame_range=frame_range)
+        if preview['summary'] is None:
+            _set_status(video_id, preview={'status': 'failed', 'error': 'No swimmer found for a quick look'})
+            return
+        results = preview['results']
+        _set_status(video_id, preview={
+            'status': 'completed',
+            'score': preview['score'],
+            'summary': preview['summary'],
+            'window': preview['window'],
+            'issues': [issue.to_dict() for issue in results['issues']],
+        })
+        logger.info(f"[{video_id}] Quick look done in {preview['elapsed']:.1f}s")
+    except Exception as exc:
+        logger.warning(f"[{video_id}] Quick look failed: {exc}")
+        _set_status(video_id, preview={'status': 'failed', 'error': str(exc)})
+
+
+def _find_result(video_id: str, suffix: str):
+    """Path of a results file ``<video_id><suffix>.<video ext>``, or None."""
+    # Annotated results are always saved as .mp4; also check other extensions
+    # (e.g. AVI if re-encode was skipped) and the kept source upload.
+    for ext in ['mp4'] + sorted(ALLOWED_EXTENSIONS - {'mp4'}):
+        path = os.path.join(RESULTS_FOLDER, f'{video_id}{suffix}.{ext}')
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _render_video(video_id, poses, analysis, input_path, output_path, visualizer,
+                  publish_progress=True, frame_range=None):
+    """Render the annotated video (of `frame_range` only, if given) and make sure it plays in browsers."""
+    visualizer.create_annotated_video(poses, output_path, analysis, input_path,
+                                      workers=RENDER_WORKERS, frame_range=frame_range)
+    if not visualizer.encoded_for_browser:
+        if publish_progress:
+            _set_status(video_id, progress=85, message='Re-encoding for browser...')
 
         # Best-effort ffmpeg re-encode; non-fatal if ffmpeg is absent
         reencoded = VideoProcessor.reencode_for_browser(output_path)
         if not reencoded:
             logger.warning(f"[{video_id}] ffmpeg re-encode skipped — video may not play in all browsers")
 
+
+def _render_highlights(video_id, poses, analysis, input_path, output_path, visualizer, frame_range=None):
+    """
+    Highlights render mode: one clip per issue, the reel becomes the result video.
+
+    Without issues to clip, or without ffmpeg to join the reel, the full
+    annotated video (of `frame_range`) is rendered as the result instead.
+    """
+    highlights = visualizer.create_highlight_clips(
+        poses, analysis, input_path, os.path.join(RESULTS_FOLDER, f'{video_id}_clip'),
+        summary_path=output_path
+    )
+    if highlights['summary'] is None:
+        logger.info(f"[{video_id}] No highlight reel; rendering the full video instead")
+        _set_status(video_id, progress=70, message='Generating annotated video...')
+        _render_video(video_id, poses, analysis, input_path, output_path, visualizer,
+                      frame_range=frame_range)
+    clips = [
+        {
+            'issue_type': clip['issue'].issue_type,
+            'start_time': clip['start_time'],
+            'end_time': clip['end_time'],
+            'url': f"/api/result/{video_id}/clips/{n}",
+        }
+        for n, clip in enumerate(highlights['clips'], start=1)
+    ]
+    _set_status(video_id, clips=clips)
+
+
+def _save_overlay(video_id: str, poses: PoseTrack, analysis: dict, input_path: str):
+    """Client render mode: keep the upload, the overlay track and the poses for later rendering."""
+    with open(os.path.join(RESULTS_FOLDER, f'{video_id}_overlay.json'), 'w') as fh:
+        json.dump(encode_overlay_track(poses, analysis), fh, separators=(',', ':'))
+    poses.save(os.path.join(RESULTS_FOLDER, f'{video_id}_poses.npz'))
+
+    ext = input_path.rsplit('.', 1)[1]
+    _finish_preview(video_id)
+    os.replace(input_path, os.path.join(RESULTS_FOLDER, f'{video_id}_source.{ext}'))
+
+
+def _process_video(video_id: str, input_path: str, output_path: str, report_path: str,
+                   render_mode: str = RENDER_MODE, frame_range=None):
+    """Full analysis pipeline executed in a pool worker thread."""
+    try:
+        segments = None
+        if ACTIVE_SEGMENTS:
+            _set_status(video_id, status='processing', progress=5,
+                        message='Finding swimming segments...')
+            segments = find_active_segments(input_path, frame_range=frame_range)
+            if segments:
+                logger.info(f"[{video_id}] {len(segments)} active swimming segments")
+                # Rendering spans the analyzed segments
+                frame_range = (segments[0]['start_frame'], segments[-1]['end_frame'])
+                _set_status(video_id, segments=segments, frame_range=list(frame_range))
+
+        _set_status(video_id, status='processing', progress=10,
+                    message='Detecting poses...')
+
+        pose_detector = PoseDetector(inference_size=INFERENCE_SIZE)
+        stroke_analyzer = StrokeAnalyzer(gaps=segment_gaps(segments) if segments else ())
+        visualizer = Visualizer()
+        feedback_generator = FeedbackGenerator()
+
+        poses, analysis = _detect_and_analyze(
+            video_id, input_path, pose_detector, stroke_analyzer, feedback_generator,
+            frame_range=frame_range, segments=segments
+        )
+
+        if render_mode == 'client':
+            _set_status(video_id, progress=65, message='Preparing overlay data...')
+            _save_overlay(video_id, poses, analysis, input_path)
+        elif render_mode == 'highlights':
+            _set_status(video_id, progress=65, message='Generating highlight clips...')
+            _render_highlights(video_id, poses, analysis, input_path, output_path, visualizer,
+                               frame_range=frame_range)
+        else:
+            _set_status(video_id, progress=65, message='Generating annotated video...')
+            _render_video(video_id, poses, analysis, input_path, output_path, visualizer,
+                          frame_range=frame_range)
+
         _set_status(video_id, progress=92, message='Generating report...')
 
         report = feedback_generator.generate_report(analysis)
@@ -193,7 +471,7 @@ def _process_video(video_id: str, input_path: str, output_path: str, report_path
             fh.write(report)
 
         _set_status(video_id, status='completed', progress=100,
-                    message='Analysis complete!')
+                    message='Analysis complete!', render_mode=render_mode)
         logger.info(f"[{video_id}] Analysis completed successfully")
 
     except Exception as exc:
@@ -202,6 +480,7 @@ def _process_video(video_id: str, input_path: str, output_path: str, report_path
         _set_status(video_id, status='failed', error=str(exc))
     finally:
         # Clean up the raw upload to save disk space
+        _finish_preview(video_id)
         try:
             if os.path.exists(input_path):
                 os.remove(input_path)
@@ -209,6 +488,23 @@ def _process_video(video_id: str, input_path: str, output_path: str, report_path
             pass
 
 
+def _render_on_request(video_id: str, source_path: str, frame_range=None):
+    """Client render mode: burn the overlay into a video after all (pool worker thread)."""
+    try:
+        poses = PoseTrack.load(os.path.join(RESULTS_FOLDER, f'{video_id}_poses.npz'))
+        segments = _get_status(video_id).get('segments')
+        analysis = StrokeAnalyzer(gaps=segment_gaps(segments) if segments else ()).analyze_video(poses)
+        output_path = os.path.join(RESULTS_FOLDER, f'{video_id}_analyzed.mp4')
+        _render_video(video_id, poses, analysis, source_path, output_path, Visualizer(),
+                      publish_progress=False, frame_range=frame_range)
+        _set_status(video_id, render={'status': 'completed'})
+        logger.info(f"[{video_id}] Rendered annotated video on request")
+    except Exception as exc:
+        import traceback
+        logger.error(f"[{video_id}] Rendering failed:\n{traceback.format_exc()}")
+        _set_status(video_id, render={'status': 'failed', 'error': str(exc)})
+
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
@@ -246,14 +542,40 @@ def upload_video():
         os.remove(input_path)
         return jsonify({'error': 'File does not appear to be a valid video'}), 400
 
+    render_mode = request.form.get('render_mode', RENDER_MODE).lower()
+    if render_mode not in RENDER_MODES:
+        os.remove(input_path)
+        return jsonify({'error': f"render_mode must be one of: {', '.join(RENDER_MODES)}"}), 400
+
+    # Optional time window (seconds): only that part of the upload is decoded
+    frame_range = None
+    try:
+        start = _parse_seconds(request.form.get('start'))
+        end = _parse_seconds(request.form.get('end'))
+        if start is not None or end is not None:
+            frame_range = VideoProcessor(input_path).frame_range(start, end)
+    except ValueError as exc:
+        os.remove(input_path)
+        return jsonify({'error': f"Invalid start/end: {exc}"}), 400
+
     with status_lock:
         processing_status[video_id] = {
             'status': 'queued',
             'progress': 0,
             'message': 'Upload complete, queued for analysis...',
         }
-
-    executor.submit(_process_video, video_id, input_path, output_path, report_path)
+        if frame_range is not None:
+            processing_status[video_id]['frame_range'] = list(frame_range)
+
+    # Optional quick-look preview alongside the full analysis
+    if request.form.get('quick_look', '').lower() in ('1', 'true', 'yes'):
+        _set_status(video_id, preview={'status': 'processing'})
+        future = preview_executor.submit(_process_preview, video_id, input_path, frame_range)
+        with status_lock:
+            preview_futures[video_id] = future
+
+    executor.submit(_process_video, video_id, input_path, output_path, report_path, render_mode,
+                    frame_range)
     logger.info(f"[{video_id}] Queued for analysis (from {client_ip})")
 
     return jsonify({'video_id': video_id, 'message': 'Upload successful, analysis queued'}), 200
@@ -267,21 +589,68 @@ def get_status(video_id):
     return jsonify(status), 200
 
 
+def _send_video(path: str):
+    ext = path.rsplit('.', 1)[1]
+    mimetype = 'video/mp4' if ext == 'mp4' else f'video/{ext}'
+    return send_file(path, mimetype=mimetype, as_attachment=False)
+
+
 @app.route('/api/result/<video_id>/video', methods=['GET'])
 def get_result_video(video_id):
-    # Results are always saved as .mp4
-    video_path = os.path.join(RESULTS_FOLDER, f'{video_id}_analyzed.mp4')
-    if os.path.exists(video_path):
-        return send_file(video_path, mimetype='video/mp4', as_attachment=False)
+    video_path = _find_result(video_id, '_analyzed')
+    if video_path is None:
+        return jsonify({'error': 'Video result not found'}), 404
+    return _send_video(video_path)
+
+
+@app.route('/api/result/<video_id>/clips/<int:clip_number>', methods=['GET'])
+def get_result_clip(video_id, clip_number):
+    """One issue highlight clip (highlights render mode); the list is in the job status."""
+    prefix = f'{video_id}_clip_{clip_number}_'
+    for name in os.listdir(RESULTS_FOLDER):
+        if name.startswith(prefix) and name.endswith('.mp4'):
+            return _send_video(os.path.join(RESULTS_FOLDER, name))
+    return jsonify({'error': 'Clip not found'}), 404
+
+
+@app.route('/api/result/<video_id>/source', methods=['GET'])
+def get_result_source(video_id):
+    """Original upload, kept in client render mode for playback under the overlay."""
+    source_path = _find_result(video_id, '_source')
+    if source_path is None:
+        return jsonify({'error': 'Source video not found'}), 404
+    return _send_video(source_path)
+
+
+@app.route('/api/result/<video_id>/overlay', methods=['GET'])
+def get_result_overlay(video_id):
+    """Per-frame landmark and angle track (see src.overlay_track) for client-side drawing."""
+    overlay_path = os.path.join(RESULTS_FOLDER, f'{video_id}_overlay.json')
+    if not os.path.exists(overlay_path):
+        return jsonify({'error': 'Overlay not found'}), 404
+    return send_file(overlay_path, mimetype='application/json')
+
+
+@app.route('/api/result/<video_id>/render', methods=['POST'])
+def render_result_video(video_id):
+    """Queue rendering of the annotated video for a client render mode result."""
+    if _find_result(video_id, '_analyzed') is not None:
+        return jsonify({'status': 'completed'}), 200
+
+    source_path = _find_result(video_id, '_source')
+    if source_path is None or not os.path.exists(os.path.join(RESULTS_FOLDER, f'{video_id}_poses.npz')):
+        return jsonify({'error': 'Nothing to render for this video'}), 404
 
-    # Fallback: check other extensions (e.g. AVI if re-encode was skipped)
-    for ext in ALLOWED_EXTENSIONS:
-        alt_path = os.path.join(RESULTS_FOLDER, f'{video_id}_analyzed.{ext}')
-        if os.path.exists(alt_path):
-            mimetype = 'video/mp4' if ext == 'mp4' else f'video/{ext}'
-            return send_file(alt_path, mimetype=mimetype, as_attachment=False)
+    with status_lock:
+        job = processing_status.setdefault(video_id, {'status': 'completed'})
+        if job.get('render', {}).get('status') == 'processing':
+            return jsonify({'status': 'processing'}), 202
+        job['render'] = {'status': 'processing'}
+        frame_range = job.get('frame_range')
 
-    return jsonify({'error': 'Video result not found'}), 404
+    executor.submit(_render_on_request, video_id, source_path, frame_range)
+    logger.info(f"[{video_id}] Queued annotated video rendering")
+    return jsonify({'status': 'processing'}), 202
 
 
 @app.route('/api/result/<video_id>/report', methods=['GET'])
@@ -295,7 +664,11 @@ def get_result_report(video_id):
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'ok', 'workers': MAX_WORKERS}), 200
+    return jsonify({
+        'status': 'ok',
+        'workers': MAX_WORKERS,
+        'video_encoding': video_capabilities.as_dict(),
+    }), 200
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,147 @@
+import React, { useEffect, useRef } from 'react';
+
+const OVERLAY_FORMAT_VERSION = 1;
+
+// Same colours and thresholds as the server-side renderer (src/visualizer.py)
+const COLOR_SKELETON = 'rgb(0, 255, 0)';
+const COLOR_CRITICAL = 'rgb(255, 0, 0)';
+const COLOR_MODERATE = 'rgb(255, 165, 0)';
+const SKELETON_MIN_VISIBILITY = 50; // percent
+const POSE_HOLD_MS = 1000; // POSE_HOLD_SECONDS: no stale pose between analyzed segments
+
+// Undo the delta encoding of src/overlay_track.py: cumulative sum along the frame axis
+function undelta(values, rowSize) {
+  const out = Int32Array.from(values);
+  for (let i = rowSize; i < out.length; i++) {
+    out[i] += out[i - rowSize];
+  }
+  return out;
+}
+
+export function decodeOverlay(data) {
+  if (data.version !== OVERLAY_FORMAT_VERSION) {
+    throw new Error(`Unsupported overlay format ${data.version}`);
+  }
+  const landmarks = data.landmark_names.length;
+  return {
+    ...data,
+    landmarks,
+    frameNumbers: undelta(data.frame_numbers, 1),
+    timestampsMs: undelta(data.timestamps_ms, 1),
+    xy: undelta(data.xy, landmarks * 2),
+  };
+}
+
+// Last analyzed row at or before `ms` (the renderer forward-fills the same way)
+function rowAt(track, ms) {
+  let lo = 0;
+  let hi = track.frames - 1;
+  let row = -1;
+  while (lo <= hi) {
+    const mid = (lo + hi) >> 1;
+    if (track.timestampsMs[mid] <= ms) {
+      row = mid;
+      lo = mid + 1;
+    } else {
+      hi = mid - 1;
+    }
+  }
+  return row;
+}
+
+function angleColor(angle) {
+  if (angle >= 80 && angle <= 100) return COLOR_SKELETON;
+  if (angle > 120) return COLOR_CRITICAL;
+  return COLOR_MODERATE;
+}
+
+function drawRow(ctx, track, row) {
+  const L = track.landmarks;
+  const point = (i) => [track.xy[(row * L + i) * 2], track.xy[(row * L + i) * 2 + 1]];
+  const visible = (i) => track.visibility[row * L + i] >= SKELETON_MIN_VISIBILITY;
+
+  ctx.strokeStyle = COLOR_SKELETON;
+  ctx.lineWidth = 2;
+  for (const [a, b] of track.skeleton) {
+    if (visible(a) && visible(b)) {
+      const [ax, ay] = point(a);
+      const [bx, by] = point(b);
+      ctx.beginPath();
+      ctx.moveTo(ax, ay);
+      ctx.lineTo(bx, by);
+      ctx.stroke();
+    }
+  }
+  for (let i = 0; i < L; i++) {
+    if (visible(i)) {
+      const [x, y] = point(i);
+      ctx.beginPath();
+      ctx.arc(x, y, 3, 0, 2 * Math.PI);
+      ctx.stroke();
+    }
+  }
+
+  // Joint angle labels next to each joint
+  ctx.font = 'bold 16px sans-serif';
+  track.angle_names.forEach((name, k) => {
+    const angle = track.angles[row * track.angle_names.length + k];
+    if (angle < 0) return;
+    const [x, y] = point(track.landmark_names.indexOf(name));
+    const text = `${angle}°`;
+    const width = ctx.measureText(text).width;
+    ctx.fillStyle = 'black';
+    ctx.fillRect(x - 5, y - 30, width + 10, 25);
+    ctx.fillStyle = angleColor(angle);
+    ctx.fillText(text, x, y - 11);
+  });
+}
+
+// Canvas laid over a <video>, redrawn on every animation frame during playback
+function OverlayCanvas({ videoRef, track }) {
+  const canvasRef = useRef(null);
+
+  useEffect(() => {
+    const video = videoRef.current;
+    const canvas = canvasRef.current;
+    if (!video || !canvas || !track) return undefined;
+
+    const [height, width] = track.frame_shape;
+    canvas.width = width;
+    canvas.height = height;
+    const ctx = canvas.getContext('2d');
+
+    let lastRow = null;
+    let handle;
+    const draw = () => {
+      const ms = video.currentTime * 1000;
+      let row = rowAt(track, ms);
+      if (row >= 0 && ms - track.timestampsMs[row] >= POSE_HOLD_MS) row = -1;
+      if (row !== lastRow) {
+        ctx.clearRect(0, 0, width, height);
+        if (row >= 0 && track.detected[row]) {
+          drawRow(ctx, track, row);
+        }
+        lastRow = row;
+      }
+      handle = requestAnimationFrame(draw);
+    };
+    handle = requestAnimationFrame(draw);
+    return () => cancelAnimationFrame(handle);
+  }, [videoRef, track]);
+
+  return (
+    <canvas
+      ref={canvasRef}
+      style={{
+        position: 'absolute',
+        top: 0,
+        left: 0,
+        width: '100%',
+        height: '100%',
+        pointerEvents: 'none'
+      }}
+    />
+  );
+}
+
+export default OverlayCanvas;
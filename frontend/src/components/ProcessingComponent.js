@@ -104,6 +104,37 @@ function ProcessingComponent({ videoId, onComplete }) {
             }}>
               {status.message || 'Processing...'}
             </div>
+
+            {status.preview && status.preview.status === 'completed' && !status.partial_results && (
+              <div style={{
+                textAlign: 'center',
+                marginTop: '15px',
+                padding: '12px',
+                background: '#F3E5F5',
+                borderRadius: '12px',
+                color: '#555'
+              }}>
+                <strong>Quick look: {status.preview.score}/10</strong>
+                {' '}(preliminary, from {Math.round(status.preview.window[1] - status.preview.window[0])}s of video)
+              </div>
+            )}
+
+            {status.partial_results && status.partial_results.score !== undefined && (
+              <div style={{
+                textAlign: 'center',
+                marginTop: '15px',
+                padding: '12px',
+                background: '#F3E5F5',
+                borderRadius: '12px',
+                color: '#555'
+              }}>
+                <strong>Early look: {status.partial_results.score}/10</strong>
+                {' '}({status.partial_results.progress}% of video analyzed, {
+                  status.partial_results.confidence >= 0.75 ? 'high' :
+                  status.partial_results.confidence >= 0.4 ? 'medium' : 'low'
+                } confidence)
+              </div>
+            )}
           </div>
 
           <div style={{
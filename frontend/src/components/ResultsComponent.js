@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useCallback, useRef } from 'react';
 
 import { API_BASE_URL } from '../config';
+import OverlayCanvas, { decodeOverlay } from './OverlayCanvas';
 
 function ResultsComponent({ videoId, onReset }) {
   const [report, setReport] = useState('');
@@ -12,6 +13,9 @@ function ResultsComponent({ videoId, onReset }) {
   const [biggestRedFlag, setBiggestRedFlag] = useState(null);
   const [strengths, setStrengths] = useState([]);
   const videoRef = useRef(null);
+  // Client render mode: overlay track drawn over the original upload
+  const [overlay, setOverlay] = useState(null);
+  const [renderState, setRenderState] = useState(null); // null, processing, completed, failed
 
   const fetchReport = useCallback(async () => {
     try {
@@ -35,6 +39,41 @@ function ResultsComponent({ videoId, onReset }) {
     fetchReport();
   }, [fetchReport]);
 
+  useEffect(() => {
+    // Only present when the backend skipped server-side rendering
+    fetch(`${API_BASE_URL}/result/${videoId}/overlay`)
+      .then((response) => (response.ok ? response.json() : null))
+      .then((data) => data && setOverlay(decodeOverlay(data)))
+      .catch(() => setOverlay(null));
+  }, [videoId]);
+
+  useEffect(() => {
+    if (renderState !== 'processing') return undefined;
+    const interval = setInterval(async () => {
+      try {
+        const response = await fetch(`${API_BASE_URL}/status/${videoId}`);
+        const data = await response.json();
+        if (data.render && data.render.status !== 'processing') {
+          setRenderState(data.render.status);
+        }
+      } catch (err) {
+        // Keep polling
+      }
+    }, 2000);
+    return () => clearInterval(interval);
+  }, [renderState, videoId]);
+
+  const requestRender = async () => {
+    setRenderState('processing');
+    try {
+      const response = await fetch(`${API_BASE_URL}/result/${videoId}/render`, { method: 'POST' });
+      const data = await response.json();
+      setRenderState(response.ok ? data.status : 'failed');
+    } catch (err) {
+      setRenderState('failed');
+    }
+  };
+
   const parseReport = (reportText) => {
     // Extract score
     const scoreMatch = reportText.match(/Overall Technique Score: (\d+)\/10/);
@@ -99,6 +138,8 @@ function ResultsComponent({ videoId, onReset }) {
   };
 
   const videoUrl = `${API_BASE_URL}/result/${videoId}/video`;
+  const sourceUrl = `${API_BASE_URL}/result/${videoId}/source`;
+  const showRenderedVideo = !overlay || renderState === 'completed';
 
   const getScoreEmoji = (score) => {
     if (score >= 9) return '🏆';
@@ -252,7 +293,8 @@ function ResultsComponent({ videoId, onReset }) {
           margin: '0 auto',
           borderRadius: '12px',
           overflow: 'hidden',
-          boxShadow: '0 8px 24px rgba(0,0,0,0.15)'
+          boxShadow: '0 8px 24px rgba(0,0,0,0.15)',
+          position: 'relative'
         }}>
           <video
             ref={videoRef}
@@ -262,24 +304,37 @@ function ResultsComponent({ videoId, onReset }) {
             loop
             style={{ width: '100%', display: 'block' }}
           >
-            <source src={videoUrl} type="video/mp4" />
+            <source src={overlay ? sourceUrl : videoUrl} type="video/mp4" />
             Your browser does not support video playback.
           </video>
+          {overlay && <OverlayCanvas videoRef={videoRef} track={overlay} />}
         </div>
 
         <div style={{ textAlign: 'center', marginTop: '20px' }}>
-          <a
-            href={videoUrl}
-            download
-            className="button"
-            style={{
-              textDecoration: 'none',
-              display: 'inline-block',
-              background: 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)'
-            }}
-          >
-            📥 Download Video
-          </a>
+          {showRenderedVideo ? (
+            <a
+              href={videoUrl}
+              download
+              className="button"
+              style={{
+                textDecoration: 'none',
+                display: 'inline-block',
+                background: 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)'
+              }}
+            >
+              📥 Download Video
+            </a>
+          ) : (
+            <button
+              className="button"
+              onClick={requestRender}
+              disabled={renderState === 'processing'}
+              style={{ background: 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)' }}
+            >
+              {renderState === 'processing' ? '⏳ Rendering video...' :
+                renderState === 'failed' ? '🔁 Rendering failed — try again' : '🎬 Render Video for Download'}
+            </button>
+          )}
         </div>
       </div>
 
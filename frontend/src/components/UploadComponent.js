@@ -1,10 +1,19 @@
 import React, { useState, useRef } from 'react';
 import { API_BASE_URL } from '../config';
 
+// "750", "12:30" or "1:02:30" -> seconds (blank -> null)
+const parseTime = (text) => {
+  if (!text.trim()) return null;
+  return text.trim().split(':').reduce((total, part) => total * 60 + Number(part), 0);
+};
+
 function UploadComponent({ onFileSelected, onUploadComplete, selectedFile }) {
   const [dragging, setDragging] = useState(false);
   const [uploading, setUploading] = useState(false);
   const [error, setError] = useState(null);
+  const [startTime, setStartTime] = useState('');
+  const [endTime, setEndTime] = useState('');
+  const [quickLook, setQuickLook] = useState(false);
   const fileInputRef = useRef(null);
 
   const handleDragOver = (e) => {
@@ -46,11 +55,23 @@ function UploadComponent({ onFileSelected, onUploadComplete, selectedFile }) {
   const handleUpload = async () => {
     if (!selectedFile) return;
 
+    const start = parseTime(startTime);
+    const end = parseTime(endTime);
+    if (Number.isNaN(start) || Number.isNaN(end)) {
+      setError('Enter times as seconds or minutes:seconds (e.g. 12:30)');
+      return;
+    }
+
     setUploading(true);
     setError(null);
 
     const formData = new FormData();
     formData.append('video', selectedFile);
+    // The quick look is a second detection pass; only run it when asked for
+    if (quickLook) formData.append('quick_look', 'true');
+    // Only analyze part of a long session
+    if (start !== null) formData.append('start', String(start));
+    if (end !== null) formData.append('end', String(end));
 
     try {
       const response = await fetch(`${API_BASE_URL}/upload`, {
@@ -137,6 +158,34 @@ function UploadComponent({ onFileSelected, onUploadComplete, selectedFile }) {
                 </p>
               </div>
             </div>
+            <div style={{ display: 'flex', gap: '10px', alignItems: 'center', marginBottom: '15px', color: '#666' }}>
+              <span>Only analyze from</span>
+              <input
+                type="text"
+                placeholder="0:00"
+                value={startTime}
+                onChange={(e) => setStartTime(e.target.value)}
+                style={{ width: '80px', padding: '6px' }}
+              />
+              <span>to</span>
+              <input
+                type="text"
+                placeholder="end"
+                value={endTime}
+                onChange={(e) => setEndTime(e.target.value)}
+                style={{ width: '80px', padding: '6px' }}
+              />
+              <span style={{ fontSize: '0.85rem' }}>(optional, for long sessions)</span>
+            </div>
+            <label style={{ display: 'flex', gap: '8px', alignItems: 'center', marginBottom: '15px', color: '#666' }}>
+              <input
+                type="checkbox"
+                checked={quickLook}
+                onChange={(e) => setQuickLook(e.target.checked)}
+              />
+              <span>Quick look while waiting</span>
+              <span style={{ fontSize: '0.85rem' }}>(preliminary score from a few seconds of video; uses extra server time)</span>
+            </label>
             <button
               className="button"
               onClick={handleUpload}
@@ -6,11 +6,16 @@ Analyzes freestyle swimming technique from video and provides coaching feedback.
 """
 
 import argparse
+import itertools
 import sys
 import os
 from pathlib import Path
 
-from src.pose_detector import PoseDetector
+from src.activity import find_active_segments, segment_frame_ranges, segment_gaps, segment_progress
+from src.pose_cache import DEFAULT_CACHE_DIR, PoseCache
+from src.pose_detector import PoseDetector, DEFAULT_INFERENCE_SIZE
+from src.pose_track import PoseTrack
+from src.preview import PREVIEW_WINDOW_SECONDS, quick_look
 from src.video_processor import VideoProcessor
 from src.stroke_analyzer import StrokeAnalyzer
 from src.visualizer import Visualizer
@@ -32,6 +37,33 @@ Examples:
 
   # Generate report only (no video output)
   python main.py video.mp4 --report-only
+
+  # Spread pose detection over 8 CPU cores
+  python main.py video.mp4 --workers 8
+
+  # Also render the annotated video in 8 parallel chunks
+  python main.py video.mp4 --workers 8 --render-workers 8
+
+  # Analyze 15 frames per second, even for 60/120 fps slow-motion footage
+  python main.py video.mp4 --analysis-fps 15
+
+  # Only render short clips around each detected issue (plus a summary reel)
+  python main.py video.mp4 --highlights
+
+  # Always re-run pose detection instead of reusing cached poses
+  python main.py video.mp4 --no-cache
+
+  # Print a preliminary score from a short window first, then run the full analysis
+  python main.py video.mp4 --quick-look
+
+  # Only analyze one rep of a long training session (from 12:30 to 14:05)
+  python main.py session.mp4 --start 750 --end 845
+
+  # Skip rest at the wall: only analyze the stretches of actual swimming
+  python main.py session.mp4 --active-only
+
+  # Analyze a multi-hour session in constant memory (report only)
+  python main.py session.mp4 --stream
         """
     )
 
@@ -58,13 +90,114 @@ Examples:
         help='Skip text report, only generate annotated video'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Worker processes for pose detection (default: 1; try your CPU core count)'
+    )
+
+    parser.add_argument(
+        '--render-workers',
+        type=int,
+        default=1,
+        help='Processes rendering chunks of the annotated video in parallel (default: 1; needs ffmpeg)'
+    )
+
+    parser.add_argument(
+        '--analysis-fps',
+        type=float,
+        default=None,
+        help='Analyze this many frames per second regardless of source fps (default: every 2nd frame)'
+    )
+
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Choose the analysis rate per segment from the detected stroke rate'
+    )
+
+    parser.add_argument(
+        '--inference-size',
+        type=int,
+        default=DEFAULT_INFERENCE_SIZE,
+        help=f'Longest frame side used for pose detection, 0 = full resolution (default: {DEFAULT_INFERENCE_SIZE})'
+    )
+
+    parser.add_argument(
+        '--no-roi',
+        action='store_true',
+        help='Always run pose detection on the full frame instead of tracking the swimmer'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the pose cache'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        default=DEFAULT_CACHE_DIR,
+        help=f'Pose cache directory (default: {DEFAULT_CACHE_DIR})'
+    )
+
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Analyze frames as they are detected, in constant memory (report only, no cache)'
+    )
+
+    parser.add_argument(
+        '--start',
+        type=float,
+        default=None,
+        help='Only analyze the video from this many seconds on (default: beginning)'
+    )
+
+    parser.add_argument(
+        '--end',
+        type=float,
+        default=None,
+        help='Only analyze the video up to this many seconds (default: end)'
+    )
+
+    parser.add_argument(
+        '--active-only',
+        action='store_true',
+        help='Find the active swimming segments with a quick pre-pass and only analyze those'
+    )
+
+    parser.add_argument(
+        '--highlights',
+        action='store_true',
+        help='Render short clips around each detected issue plus a summary reel instead of the full video'
+    )
+
+    parser.add_argument(
+        '--quick-look',
+        action='store_true',
+        help=f'Print a preliminary score from a ~{PREVIEW_WINDOW_SECONDS:.0f}s window before the full analysis'
+    )
+
     args = parser.parse_args()
+    if args.stream:
+        # The annotated video needs the whole pose track
+        args.report_only = True
 
     # Validate input file
     if not os.path.exists(args.video):
         print(f"Error: Video file not found: {args.video}")
         sys.exit(1)
 
+    # Time window to analyze; the rest of the file is never decoded
+    frame_range = None
+    if args.start is not None or args.end is not None:
+        try:
+            frame_range = VideoProcessor(args.video).frame_range(args.start, args.end)
+        except ValueError as e:
+            parser.error(str(e))
+
     # Set output path
     if args.output is None:
         args.output = VideoProcessor.generate_output_path(args.video)
@@ -73,31 +206,99 @@ Examples:
     print("SWIM STROKE ANALYZER")
     print("=" * 60)
     print(f"Input video: {args.video}")
+    if frame_range is not None:
+        fps = VideoProcessor(args.video).fps
+        print(f"Time range: {frame_range[0] / fps:.1f}-{frame_range[1] / fps:.1f}s")
     if not args.report_only:
         print(f"Output video: {args.output}")
     print("")
 
     try:
+        if args.quick_look:
+            print("Quick look: analyzing a short window...")
+            preview = quick_look(args.video, frame_range=frame_range)
+            if preview['summary'] is not None:
+                start, end = preview['window']
+                print(f"✓ Preliminary ({start:.0f}-{end:.0f}s, {preview['elapsed']:.1f}s): {preview['summary']}")
+            else:
+                print("  (no swimmer found for a quick look)")
+            print("Continuing with the full analysis...")
+            print("")
+
+        # Frame ranges to run full detection on
+        segments = None
+        ranges = [frame_range]
+        if args.active_only:
+            print("Finding active swimming segments...")
+            segments = find_active_segments(args.video, frame_range=frame_range)
+            if segments:
+                ranges = segment_frame_ranges(segments)
+                for segment in segments:
+                    print(f"  {segment['start_time']:.1f}-{segment['end_time']:.1f}s")
+                print(f"✓ {len(segments)} segments")
+            else:
+                print("  (no clear swimming segments found; analyzing everything)")
+            print("")
+
         # Step 1: Extract pose data from video
         print("Step 1/4: Detecting pose in video frames...")
-        detector = PoseDetector()
-        pose_data = detector.process_video(args.video)
+        detector = PoseDetector(
+            inference_size=args.inference_size or None,
+            track_roi=not args.no_roi
+        )
+        analyzer = StrokeAnalyzer(gaps=segment_gaps(segments) if segments else ())
 
-        if not pose_data:
-            print("Error: Failed to process video")
-            sys.exit(1)
+        if args.stream:
+            # Steps 1 and 2 together: each frame is analyzed as soon as it is detected
+            print("Step 2/4: Analyzing stroke mechanics while detecting...")
+            feedback = FeedbackGenerator()
 
-        print(f"✓ Processed {len(pose_data)} frames")
-        print("")
+            def print_checkpoint(results):
+                if 'error' not in results:
+                    print(f"  Provisional ({results['progress']:.0%} of video, "
+                          f"confidence {results['confidence']:.2f}): {feedback.generate_summary(results)}")
+
+            start_frame, end_frame = frame_range or (0, VideoProcessor(args.video).frame_count)
+            analysis_results = analyzer.analyze_stream(
+                itertools.chain.from_iterable(
+                    detector.stream_video(args.video, target_fps=args.analysis_fps, frame_range=window)
+                    for window in ranges
+                ),
+                total_frames=end_frame - start_frame,
+                on_checkpoint=print_checkpoint,
+                start_frame=start_frame,
+                progress_of=segment_progress(segments) if segments else None
+            )
+        else:
+            sampling = dict(workers=args.workers, target_fps=args.analysis_fps, adaptive=args.adaptive)
+            if args.no_cache:
+                tracks = [detector.process_video(args.video, frame_range=window, **sampling)
+                          for window in ranges]
+            else:
+                # Reuses earlier results for the same video and detector settings
+                cache = PoseCache(args.cache_dir)
+                tracks = [cache.process_video(detector, args.video, frame_range=frame_range,
+                                              segments=ranges if segments else None, **sampling)]
+            pose_data = tracks[0] if len(tracks) == 1 else PoseTrack.merge(tracks)
+
+            if not pose_data:
+                print("Error: Failed to process video")
+                sys.exit(1)
+
+            print(f"✓ Processed {len(pose_data)} frames")
+            print("")
 
-        # Step 2: Analyze stroke mechanics
-        print("Step 2/4: Analyzing stroke mechanics...")
-        analyzer = StrokeAnalyzer()
-        analysis_results = analyzer.analyze_video(pose_data)
+            # Step 2: Analyze stroke mechanics
+            print("Step 2/4: Analyzing stroke mechanics...")
+            analysis_results = analyzer.analyze_video(pose_data)
 
         if 'error' in analysis_results:
             print(f"Error: {analysis_results['error']}")
             sys.exit(1)
+        if segments:
+            analysis_results['segments'] = segments
+            # Render from the first segment to the end of the last one
+            frame_range = (segments[0]['start_frame'], segments[-1]['end_frame'])
 
         print("✓ Analysis complete")
         print("")
@@ -123,19 +324,38 @@ Examples:
             print("")
 
         # Step 4: Create annotated video
-        if not args.report_only:
+        if not args.report_only and args.highlights:
+            print("Step 4/4: Creating issue highlight clips...")
+            base = os.path.splitext(args.output)[0]
+            highlights = Visualizer().create_highlight_clips(
+                pose_data,
+                analysis_results,
+                args.video,
+                base,
+                summary_path=f"{base}_highlights.mp4"
+            )
+            if highlights['clips']:
+                print(f"✓ {len(highlights['clips'])} clips saved")
+            else:
+                print("  (no issues to highlight)")
+            print("")
+        elif not args.report_only:
             print("Step 4/4: Creating annotated video...")
             visualizer = Visualizer()
             output_video = visualizer.create_annotated_video(
                 pose_data,
                 args.output,
                 analysis_results,
-                args.video
+                args.video,
+                workers=args.render_workers,
+                frame_range=frame_range
             )
             print(f"✓ Video saved to: {output_video}")
 
             # Best-effort H.264 re-encode for browser playback
-            if VideoProcessor.reencode_for_browser(output_video):
+            if visualizer.encoded_for_browser:
+                print("✓ Encoded to H.264 in a single pass")
+            elif VideoProcessor.reencode_for_browser(output_video):
                 print("✓ Re-encoded to H.264 for browser compatibility")
             else:
                 print("  (ffmpeg not found — skipping browser re-encode)")
@@ -1,6 +1,7 @@
 """Swim stroke analyzer package."""
 
 from src.pose_detector import PoseDetector
+from src.pose_track import PoseTrack
 from src.video_processor import VideoProcessor
 from src.stroke_analyzer import StrokeAnalyzer
 from src.visualizer import Visualizer
@@ -8,6 +9,7 @@ from src.feedback_generator import FeedbackGenerator
 
 __all__ = [
     'PoseDetector',
+    'PoseTrack',
     'VideoProcessor',
     'StrokeAnalyzer',
     'Visualizer',
@@ -0,0 +1,197 @@
+"""Finding the stretches of a video in which the swimmer is actually swimming."""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.models.freestyle_rules import MIN_VISIBILITY
+from src.pose_detector import PoseDetector, clamp_frame_range
+from src.sampling import FrameSampler
+from src.video_processor import KeyframeIndex
+
+# The pre-pass measures motion on ACTIVITY_FPS grayscale frames per second,
+# shrunk to ACTIVITY_FRAME_WIDTH pixels wide, and runs one pose probe (at
+# ACTIVITY_INFERENCE_SIZE) every ACTIVITY_PROBE_SECONDS.
+ACTIVITY_FPS = 4.0
+ACTIVITY_FRAME_WIDTH = 160
+ACTIVITY_PROBE_SECONDS = 2.0
+ACTIVITY_INFERENCE_SIZE = 320
+
+# A sample is moving when its motion energy reaches this fraction of the
+# video's 90th percentile (so the threshold adapts to camera and lighting),
+# and at least MIN_MOTION_ENERGY grey levels so static footage (percentile
+# near 0) is not all moving
+ACTIVITY_MOTION_FRACTION = 0.3
+MIN_MOTION_ENERGY = 1.0
+
+# Active stretches separated by less than ACTIVITY_MAX_GAP_SECONDS are one
+# segment (a breath, a missed probe); segments shorter than
+# ACTIVITY_MIN_SEGMENT_SECONDS are dropped, and the rest are widened by
+# ACTIVITY_PADDING_SECONDS on both sides.
+ACTIVITY_MAX_GAP_SECONDS = 4.0
+ACTIVITY_MIN_SEGMENT_SECONDS = 6.0
+ACTIVITY_PADDING_SECONDS = 1.0
+
+
+def _swimming_pose(pose: Optional[Dict]) -> Optional[bool]:
+    """
+    Whether a single detection looks like a swimmer in the water.
+
+    Nobody in frame is not swimming, and neither is an upright torso
+    (standing or hanging on the wall); a horizontal torso is.  None when
+    the torso is not visible enough to tell, leaving it to the motion.
+    """
+    if pose is None:
+        return False
+    landmarks = pose['landmarks']
+    torso = ('left_shoulder', 'right_shoulder', 'left_hip', 'right_hip')
+    if any(landmarks[name]['visibility'] < MIN_VISIBILITY for name in torso):
+        return None
+    dx = (landmarks['left_shoulder']['x'] + landmarks['right_shoulder']['x']
+          - landmarks['left_hip']['x'] - landmarks['right_hip']['x'])
+    dy = (landmarks['left_shoulder']['y'] + landmarks['right_shoulder']['y']
+          - landmarks['left_hip']['y'] - landmarks['right_hip']['y'])
+    return abs(dx) >= abs(dy)
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """(start, end) index ranges of the True runs of a boolean array, end exclusive."""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+
+def find_active_segments(
+    video_path: str,
+    detector: Optional[PoseDetector] = None,
+    frame_range: Optional[Tuple[int, int]] = None
+) -> List[Dict]:
+    """
+    Locate the segments of a video (or of `frame_range`) with active swimming.
+
+    One cheap pass decodes the video, keeping ACTIVITY_FPS small grayscale
+    frames per second for motion energy (mean absolute difference between
+    consecutive samples) and running a pose probe on every
+    ACTIVITY_PROBE_SECONDS.  A sample is active when it is moving and its
+    nearest probe does not rule out a swimmer lying in the water, so
+    resting at the wall, standing and an empty pool are left out.
+
+    Args:
+        video_path: Path to video file
+        detector: Detector for the probes (default: one at
+            ACTIVITY_INFERENCE_SIZE without ROI tracking)
+        frame_range: Only look inside these source frames [start, end)
+
+    Returns:
+        ``{'start_frame', 'end_frame', 'start_time', 'end_time'}``
+        dictionaries in order, frames end exclusive; empty if no active
+        swimming was found.
+    """
+    if detector is None:
+        detector = PoseDetector(inference_size=ACTIVITY_INFERENCE_SIZE, track_roi=False)
+
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    first, last = clamp_frame_range(frame_range, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+    sampler = FrameSampler(target_fps=ACTIVITY_FPS)
+    probe_every = max(1, int(round(ACTIVITY_PROBE_SECONDS * ACTIVITY_FPS)))
+
+    sample_frames, energy, probes = [], [], []
+    previous = None
+    try:
+        KeyframeIndex.for_video(video_path).seek(cap, first)
+        for frame_number in range(first, last):
+            if not cap.grab():
+                break
+            if not sampler.keep(frame_number, frame_number / fps):
+                continue
+            ret, frame = cap.retrieve()
+            if not ret:
+                continue
+
+            h, w = frame.shape[:2]
+            small = cv2.resize(
+                frame, (ACTIVITY_FRAME_WIDTH, max(1, round(h * ACTIVITY_FRAME_WIDTH / w))),
+                interpolation=cv2.INTER_AREA
+            )
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.int16)
+            if len(sample_frames) % probe_every == 0:
+                detector.reset_tracking()  # Probes are seconds apart
+                probes.append(_swimming_pose(detector.detect_pose(frame)))
+
+            sample_frames.append(frame_number)
+            energy.append(0.0 if previous is None else float(np.mean(np.abs(small - previous))))
+            previous = small
+    finally:
+        cap.release()
+
+    if len(sample_frames) < 2:
+        return []
+
+    # The first sample has no predecessor; give it its neighbour's motion
+    energy[0] = energy[1]
+    energy = np.asarray(energy)
+    moving = energy >= max(ACTIVITY_MOTION_FRACTION * np.percentile(energy, 90), MIN_MOTION_ENERGY)
+    # Probes that could not tell (None) leave the decision to the motion
+    swimming = np.array([probe is not False for probe in probes])
+    nearest_probe = np.minimum(np.rint(np.arange(len(energy)) / probe_every).astype(int), len(probes) - 1)
+    active = moving & swimming[nearest_probe]
+
+    # Close short gaps, then drop short segments
+    sample_frames = np.asarray(sample_frames)
+    runs = []
+    for start, end in _runs(active):
+        if runs and (sample_frames[start] - sample_frames[runs[-1][1] - 1]) / fps < ACTIVITY_MAX_GAP_SECONDS:
+            runs[-1] = (runs[-1][0], end)
+        else:
+            runs.append((start, end))
+
+    padding = int(round(ACTIVITY_PADDING_SECONDS * fps))
+    segments = []
+    for start, end in runs:
+        start_frame = int(sample_frames[start])
+        end_frame = int(sample_frames[end - 1]) + 1
+        if (end_frame - start_frame) / fps < ACTIVITY_MIN_SEGMENT_SECONDS:
+            continue
+        start_frame = max(first, start_frame - padding)
+        end_frame = min(last, end_frame + padding)
+        if segments and start_frame <= segments[-1]['end_frame']:
+            start_frame = segments.pop()['start_frame']  # Padding made them touch
+        segments.append({
+            'start_frame': start_frame,
+            'end_frame': end_frame,
+            'start_time': start_frame / fps,
+            'end_time': end_frame / fps,
+        })
+    return segments
+
+
+def segment_frame_ranges(segments: List[Dict]) -> List[Tuple[int, int]]:
+    """(start_frame, end_frame) of each segment from find_active_segments."""
+    return [(segment['start_frame'], segment['end_frame']) for segment in segments]
+
+
+def segment_gaps(segments: List[Dict]) -> List[Tuple[float, float]]:
+    """(start_time, end_time) of the stretches between segments, for StrokeAnalyzer."""
+    return [(before['end_time'], after['start_time']) for before, after in zip(segments, segments[1:])]
+
+
+def segment_progress(segments: List[Dict]) -> Callable[[int], float]:
+    """
+    Fraction of the segments' frames up to and including a frame number.
+
+    For StrokeAnalyzer.analyze_stream when only the segments are analyzed.
+    """
+    starts = np.array([segment['start_frame'] for segment in segments])
+    lengths = np.array([segment['end_frame'] - segment['start_frame'] for segment in segments])
+    before = np.concatenate([[0], np.cumsum(lengths)])
+    total = max(1, int(before[-1]))
+
+    def progress(frame_number: int) -> float:
+        i = int(np.searchsorted(starts, frame_number, side='right')) - 1
+        if i < 0:
+            return 0.0
+        done = before[i] + min(frame_number + 1 - starts[i], lengths[i])
+        return float(done) / total
+
+    return progress
@@ -43,6 +43,16 @@ class FeedbackGenerator:
         report.append(f"Overall Technique Score: {rating}/10")
         report.append("")
 
+        # ====== WHICH PART OF THE VIDEO WAS ANALYZED ======
+        segments = analysis_results.get('segments')
+        if segments:
+            report.append(f"🏁 Analyzed {len(segments)} swimming segment{'s' if len(segments) != 1 else ''} "
+                          f"(rest and wall time skipped):")
+            for n, segment in enumerate(segments, 1):
+                report.append(f"   Segment {n}: {self._format_time(segment['start_time'])} - "
+                              f"{self._format_time(segment['end_time'])}")
+            report.append("")
+
         # ====== QUICK INSIGHT (THE HOOK) ======
         insight = self._generate_quick_insight(rating, critical_issues, moderate_issues)
         report.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -169,6 +179,10 @@ class FeedbackGenerator:
 
         return " | ".join(summary)
 
+    def calculate_score(self, analysis_results: Dict) -> int:
+        """Overall technique score (1-10) for analysis results, as shown in the report."""
+        return self._calculate_overall_rating(analysis_results['issues'])
+
     def _calculate_overall_rating(self, issues: List[FreestyleIssue]) -> int:
         """
         Calculate overall technique rating (1-10).
@@ -247,6 +261,11 @@ class FeedbackGenerator:
 
         return strengths
 
+    def _format_time(self, seconds: float) -> str:
+        """Video position as m:ss."""
+        minutes, secs = divmod(int(round(seconds)), 60)
+        return f"{minutes}:{secs:02d}"
+
     def _format_metrics(self, metrics: Dict) -> str:
         """Format metrics section."""
         lines = []
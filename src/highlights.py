@@ -0,0 +1,134 @@
+"""Finding the moments of a video where each technique issue is most pronounced."""
+
+from typing import Dict, List
+
+import numpy as np
+
+from src.kinematics import KinematicsTable
+from src.models.freestyle_rules import MIN_VISIBILITY
+from src.pose_track import VISIBILITY, Y, PoseTrack
+from src.stroke_analyzer import body_rotation, centerline_distance
+from src.stroke_cycles import moving_average
+
+# Length of each highlight clip, centred on the worst moment of its issue
+HIGHLIGHT_CLIP_SECONDS = 4.0
+
+# Per-frame signals are averaged over this long before picking the worst
+# moment, so a single noisy detection cannot win
+HIGHLIGHT_SMOOTHING_SECONDS = 1.0
+
+
+def issue_signals(track: PoseTrack, analysis: Dict) -> Dict[str, np.ndarray]:
+    """
+    (N,) per-row "how bad" signal for every issue type, higher = worse.
+
+    Rows where the issue cannot be measured (no pose, landmarks not visible)
+    are NaN.  Stroke rate issues use the duration of the left-arm stroke
+    cycle each row belongs to.
+    """
+    features = KinematicsTable(track)
+    detected = track.detected
+
+    def visible(*names):
+        mask = detected.copy()
+        for name in names:
+            mask &= track.landmark(name)[:, VISIBILITY] >= MIN_VISIBILITY
+        return mask
+
+    def angle(name):
+        return np.where(features.angle_visible(name, MIN_VISIBILITY), features.angle(name), np.nan)
+
+    rotation = np.where(visible('left_shoulder', 'right_shoulder', 'left_hip', 'right_hip'),
+                        body_rotation(track), np.nan)
+    entry = np.fmax(*[
+        np.where(visible(wrist, 'left_shoulder', 'right_shoulder'), centerline_distance(track, wrist), np.nan)
+        for wrist in ('left_wrist', 'right_wrist')
+    ])
+    # Head lift: how far the nose rises above its typical height
+    head_lift = np.where(visible('nose'), track.landmark('nose')[:, Y], np.nan)
+    if np.isfinite(head_lift).any():
+        head_lift = (np.nanmedian(head_lift) - head_lift) / track.frame_shape[0]
+
+    cycle_duration = np.full(len(track), np.nan)
+    cycles = analysis.get('cycles')
+    if cycles is not None and cycles.count('left'):
+        cycle = cycles.cycle_of_row('left')
+        durations = cycles.end_times('left') - cycles.start_times('left')
+        inside = cycle >= 0
+        cycle_duration[inside] = durations[cycle[inside]]
+
+    elbow = np.fmax(angle('left_elbow'), angle('right_elbow'))
+    knee = np.fmin(angle('left_knee'), angle('right_knee'))
+    return {
+        'dropped_elbow': elbow,
+        'flat_body': -rotation,
+        'over_rotation': rotation,
+        'crossing_centerline': entry,
+        'head_lifting': head_lift,
+        'excessive_knee_bend': -knee,
+        'slow_stroke_rate': cycle_duration,
+        'fast_stroke_rate': -cycle_duration,
+    }
+
+
+def _smoothed(signal: np.ndarray, window: int) -> np.ndarray:
+    """Moving average of a signal with NaN gaps (NaN where no sample is in the window)."""
+    valid = np.isfinite(signal)
+    sums = moving_average(np.where(valid, signal, 0.0), window)
+    counts = moving_average(valid.astype(np.float64), window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def find_highlights(
+    track: PoseTrack,
+    analysis: Dict,
+    clip_seconds: float = HIGHLIGHT_CLIP_SECONDS
+) -> List[Dict]:
+    """
+    One clip window per detected issue, centred on its worst moment.
+
+    Args:
+        track: Pose track the analysis was run on
+        analysis: StrokeAnalyzer results (its ``issues`` decide which clips exist)
+        clip_seconds: Clip length
+
+    Returns:
+        ``{'issue', 'start_frame', 'end_frame', 'start_time', 'end_time',
+        'peak_time'}`` dictionaries in the order of ``analysis['issues']``
+        (most severe first); frames are source frame numbers, end exclusive.
+    """
+    if not len(track) or not analysis.get('issues'):
+        return []
+
+    timestamps = track.timestamps
+    duration = float(timestamps[-1] - timestamps[0])
+    rows_per_second = (len(track) - 1) / duration if duration > 0 else 1.0
+    window = max(1, int(round(HIGHLIGHT_SMOOTHING_SECONDS * rows_per_second)))
+    signals = issue_signals(track, analysis)
+
+    highlights = []
+    for issue in analysis['issues']:
+        signal = signals.get(issue.issue_type)
+        if signal is None:
+            continue
+        smoothed = _smoothed(signal, window)
+        if not np.isfinite(smoothed).any():
+            continue
+        peak = int(np.nanargmax(smoothed))
+
+        # Clip window clamped to the analyzed span
+        latest_start = max(timestamps[0], timestamps[-1] - clip_seconds)
+        start_time = min(max(timestamps[0], timestamps[peak] - clip_seconds / 2), latest_start)
+        end_time = start_time + clip_seconds
+        first = int(np.searchsorted(timestamps, start_time))
+        last = max(first, int(np.searchsorted(timestamps, end_time, side='right')) - 1)
+        highlights.append({
+            'issue': issue,
+            'start_frame': int(track.frame_numbers[first]),
+            'end_frame': int(track.frame_numbers[last]) + 1,
+            'start_time': float(start_time),
+            'end_time': float(min(end_time, timestamps[-1])),
+            'peak_time': float(timestamps[peak]),
+        })
+    return highlights
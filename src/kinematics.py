@@ -0,0 +1,151 @@
+"""Batched joint kinematics over PoseTrack landmark arrays."""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.pose_track import LANDMARK_INDEX, VISIBILITY, X, Y, PoseTrack
+
+# Joint angles: name -> (point, vertex, point)
+JOINT_ANGLES = {
+    'left_elbow': ('left_shoulder', 'left_elbow', 'left_wrist'),
+    'right_elbow': ('right_shoulder', 'right_elbow', 'right_wrist'),
+    'left_shoulder': ('left_hip', 'left_shoulder', 'left_elbow'),
+    'right_shoulder': ('right_hip', 'right_shoulder', 'right_elbow'),
+    'left_knee': ('left_hip', 'left_knee', 'left_ankle'),
+    'right_knee': ('right_hip', 'right_knee', 'right_ankle'),
+}
+
+# Body segments: name -> (start, end)
+SEGMENTS = {
+    'left_upper_arm': ('left_shoulder', 'left_elbow'),
+    'right_upper_arm': ('right_shoulder', 'right_elbow'),
+    'left_forearm': ('left_elbow', 'left_wrist'),
+    'right_forearm': ('right_elbow', 'right_wrist'),
+    'left_thigh': ('left_hip', 'left_knee'),
+    'right_thigh': ('right_hip', 'right_knee'),
+    'left_shin': ('left_knee', 'left_ankle'),
+    'right_shin': ('right_knee', 'right_ankle'),
+    'shoulders': ('left_shoulder', 'right_shoulder'),
+    'hips': ('left_hip', 'right_hip'),
+}
+
+# Added to the vector-length product so degenerate (coincident) points give 90° instead of NaN
+_EPSILON = 1e-6
+
+
+def _indices(names: Sequence[Tuple[str, ...]]) -> np.ndarray:
+    """(K, len(tuple)) landmark-axis indices for a sequence of name tuples."""
+    return np.array([[LANDMARK_INDEX[name] for name in group] for group in names], dtype=np.intp).reshape(len(names), -1)
+
+
+def _angles(xy: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """Kernel: (N, K) angles in degrees for (N, L, 2) points and (K, 3) index triples."""
+    v1 = xy[:, idx[:, 0]] - xy[:, idx[:, 1]]
+    v2 = xy[:, idx[:, 2]] - xy[:, idx[:, 1]]
+
+    dot = np.einsum('ntk,ntk->nt', v1, v2)
+    cos_angle = dot / (np.linalg.norm(v1, axis=-1) * np.linalg.norm(v2, axis=-1) + _EPSILON)
+    return np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+
+
+def joint_angles(landmarks: np.ndarray, triples: Sequence[Tuple[str, str, str]]) -> np.ndarray:
+    """
+    Angle at the middle landmark of every triple, for every frame.
+
+    Args:
+        landmarks: (N, L, 4) PoseTrack landmark array
+        triples: (point, vertex, point) landmark names
+
+    Returns:
+        (N, len(triples)) angles in degrees
+    """
+    return _angles(landmarks[..., [X, Y]].astype(np.float64), _indices(triples))
+
+
+def segment_lengths(landmarks: np.ndarray, pairs: Sequence[Tuple[str, str]]) -> np.ndarray:
+    """(N, len(pairs)) image-plane distance in pixels between each landmark pair."""
+    idx = _indices(pairs)
+    xy = landmarks[..., [X, Y]].astype(np.float64)
+    return np.linalg.norm(xy[:, idx[:, 1]] - xy[:, idx[:, 0]], axis=-1)
+
+
+def min_visibility(landmarks: np.ndarray, groups: Sequence[Tuple[str, ...]]) -> np.ndarray:
+    """(N, len(groups)) lowest visibility among the landmarks of each group."""
+    idx = _indices(groups)
+    return landmarks[:, idx, VISIBILITY].min(axis=-1)
+
+
+def angular_velocity(angles: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+    """(N, K) time derivative of (N, K) angles in degrees per second."""
+    if len(timestamps) < 2:
+        return np.zeros_like(angles)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.gradient(angles, timestamps, axis=0)
+
+
+def calculate_angle(point1: Dict, point2: Dict, point3: Dict) -> float:
+    """Angle in degrees at `point2` between three landmark dictionaries with 'x' and 'y' keys."""
+    xy = np.array([[[p['x'], p['y']] for p in (point1, point2, point3)]], dtype=np.float64)
+    return float(_angles(xy, np.array([[0, 1, 2]]))[0, 0])
+
+
+class KinematicsTable:
+    """
+    Per-frame joint features for a PoseTrack, computed in one batched pass.
+
+    Attributes:
+        frame_numbers, timestamps: copied from the track
+        angles: (N, len(JOINT_ANGLES)) degrees
+        angle_visibility: (N, len(JOINT_ANGLES)) lowest visibility of each angle's landmarks
+        angular_velocity: (N, len(JOINT_ANGLES)) degrees per second
+        lengths: (N, len(SEGMENTS)) pixels
+        length_visibility: (N, len(SEGMENTS)) lowest visibility of each segment's landmarks
+
+    Rows of frames without a detected pose hold meaningless values and zero
+    visibility, so a visibility threshold masks them out.
+    """
+
+    ANGLE_NAMES = tuple(JOINT_ANGLES)
+    SEGMENT_NAMES = tuple(SEGMENTS)
+
+    def __init__(self, track: PoseTrack):
+        self.frame_numbers = track.frame_numbers
+        self.timestamps = track.timestamps
+
+        triples = [JOINT_ANGLES[name] for name in self.ANGLE_NAMES]
+        pairs = [SEGMENTS[name] for name in self.SEGMENT_NAMES]
+        self.angles = joint_angles(track.landmarks, triples)
+        self.angle_visibility = min_visibility(track.landmarks, triples)
+        self.angular_velocity = angular_velocity(self.angles, self.timestamps)
+        self.lengths = segment_lengths(track.landmarks, pairs)
+        self.length_visibility = min_visibility(track.landmarks, pairs)
+
+        self._angle_col = {name: i for i, name in enumerate(self.ANGLE_NAMES)}
+        self._segment_col = {name: i for i, name in enumerate(self.SEGMENT_NAMES)}
+
+    def __len__(self) -> int:
+        return len(self.frame_numbers)
+
+    def angle(self, name: str) -> np.ndarray:
+        """(N,) angle column, e.g. ``angle('left_elbow')``."""
+        return self.angles[:, self._angle_col[name]]
+
+    def angle_min_visibility(self, name: str) -> np.ndarray:
+        """(N,) lowest visibility among the landmarks of an angle."""
+        return self.angle_visibility[:, self._angle_col[name]]
+
+    def angle_visible(self, name: str, threshold: float) -> np.ndarray:
+        """(N,) mask of frames where all landmarks of the angle reach `threshold`."""
+        return self.angle_visibility[:, self._angle_col[name]] >= threshold
+
+    def length(self, name: str) -> np.ndarray:
+        """(N,) segment length column, e.g. ``length('left_forearm')``."""
+        return self.lengths[:, self._segment_col[name]]
+
+    def row_of(self, frame_number: int) -> Optional[int]:
+        """Row index of `frame_number`, or None if that frame was not analyzed."""
+        i = int(np.searchsorted(self.frame_numbers, frame_number))
+        if i < len(self.frame_numbers) and self.frame_numbers[i] == frame_number:
+            return i
+        return None
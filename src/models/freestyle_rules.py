@@ -44,6 +44,17 @@ class FreestyleIssue:
         self.tip = tip
         self.metric_value = metric_value
 
+    def to_dict(self) -> dict:
+        """JSON-serializable form (e.g. for API status snapshots)."""
+        value = self.metric_value
+        return {
+            'issue_type': self.issue_type,
+            'severity': self.severity,
+            'description': self.description,
+            'tip': self.tip,
+            'metric_value': float(value) if value is not None else None,
+        }
+
     def __repr__(self):
         return f"FreestyleIssue({self.issue_type}, {self.severity})"
 
@@ -0,0 +1,70 @@
+"""Compact per-frame overlay data for drawing the analysis in the browser."""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.kinematics import KinematicsTable
+from src.pose_track import LANDMARK_INDEX, LANDMARK_NAMES, SKELETON_CONNECTIONS, VISIBILITY, X, Y, PoseTrack
+
+# Bump when the layout below changes; the frontend checks it
+OVERLAY_FORMAT_VERSION = 1
+
+# Angles sent to the client (the ones the server-side renderer annotates)
+OVERLAY_ANGLES = ('left_elbow', 'right_elbow')
+
+# Angle cells whose landmarks are less visible than this are sent as -1
+OVERLAY_MIN_VISIBILITY = 0.5
+
+
+def _delta(values: np.ndarray) -> list:
+    """Row-to-row differences along axis 0, flattened row-major (first row kept as is)."""
+    values = np.asarray(values, dtype=np.int64)
+    if len(values):
+        values = np.concatenate([values[:1], np.diff(values, axis=0)])
+    return values.ravel().tolist()
+
+
+def encode_overlay_track(track: PoseTrack, analysis: Optional[Dict] = None) -> Dict:
+    """
+    JSON-ready overlay track: what the renderer draws, per analyzed frame.
+
+    Integers only, so the payload compresses well:
+
+    * ``frame_numbers``, ``timestamps_ms`` and ``xy`` are delta-encoded along
+      the frame axis (cumulative-sum them to decode); ``xy`` is the
+      (N, landmarks, 2) pixel array flattened row-major.
+    * ``visibility`` is (N, landmarks) in percent, ``detected`` is 0/1.
+    * ``angles`` is (N, len(angle_names)) whole degrees, -1 where the joint
+      is not visible enough.
+    * ``cycles`` lists the left/right stroke cycles of the analysis.
+
+    Args:
+        track: Pose track the analysis was run on
+        analysis: StrokeAnalyzer results, for the stroke cycles (optional)
+    """
+    features = KinematicsTable(track)
+    angles = np.stack([
+        np.where(features.angle_min_visibility(name) > OVERLAY_MIN_VISIBILITY, np.rint(features.angle(name)), -1)
+        for name in OVERLAY_ANGLES
+    ], axis=1).astype(np.int64)
+
+    cycles = None
+    if analysis is not None and analysis.get('cycles') is not None:
+        cycles = analysis['cycles'].as_dict()
+
+    return {
+        'version': OVERLAY_FORMAT_VERSION,
+        'frame_shape': list(track.frame_shape),
+        'landmark_names': list(LANDMARK_NAMES),
+        'skeleton': [[LANDMARK_INDEX[a], LANDMARK_INDEX[b]] for a, b in SKELETON_CONNECTIONS],
+        'angle_names': list(OVERLAY_ANGLES),
+        'frames': len(track),
+        'frame_numbers': _delta(track.frame_numbers),
+        'timestamps_ms': _delta(np.rint(track.timestamps * 1000.0)),
+        'detected': track.detected.astype(np.int64).tolist(),
+        'xy': _delta(np.rint(track.landmarks[..., [X, Y]])),
+        'visibility': np.rint(track.landmarks[..., VISIBILITY] * 100).astype(np.int64).ravel().tolist(),
+        'angles': angles.ravel().tolist(),
+        'cycles': cycles,
+    }
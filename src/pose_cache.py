@@ -0,0 +1,178 @@
+"""On-disk cache of pose extraction results."""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.pose_track import PoseTrack
+
+# Bump when the cached layout or the meaning of the pose data changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'swim_stroke_analyzer', 'poses')
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+
+# Arrays stored per entry, one raw .npy file each so they can be memory-mapped
+_ARRAYS = ('frame_numbers', 'timestamps', 'landmarks', 'detected')
+_META_FILE = 'meta.json'
+_HASH_CHUNK = 4 * 1024 * 1024
+
+
+class PoseCache:
+    """
+    Content-addressed store of PoseTracks.
+
+    Entries are keyed by the SHA-256 of the video file plus every detector
+    and sampling setting that changes the pose data, so re-analysing the same
+    footage (new rule thresholds, re-rendering) skips MediaPipe entirely.
+    Each entry is a directory of .npy files that are loaded memory-mapped.
+    When the cache grows past ``max_bytes`` the least recently used entries
+    are deleted.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        """
+        Args:
+            cache_dir: Directory holding the cache entries (created if missing)
+            max_bytes: Size bound for all entries together
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        """SHA-256 hex digest of a file's contents."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(_HASH_CHUNK), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(video_hash: str, params: Dict) -> str:
+        """Cache key for a video content hash and the settings it was processed with."""
+        blob = json.dumps(
+            {'version': CACHE_FORMAT_VERSION, 'video': video_hash, 'params': params},
+            sort_keys=True
+        )
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[PoseTrack]:
+        """Load the entry for `key` (memory-mapped), or None on a miss."""
+        entry = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(entry, _META_FILE)) as fh:
+                meta = json.load(fh)
+            arrays = {
+                name: np.load(os.path.join(entry, f'{name}.npy'), mmap_mode='r')
+                for name in _ARRAYS
+            }
+            track = PoseTrack(frame_shape=meta['frame_shape'], **arrays)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        # Record the access for LRU eviction
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return track
+
+    def put(self, key: str, track: PoseTrack):
+        """Store `track` under `key` and evict old entries if over the size bound."""
+        entry = os.path.join(self.cache_dir, key)
+        tmp = tempfile.mkdtemp(prefix='.tmp-', dir=self.cache_dir)
+        try:
+            for name in _ARRAYS:
+                np.save(os.path.join(tmp, f'{name}.npy'), getattr(track, name))
+            with open(os.path.join(tmp, _META_FILE), 'w') as fh:
+                json.dump({'frame_shape': list(track.frame_shape), 'frames': len(track)}, fh)
+            # Atomic publish; a concurrent writer of the same key may have won
+            os.rename(tmp, entry)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isdir(entry):
+                raise
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in os.scandir(path))
+                entries.append((os.path.getmtime(path), size, path))
+            except OSError:
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def key_for(self, detector, video_path: str, skip_frames: int = 2,
+                target_fps: Optional[float] = None, adaptive: bool = False,
+                frame_range: Optional[Tuple[int, int]] = None,
+                segments: Optional[List[Tuple[int, int]]] = None) -> str:
+        """
+        Cache key for running `detector` over `video_path` with these settings.
+
+        `frame_range` or `segments` (several frame ranges whose tracks are
+        merged) restrict it to part of the video.  Only the frames actually
+        detected go into the key, so with `segments` the `frame_range` they
+        were found in (or their overall span) is left out.
+        """
+        params = dict(detector.cache_params(), skip_frames=skip_frames,
+                      target_fps=target_fps, adaptive=adaptive)
+        if target_fps is not None or adaptive:
+            params.pop('skip_frames')
+        if segments is not None:
+            params['segments'] = [[int(start), int(end)] for start, end in segments]
+        elif frame_range is not None:
+            params['frame_range'] = [int(frame) for frame in frame_range]
+        return self.make_key(self.hash_file(video_path), params)
+
+    def process_video(self, detector, video_path: str, skip_frames: int = 2,
+                      target_fps: Optional[float] = None, adaptive: bool = False,
+                      frame_range: Optional[Tuple[int, int]] = None,
+                      segments: Optional[List[Tuple[int, int]]] = None,
+                      **kwargs) -> PoseTrack:
+        """
+        PoseDetector.process_video with the result served from / saved to the cache.
+
+        With `segments`, only those frame ranges are detected and their
+        tracks merged into one entry (the file is hashed once).  Extra
+        keyword arguments (workers, pipeline_depth) are passed through; they
+        only affect speed, not the pose data, so they are not part of the key.
+        """
+        t0 = time.perf_counter()
+        key = self.key_for(detector, video_path, skip_frames, target_fps, adaptive, frame_range, segments)
+
+        track = self.get(key)
+        if track is not None:
+            print(f"✓ Pose cache hit: {len(track)} frames loaded in {time.perf_counter() - t0:.2f}s")
+            return track
+
+        tracks = [
+            detector.process_video(
+                video_path, skip_frames=skip_frames, target_fps=target_fps, adaptive=adaptive,
+                frame_range=window, **kwargs
+            )
+            for window in (segments or [frame_range])
+        ]
+        track = tracks[0] if len(tracks) == 1 else PoseTrack.merge(tracks)
+        if len(track):
+            self.put(key, track)
+        return track
@@ -1,39 +1,107 @@
 """Pose detection using MediaPipe for swimming stroke analysis."""
 
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import cv2
 import mediapipe as mp
 import numpy as np
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Iterator, Optional, Tuple
+
+from src.kinematics import calculate_angle
+from src.models.freestyle_rules import MIN_VISIBILITY
+from src.pose_track import POSE_LANDMARKS, PoseTrack, PoseTrackBuilder
+from src.sampling import COARSE_ANALYSIS_FPS, AdaptiveSampler, FrameSampler, plan_adaptive_rates
+from src.video_processor import KeyframeIndex
+
+# Sharded processing: each shard re-primes MediaPipe's tracker on this many
+# sampled frames before its own range, and shards shorter than
+# MIN_SHARD_SAMPLES sampled frames are not worth a separate process.
+SHARD_WARMUP_SAMPLES = 10
+MIN_SHARD_SAMPLES = 150
+
+# Decoded frames the reader thread may hold ahead of inference.  A 1080p BGR
+# frame is ~6 MB, so the default bounds the buffer at roughly 24 MB.
+DEFAULT_PIPELINE_DEPTH = 4
+
+# Longest frame side passed to MediaPipe.  Its detector and landmark models run
+# on 224-256 px inputs, so resizing and colour-converting a 4K frame only to
+# have MediaPipe shrink it again is wasted work.
+DEFAULT_INFERENCE_SIZE = 640
+
+# A frame gets at most one retry: on the whole frame when the ROI crop
+# missed, otherwise at full resolution when the downscaled frame missed.
+# After a retry of either kind that did not help (e.g. nobody in frame),
+# that kind is skipped for this many frames rather than paying double every
+# frame.
+FALLBACK_COOLDOWN_FRAMES = 15
+
+# Swimmer ROI tracking: the crop is the landmark bounding box padded by
+# ROI_PADDING of its longest side on every edge, and never smaller than
+# ROI_MIN_FRACTION of the frame in either dimension.  The crop is only moved
+# when the swimmer gets within ROI_MARGIN of its edge (or it is far too big),
+# so MediaPipe sees a stable image between updates.
+ROI_PADDING = 0.35
+ROI_MIN_FRACTION = 0.25
+ROI_MARGIN = 0.1
+
+# MediaPipe pose model: 1 balances speed/accuracy (2 is way too slow)
+MODEL_COMPLEXITY = 1
 
 
 class PoseDetector:
     """Detects and tracks swimmer pose using MediaPipe."""
 
-    def __init__(self, min_detection_confidence=0.5, min_tracking_confidence=0.5):
-        """Initialize MediaPipe Pose detector."""
+    def __init__(
+        self,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5,
+        inference_size: Optional[int] = DEFAULT_INFERENCE_SIZE,
+        track_roi: bool = True
+    ):
+        """
+        Initialize MediaPipe Pose detector.
+
+        Args:
+            min_detection_confidence: MediaPipe person detection threshold
+            min_tracking_confidence: MediaPipe landmark tracking threshold
+            inference_size: Downscale frames so their longest side is at most
+                this many pixels before detection (None = full resolution).
+                Frames whose landmarks come back with low visibility are
+                retried at full resolution.
+            track_roi: Run detection on a padded crop around the swimmer found
+                in the previous frame, falling back to the full frame when
+                the track is lost.
+        """
+        # Constructor arguments, kept so worker processes can build an identical detector
+        self.settings = {
+            'min_detection_confidence': min_detection_confidence,
+            'min_tracking_confidence': min_tracking_confidence,
+            'inference_size': inference_size,
+            'track_roi': track_roi,
+        }
+        self.inference_size = inference_size
+        self.track_roi = track_roi
+        self.fallback_count = 0  # Frames retried at full resolution
+        self._cooldowns = {'roi': 0, 'resolution': 0}  # Frames left without that retry
+        self._roi = None  # (x0, y0, x1, y1) crop in source pixels, None = full frame
+
         self.mp_pose = mp.solutions.pose
         self.pose = self.mp_pose.Pose(
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence,
-            model_complexity=1  # Balanced speed/accuracy (was 2, way too slow)
+            model_complexity=MODEL_COMPLEXITY
         )
 
         # Key landmarks for swimming analysis
-        self.LANDMARKS = {
-            'nose': 0,
-            'left_shoulder': 11,
-            'right_shoulder': 12,
-            'left_elbow': 13,
-            'right_elbow': 14,
-            'left_wrist': 15,
-            'right_wrist': 16,
-            'left_hip': 23,
-            'right_hip': 24,
-            'left_knee': 25,
-            'right_knee': 26,
-            'left_ankle': 27,
-            'right_ankle': 28,
-        }
+        self.LANDMARKS = dict(POSE_LANDMARKS)
+
+    def cache_params(self) -> Dict:
+        """Everything about this detector that affects its output, for PoseCache keys."""
+        return dict(self.settings, model_complexity=MODEL_COMPLEXITY, mediapipe=mp.__version__)
 
     def detect_pose(self, frame: np.ndarray) -> Optional[Dict]:
         """
@@ -45,21 +113,37 @@ class PoseDetector:
         Returns:
             Dictionary containing landmarks and metadata, or None if no pose detected
         """
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        # Process frame
-        results = self.pose.process(rgb_frame)
-
-        if not results.pose_landmarks:
+        h, w, _ = frame.shape
+        for kind, frames_left in self._cooldowns.items():
+            self._cooldowns[kind] = max(0, frames_left - 1)
+
+        roi = self._roi if self.track_roi else None
+        pose_landmarks = self._detect_region(frame, roi, self.inference_size)
+        if self._mean_visibility(pose_landmarks) < MIN_VISIBILITY:
+            if roi is not None:
+                # Track lost or visibility collapsed: search the whole frame
+                self._roi = None
+                pose_landmarks = self._retry(frame, pose_landmarks, 'roi', self.inference_size)
+            elif self.inference_size is not None and max(h, w) > self.inference_size:
+                # Low confidence on a downscaled frame: retry at full resolution
+                pose_landmarks = self._retry(frame, pose_landmarks, 'resolution', None)
+
+        if self.track_roi:
+            if self._mean_visibility(pose_landmarks) >= MIN_VISIBILITY:
+                self._roi = self._next_roi(pose_landmarks, w, h)
+            else:
+                self._roi = None
+
+        if not pose_landmarks:
             return None
 
-        # Extract landmark coordinates
-        h, w, _ = frame.shape
+        # Extract landmark coordinates.  MediaPipe returns coordinates normalized
+        # to the image it was given, so scaling by the source size maps them
+        # back to source pixels regardless of the inference resolution.
         landmarks = {}
 
         for name, idx in self.LANDMARKS.items():
-            landmark = results.pose_landmarks.landmark[idx]
+            landmark = pose_landmarks.landmark[idx]
             landmarks[name] = {
                 'x': landmark.x * w,
                 'y': landmark.y * h,
@@ -69,59 +153,475 @@ class PoseDetector:
 
         return {
             'landmarks': landmarks,
-            'raw_landmarks': results.pose_landmarks,
+            'raw_landmarks': pose_landmarks,
             'frame_shape': (h, w)
         }
 
-    def process_video(self, video_path: str, skip_frames: int = 2) -> List[Dict]:
+    def reset_tracking(self):
+        """Forget the tracked swimmer ROI (call before starting a new video or after seeking)."""
+        self._roi = None
+        self._cooldowns = {'roi': 0, 'resolution': 0}
+
+    def _retry(self, frame: np.ndarray, pose_landmarks, kind: str, inference_size: Optional[int]):
+        """
+        The one fallback of a frame: detect on the whole frame at `inference_size`.
+
+        Keeps the better of the two results.  Skipped while `kind`'s cooldown
+        runs, and starts it when the retry does not help either.
+        """
+        if self._cooldowns[kind] > 0:
+            return pose_landmarks
+        if kind == 'resolution':
+            self.fallback_count += 1
+        retried = self._detect_region(frame, None, inference_size)
+        if self._mean_visibility(retried) > self._mean_visibility(pose_landmarks):
+            pose_landmarks = retried
+        if self._mean_visibility(pose_landmarks) < MIN_VISIBILITY:
+            self._cooldowns[kind] = FALLBACK_COOLDOWN_FRAMES
+        return pose_landmarks
+
+    def _detect_region(self, frame: np.ndarray, roi: Optional[Tuple[int, int, int, int]],
+                       inference_size: Optional[int]):
+        """
+        Detect on the whole frame or on an ROI crop of it, downscaled to `inference_size`.
+
+        Returns MediaPipe landmarks normalized to the full frame, or None.
+        """
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            image = frame[y0:y1, x0:x1]
+        else:
+            image = frame
+        ih, iw = image.shape[:2]
+        pose_landmarks = self._run_pose(image, inference_size)
+
+        if pose_landmarks and roi is not None:
+            # Map crop-normalized coordinates back to full-frame-normalized ones
+            h, w = frame.shape[:2]
+            for landmark in pose_landmarks.landmark:
+                landmark.x = (landmark.x * iw + x0) / w
+                landmark.y = (landmark.y * ih + y0) / h
+                landmark.z = landmark.z * iw / w  # z shares the x scale
+
+        return pose_landmarks
+
+    def _next_roi(self, pose_landmarks, w: int, h: int) -> Tuple[int, int, int, int]:
+        """Padded swimmer bounding box for the next frame, in source pixels."""
+        xs = np.clip([pose_landmarks.landmark[i].x * w for i in self.LANDMARKS.values()], 0, w)
+        ys = np.clip([pose_landmarks.landmark[i].y * h for i in self.LANDMARKS.values()], 0, h)
+        bx0, bx1, by0, by1 = xs.min(), xs.max(), ys.min(), ys.max()
+
+        pad = ROI_PADDING * max(bx1 - bx0, by1 - by0)
+        half_w = max((bx1 - bx0) / 2 + pad, ROI_MIN_FRACTION * w / 2)
+        half_h = max((by1 - by0) / 2 + pad, ROI_MIN_FRACTION * h / 2)
+        cx, cy = (bx0 + bx1) / 2, (by0 + by1) / 2
+        roi = (
+            int(max(0, cx - half_w)), int(max(0, cy - half_h)),
+            int(min(w, cx + half_w)), int(min(h, cy + half_h)),
+        )
+
+        # Keep the current crop while the swimmer stays well inside it and it
+        # has not grown much larger than needed
+        if self._roi is not None:
+            x0, y0, x1, y1 = self._roi
+            mx, my = (x1 - x0) * ROI_MARGIN, (y1 - y0) * ROI_MARGIN
+            inside = bx0 >= x0 + mx and bx1 <= x1 - mx and by0 >= y0 + my and by1 <= y1 - my
+            area = (x1 - x0) * (y1 - y0)
+            new_area = max(1, (roi[2] - roi[0]) * (roi[3] - roi[1]))
+            if inside and area <= 2 * new_area:
+                return self._roi
+
+        return roi
+
+    def _run_pose(self, frame: np.ndarray, max_size: Optional[int]):
+        """Run MediaPipe on `frame`, downscaled to `max_size` px on its longest side."""
+        h, w = frame.shape[:2]
+        if max_size is not None and max(h, w) > max_size:
+            scale = max_size / max(h, w)
+            size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+        # Convert BGR to RGB (after resizing, so only the small image is converted)
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return self.pose.process(rgb_frame).pose_landmarks
+
+    def _mean_visibility(self, pose_landmarks) -> float:
+        """Average visibility of the swimming LANDMARKS (0 when nothing was detected)."""
+        if not pose_landmarks:
+            return 0.0
+        return float(np.mean([pose_landmarks.landmark[idx].visibility for idx in self.LANDMARKS.values()]))
+
+    def process_video(
+        self,
+        video_path: str,
+        skip_frames: int = 2,
+        workers: int = 1,
+        pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+        target_fps: Optional[float] = None,
+        adaptive: bool = False,
+        frame_range: Optional[Tuple[int, int]] = None,
+        on_shard: Optional[Callable[[PoseTrack], None]] = None
+    ) -> PoseTrack:
         """
         Process video and extract pose data (skips frames for speed).
 
         Args:
             video_path: Path to video file
-            skip_frames: Process every Nth frame (2 = 2x faster, 3 = 3x faster)
+            skip_frames: Process every Nth frame (2 = 2x faster, 3 = 3x faster).
+                Skipped frames are only grabbed, never converted to BGR.
+            workers: Number of worker processes. Values above 1 split the video
+                into frame-range shards that are detected in parallel, each
+                with its own PoseDetector, and merged back in frame order.
+            pipeline_depth: Number of decoded frames a background reader thread
+                may buffer ahead of inference (0 = decode and infer serially).
+                Per-stage timings are left in ``self.stage_timings``.
+            target_fps: Analyze this many frames per second of video regardless
+                of the source frame rate (overrides skip_frames).
+            adaptive: Pick the analysis rate per segment from the stroke rate
+                found by a quick coarse pass (overrides skip_frames/target_fps).
+            frame_range: Only process source frames [start, end): the
+                capture seeks straight to ``start`` and stops at ``end``, so
+                the cost scales with the window rather than the video.
+            on_shard: Called with each shard's track, in frame order, as soon
+                as it and all shards before it are done (once with the whole
+                track when running in a single process), e.g. to publish
+                provisional results without giving up the workers.  Not
+                supported with ``adaptive``.
 
         Returns:
-            List of pose data dictionaries, one per processed frame
+            PoseTrack with one row per processed frame.  It behaves like the
+            list of ``{'frame_number', 'timestamp', 'pose'}`` dictionaries
+            this method used to return, without holding Python objects or
+            MediaPipe protobufs per frame.
         """
-        cap = cv2.VideoCapture(video_path)
-        pose_data = []
+        if adaptive:
+            if on_shard is not None:
+                raise ValueError("on_shard cannot be combined with adaptive sampling (two passes)")
+            return self._process_adaptive(video_path, workers, pipeline_depth, frame_range)
+        return self._process_sampled(
+            video_path, FrameSampler(skip_frames, target_fps), workers, pipeline_depth,
+            frame_range, on_shard
+        )
 
-        frame_count = 0
-        processed_count = 0
+    def _process_sampled(
+        self,
+        video_path: str,
+        sampler: FrameSampler,
+        workers: int,
+        pipeline_depth: int,
+        frame_range: Optional[Tuple[int, int]] = None,
+        on_shard: Optional[Callable[[PoseTrack], None]] = None
+    ) -> PoseTrack:
+        """Run detection over the whole video (or `frame_range` of it) with the given sampler."""
+        self.stage_timings = new_stage_timings()
+        cap = cv2.VideoCapture(video_path)
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         fps = cap.get(cv2.CAP_PROP_FPS)
+        start_frame, end_frame = clamp_frame_range(frame_range, total_frames)
+        window_frames = end_frame - start_frame
 
-        print(f"Processing video: {total_frames} frames at {fps:.2f} fps (analyzing every {skip_frames} frames)")
+        stride = sampler.stride(fps)
+        # Needed to seek anywhere but the start (in this process or the shards)
+        keyframes = KeyframeIndex.for_video(video_path) if start_frame > 0 or workers > 1 else None
 
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
+        shards = self._plan_shards(
+            start_frame, end_frame, stride, workers, keyframes, SHARD_WARMUP_SAMPLES * stride
+        )
+        if len(shards) > 1:
+            cap.release()
+            return self._process_sharded(
+                video_path, shards, sampler, fps, total_frames, pipeline_depth, on_shard, keyframes
+            )
 
-            # Skip frames for performance
-            if frame_count % skip_frames != 0:
-                frame_count += 1
-                continue
+        print(f"Processing video: {window_frames} frames at {fps:.2f} fps ({sampler.describe(fps)})")
 
-            pose_result = self.detect_pose(frame)
-            processed_count += 1
+        pose_data = self._process_range(
+            cap, start_frame, end_frame, sampler, fps, total_frames,
+            pipeline_depth=pipeline_depth, timings=self.stage_timings, keyframes=keyframes
+        )
+        cap.release()
 
-            pose_data.append({
-                'frame_number': frame_count,
-                'timestamp': frame_count / fps,
-                'pose': pose_result,
-                # NOTE: frames are NOT stored here to avoid memory exhaustion.
-                # The visualizer re-reads frames directly from the source video.
-            })
+        processed_count = len(pose_data)
+        print(f"✓ Completed: {processed_count} frames analyzed ({window_frames} total, skipped {window_frames - processed_count})")
+        print(format_stage_timings(self.stage_timings))
+
+        if on_shard is not None:
+            on_shard(pose_data)
+        return pose_data
+
+    def process_frame_range(
+        self,
+        video_path: str,
+        start_frame: int,
+        end_frame: int,
+        skip_frames: int = 2,
+        target_fps: Optional[float] = None,
+        pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+        verbose: bool = True
+    ) -> PoseTrack:
+        """
+        Extract pose data for frames [start_frame, end_frame) only.
+
+        Same sampling options as process_video, in a single process.
+        """
+        self.stage_timings = new_stage_timings()
+        sampler = FrameSampler(skip_frames, target_fps)
+        cap = cv2.VideoCapture(video_path)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        start_frame, end_frame = clamp_frame_range((start_frame, end_frame), total_frames)
+        try:
+            return self._process_range(
+                cap, start_frame, end_frame, sampler, fps, total_frames,
+                verbose=verbose, pipeline_depth=pipeline_depth, timings=self.stage_timings,
+                keyframes=KeyframeIndex.for_video(video_path) if start_frame > 0 else None
+            )
+        finally:
+            cap.release()
+
+    def _process_adaptive(
+        self,
+        video_path: str,
+        workers: int,
+        pipeline_depth: int,
+        frame_range: Optional[Tuple[int, int]] = None
+    ) -> PoseTrack:
+        """
+        Two-pass stroke-rate-aware extraction.
 
-            frame_count += 1
-            if processed_count % 15 == 0:  # Show progress more often
-                pct = (frame_count / total_frames) * 100
-                print(f"Progress: {pct:.1f}% ({processed_count} frames analyzed)")
+        A coarse pass estimates the stroke cycle frequency per segment; the
+        second pass then samples each segment just densely enough for the
+        per-cycle metrics, skipping frames the coarse pass already analyzed.
+        """
+        print(f"Adaptive sampling: coarse pass at {COARSE_ANALYSIS_FPS:.0f} frames/s")
+        coarse = self._process_sampled(
+            video_path, FrameSampler(target_fps=COARSE_ANALYSIS_FPS), workers, pipeline_depth,
+            frame_range=frame_range
+        )
+        coarse_timings = self.stage_timings
 
+        cap = cv2.VideoCapture(video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        start_frame, end_frame = clamp_frame_range(frame_range, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
         cap.release()
-        print(f"✓ Completed: {processed_count} frames analyzed ({total_frames} total, skipped {total_frames - processed_count})")
+
+        start_time, end_time = (start_frame / fps, end_frame / fps) if fps > 0 else (0.0, 0.0)
+        schedule = plan_adaptive_rates(coarse, start_time, end_time)
+        for start, rate in schedule:
+            print(f"  from {start:.0f}s: {min(rate, fps):.1f} frames/s")
+
+        sampler = AdaptiveSampler(schedule, covered_timestamps=coarse.timestamps)
+        fine = self._process_sampled(video_path, sampler, workers, pipeline_depth, frame_range=frame_range)
+
+        for key, value in coarse_timings.items():
+            self.stage_timings[key] += value
+
+        pose_data = PoseTrack.merge([coarse, fine])
+        print(f"✓ Adaptive sampling: {len(pose_data)} frames analyzed in total")
+        return pose_data
+
+    def stream_video(
+        self,
+        video_path: str,
+        skip_frames: int = 2,
+        target_fps: Optional[float] = None,
+        pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+        frame_range: Optional[Tuple[int, int]] = None
+    ) -> Iterator[Dict]:
+        """
+        Detect poses and yield each analyzed frame as soon as it is ready.
+
+        Nothing is accumulated, so memory does not grow with video length;
+        feed the frames to StrokeAnalyzer.analyze_stream.  Runs in a single
+        process (no sharding or adaptive sampling).  ``frame_range`` works as
+        in process_video.
+
+        Yields:
+            ``{'frame_number', 'timestamp', 'pose'}`` dictionaries in frame
+            order, with ``pose`` as returned by detect_pose
+        """
+        self.stage_timings = new_stage_timings()
+        sampler = FrameSampler(skip_frames, target_fps)
+        cap = cv2.VideoCapture(video_path)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        start_frame, end_frame = clamp_frame_range(frame_range, total_frames)
+        print(f"Streaming video: {end_frame - start_frame} frames at {fps:.2f} fps ({sampler.describe(fps)})")
+
+        try:
+            for frame_count, timestamp, pose_result in self._iter_range(
+                cap, start_frame, end_frame, sampler, fps, total_frames,
+                pipeline_depth=pipeline_depth, timings=self.stage_timings,
+                keyframes=KeyframeIndex.for_video(video_path) if start_frame > 0 else None
+            ):
+                yield {'frame_number': frame_count, 'timestamp': timestamp, 'pose': pose_result}
+        finally:
+            cap.release()
+
+        print(f"✓ Completed: {self.stage_timings['frames']} frames analyzed ({end_frame - start_frame} total)")
+        print(format_stage_timings(self.stage_timings))
+
+    def _process_range(
+        self,
+        cap: cv2.VideoCapture,
+        start_frame: int,
+        end_frame: int,
+        sampler: FrameSampler,
+        fps: float,
+        total_frames: int,
+        keep_from: Optional[int] = None,
+        verbose: bool = True,
+        pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+        timings: Optional[Dict] = None,
+        keyframes: Optional[KeyframeIndex] = None
+    ) -> PoseTrack:
+        """
+        Detect poses on frames [start_frame, end_frame) of an open capture.
+
+        Sampling decisions only depend on frame numbers and timestamps, so
+        shards of the same video line up with a single-pass run.  Frames
+        before ``keep_from`` are still run through MediaPipe (to prime its
+        tracking state) but are not returned.
+
+        With ``pipeline_depth > 0`` decoding runs in a background thread that
+        stays up to that many frames ahead of inference.  ``keyframes``
+        (default: none) makes the seek to ``start_frame`` decode less.
+        """
+        frame_shape = (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)))
+        builder = PoseTrackBuilder(frame_shape)
+        for frame_count, timestamp, pose_result in self._iter_range(
+            cap, start_frame, end_frame, sampler, fps, total_frames,
+            keep_from, verbose, pipeline_depth, timings, keyframes
+        ):
+            # NOTE: frames are NOT stored here to avoid memory exhaustion.
+            # The visualizer re-reads frames directly from the source video.
+            builder.append(frame_count, timestamp, pose_result)
+        return builder.build()
+
+    def _iter_range(
+        self,
+        cap: cv2.VideoCapture,
+        start_frame: int,
+        end_frame: int,
+        sampler: FrameSampler,
+        fps: float,
+        total_frames: int,
+        keep_from: Optional[int] = None,
+        verbose: bool = True,
+        pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+        timings: Optional[Dict] = None,
+        keyframes: Optional[KeyframeIndex] = None
+    ) -> Iterator[Tuple[int, float, Optional[Dict]]]:
+        """Yield (frame_number, timestamp, pose) for the frames _process_range keeps."""
+        (keyframes or KeyframeIndex.empty()).seek(cap, start_frame)
+        if keep_from is None:
+            keep_from = start_frame
+        if timings is None:
+            timings = new_stage_timings()
+
+        sampler.reset()
+        self.reset_tracking()
+        frames = _read_frames(cap, start_frame, end_frame, sampler, fps, timings)
+        if pipeline_depth > 0:
+            frames = _prefetch(frames, pipeline_depth, timings)
+
+        processed_count = 0
+        fallbacks_before = self.fallback_count
+
+        try:
+            for frame_count, timestamp, frame in frames:
+                t0 = time.perf_counter()
+                pose_result = self.detect_pose(frame)
+                timings['inference_s'] += time.perf_counter() - t0
+                processed_count += 1
+
+                if frame_count >= keep_from:
+                    yield frame_count, timestamp, pose_result
+
+                if verbose and processed_count % 15 == 0:  # Show progress more often
+                    # Relative to the range, not the whole video
+                    pct = ((frame_count + 1 - start_frame) / max(1, end_frame - start_frame)) * 100
+                    print(f"Progress: {pct:.1f}% ({processed_count} frames analyzed)")
+        finally:
+            frames.close()
+            timings['frames'] += processed_count
+            timings['resolution_fallbacks'] += self.fallback_count - fallbacks_before
+
+    @staticmethod
+    def _plan_shards(
+        start_frame: int,
+        end_frame: int,
+        stride: int,
+        workers: int,
+        keyframes: Optional[KeyframeIndex] = None,
+        warmup: int = 0
+    ) -> List[Tuple[int, int]]:
+        """
+        Split [start_frame, end_frame) into at most `workers` contiguous frame ranges.
+
+        With `keyframes`, each boundary is moved so the shard's warmup
+        (`warmup` frames before it) starts at a KeyframeIndex.seek_point,
+        rounded up to the sampling grid.
+        """
+        total_frames = end_frame - start_frame
+        min_shard = MIN_SHARD_SAMPLES * stride
+        workers = max(1, min(workers, total_frames // max(1, min_shard)))
+        if workers <= 1:
+            return [(start_frame, end_frame)]
+
+        # Align boundaries to the sampling grid so no analyzed frame is lost or duplicated
+        shard_len = -(-total_frames // workers)
+        shard_len = -(-shard_len // stride) * stride
+        bounds = list(range(start_frame, end_frame, shard_len))
+        if keyframes is not None and len(keyframes):
+            # Start each warmup where seeking decodes least, back on the grid
+            moved = [keyframes.seek_point(bound - warmup) + warmup - start_frame for bound in bounds[1:]]
+            moved = [start_frame + -(-offset // stride) * stride for offset in moved]
+            bounds = sorted({start_frame, *(bound for bound in moved if start_frame < bound < end_frame)})
+        return list(zip(bounds, bounds[1:] + [end_frame]))
+
+    def _process_sharded(
+        self,
+        video_path: str,
+        shards: List[Tuple[int, int]],
+        sampler: FrameSampler,
+        fps: float,
+        total_frames: int,
+        pipeline_depth: int,
+        on_shard: Optional[Callable[[PoseTrack], None]] = None,
+        keyframes: Optional[KeyframeIndex] = None
+    ) -> PoseTrack:
+        """Run shards in worker processes and merge them into one ordered track."""
+        warmup = SHARD_WARMUP_SAMPLES * sampler.stride(fps)
+        window_frames = shards[-1][1] - shards[0][0]
+        print(f"Processing video: {window_frames} frames at {fps:.2f} fps "
+              f"({sampler.describe(fps)}, {len(shards)} worker processes)")
+
+        # 'spawn' avoids forking a process that already holds a MediaPipe graph
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=len(shards), mp_context=ctx) as pool:
+            futures = [
+                pool.submit(
+                    _process_shard, video_path, self.settings,
+                    max(0, start - warmup), start, end, sampler, fps, total_frames,
+                    pipeline_depth, keyframes
+                )
+                for start, end in shards
+            ]
+            results = []
+            for i, future in enumerate(futures):
+                shard_data, shard_timings = future.result()
+                results.append(shard_data)
+                for key, value in shard_timings.items():
+                    self.stage_timings[key] += value
+                print(f"Progress: shard {i + 1}/{len(shards)} complete")
+                if on_shard is not None:
+                    on_shard(shard_data)
+
+        pose_data = PoseTrack.merge(results)
+        processed_count = len(pose_data)
+        print(f"✓ Completed: {processed_count} frames analyzed ({window_frames} total, skipped {window_frames - processed_count})")
+        print(format_stage_timings(self.stage_timings) + " (summed over workers)")
 
         return pose_data
 
@@ -134,23 +634,9 @@ class PoseDetector:
             point2 is the vertex of the angle
 
         Returns:
-            Angle in degrees
+            Angle in degrees (see src.kinematics for whole-track batches)
         """
-        # Convert to numpy arrays
-        p1 = np.array([point1['x'], point1['y']])
-        p2 = np.array([point2['x'], point2['y']])
-        p3 = np.array([point3['x'], point3['y']])
-
-        # Calculate vectors
-        v1 = p1 - p2
-        v2 = p3 - p2
-
-        # Calculate angle
-        cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2))
-        cos_angle = np.clip(cos_angle, -1.0, 1.0)  # Handle numerical errors
-        angle = np.arccos(cos_angle)
-
-        return np.degrees(angle)
+        return calculate_angle(point1, point2, point3)
 
     def calculate_body_rotation(self, landmarks: Dict) -> float:
         """
@@ -181,3 +667,165 @@ class PoseDetector:
         """Cleanup MediaPipe resources."""
         if hasattr(self, 'pose'):
             self.pose.close()
+
+
+def _process_shard(
+    video_path: str,
+    settings: Dict,
+    warmup_start: int,
+    start_frame: int,
+    end_frame: int,
+    sampler: FrameSampler,
+    fps: float,
+    total_frames: int,
+    pipeline_depth: int,
+    keyframes: Optional[KeyframeIndex] = None
+) -> Tuple[PoseTrack, Dict]:
+    """Worker-process entry point: detect poses for one shard of a video."""
+    detector = PoseDetector(**settings)
+    cap = cv2.VideoCapture(video_path)
+    timings = new_stage_timings()
+    try:
+        pose_data = detector._process_range(
+            cap, warmup_start, end_frame, sampler, fps, total_frames,
+            keep_from=start_frame, verbose=False,
+            pipeline_depth=pipeline_depth, timings=timings, keyframes=keyframes
+        )
+    finally:
+        cap.release()
+    return pose_data, timings
+
+
+def clamp_frame_range(frame_range: Optional[Tuple[int, int]], total_frames: int) -> Tuple[int, int]:
+    """(start, end) of `frame_range` clipped to [0, total_frames]; the whole video for None."""
+    if frame_range is None:
+        return 0, total_frames
+    start_frame, end_frame = frame_range
+    start_frame = min(max(0, int(start_frame)), total_frames)
+    return start_frame, min(max(start_frame, int(end_frame)), total_frames)
+
+
+def new_stage_timings() -> Dict:
+    """
+    Create an empty per-stage timing record for process_video.
+
+    decode_s / inference_s are time spent doing the work; decode_blocked_s is
+    time the reader thread waited on a full queue (inference is the
+    bottleneck) and inference_starved_s is time inference waited on an empty
+    queue (decoding is the bottleneck).  resolution_fallbacks counts frames
+    that had to be re-run at full resolution.
+    """
+    return {
+        'frames': 0,
+        'resolution_fallbacks': 0,
+        'decode_s': 0.0,
+        'inference_s': 0.0,
+        'decode_blocked_s': 0.0,
+        'inference_starved_s': 0.0,
+    }
+
+
+def format_stage_timings(timings: Dict) -> str:
+    """One-line human-readable summary of a stage timing record."""
+    return (
+        f"Stage timings: decode {timings['decode_s']:.1f}s, "
+        f"inference {timings['inference_s']:.1f}s, "
+        f"reader blocked {timings['decode_blocked_s']:.1f}s, "
+        f"inference starved {timings['inference_starved_s']:.1f}s, "
+        f"{timings['resolution_fallbacks']} full-resolution retries"
+    )
+
+
+def _read_frames(
+    cap: cv2.VideoCapture,
+    start_frame: int,
+    end_frame: int,
+    sampler: FrameSampler,
+    fps: float,
+    timings: Dict
+) -> Iterator[Tuple[int, float, np.ndarray]]:
+    """
+    Yield (frame_number, timestamp, frame) for sampled frames in [start_frame, end_frame).
+
+    Every frame is grabbed (inter-coded video has to be decoded in order), but
+    only sampled frames are retrieved, i.e. converted to a BGR array.
+    Timestamps come from the container so variable-frame-rate files are timed
+    correctly; frame_number / fps is only used when the backend reports none.
+    """
+    frame_count = start_frame
+    last_timestamp = -1.0
+    while cap.isOpened() and frame_count < end_frame:
+        t0 = time.perf_counter()
+        if not cap.grab():
+            timings['decode_s'] += time.perf_counter() - t0
+            break
+
+        timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        if timestamp <= last_timestamp or (timestamp <= 0 and frame_count > 0):
+            timestamp = frame_count / fps if fps > 0 else 0.0
+        last_timestamp = timestamp
+
+        frame = None
+        if sampler.keep(frame_count, timestamp):
+            ret, frame = cap.retrieve()
+            if not ret:
+                frame = None
+        timings['decode_s'] += time.perf_counter() - t0
+
+        if frame is not None:
+            yield frame_count, timestamp, frame
+        frame_count += 1
+
+
+def _prefetch(
+    frames: Iterator[Tuple[int, float, np.ndarray]],
+    depth: int,
+    timings: Dict
+) -> Iterator[Tuple[int, float, np.ndarray]]:
+    """
+    Drain `frames` on a background thread through a bounded queue.
+
+    OpenCV releases the GIL while decoding and MediaPipe while running the
+    graph, so decoding the next frames overlaps inference on the current one.
+    The queue bound provides backpressure and caps buffered frame memory.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _reader():
+        try:
+            for item in frames:
+                t0 = time.perf_counter()
+                if not _put(item):
+                    return
+                timings['decode_blocked_s'] += time.perf_counter() - t0
+            _put(done)
+        except Exception as exc:  # surfaced to the consumer below
+            _put(exc)
+
+    reader = threading.Thread(target=_reader, name='pose-frame-reader', daemon=True)
+    reader.start()
+
+    try:
+        while True:
+            t0 = time.perf_counter()
+            item = buffer.get()
+            timings['inference_starved_s'] += time.perf_counter() - t0
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        reader.join()
@@ -0,0 +1,254 @@
+"""Compact array-backed storage for per-frame pose data."""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Key landmarks for swimming analysis: name -> MediaPipe landmark index.
+# The order here is the landmark axis of PoseTrack.landmarks.
+POSE_LANDMARKS = {
+    'nose': 0,
+    'left_shoulder': 11,
+    'right_shoulder': 12,
+    'left_elbow': 13,
+    'right_elbow': 14,
+    'left_wrist': 15,
+    'right_wrist': 16,
+    'left_hip': 23,
+    'right_hip': 24,
+    'left_knee': 25,
+    'right_knee': 26,
+    'left_ankle': 27,
+    'right_ankle': 28,
+}
+LANDMARK_NAMES = tuple(POSE_LANDMARKS)
+LANDMARK_INDEX = {name: i for i, name in enumerate(LANDMARK_NAMES)}
+
+# Last axis of PoseTrack.landmarks
+X, Y, Z, VISIBILITY = 0, 1, 2, 3
+FIELDS = ('x', 'y', 'z', 'visibility')
+
+# Skeleton edges between the tracked landmarks (the subset of MediaPipe's
+# POSE_CONNECTIONS that only uses LANDMARK_NAMES).
+SKELETON_CONNECTIONS = (
+    ('left_shoulder', 'right_shoulder'),
+    ('left_shoulder', 'left_elbow'),
+    ('left_elbow', 'left_wrist'),
+    ('right_shoulder', 'right_elbow'),
+    ('right_elbow', 'right_wrist'),
+    ('left_shoulder', 'left_hip'),
+    ('right_shoulder', 'right_hip'),
+    ('left_hip', 'right_hip'),
+    ('left_hip', 'left_knee'),
+    ('left_knee', 'left_ankle'),
+    ('right_hip', 'right_knee'),
+    ('right_knee', 'right_ankle'),
+)
+
+
+class PoseTrack:
+    """
+    Pose data for a sequence of analyzed frames, stored as NumPy arrays.
+
+    Attributes:
+        frame_numbers: (N,) int64 source frame numbers, ascending
+        timestamps: (N,) float64 seconds
+        landmarks: (N, L, 4) float32 [x, y, z, visibility] in source pixels;
+            rows without a detection are zero
+        detected: (N,) bool, False where no pose was found
+        frame_shape: (height, width) of the source video
+
+    Indexing, iteration and len() give the original per-frame dictionaries
+    (``{'frame_number', 'timestamp', 'pose'}``) built on demand, so code
+    written against the old ``List[Dict]`` keeps working.  ``raw_landmarks``
+    is always None in those views; the MediaPipe protobufs are not kept.
+    """
+
+    def __init__(
+        self,
+        frame_numbers: np.ndarray,
+        timestamps: np.ndarray,
+        landmarks: np.ndarray,
+        detected: np.ndarray,
+        frame_shape: Tuple[int, int]
+    ):
+        self.frame_numbers = np.asarray(frame_numbers, dtype=np.int64)
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.landmarks = np.asarray(landmarks, dtype=np.float32)
+        self.detected = np.asarray(detected, dtype=bool)
+        self.frame_shape = tuple(int(v) for v in frame_shape)
+
+        n = len(self.frame_numbers)
+        if self.landmarks.shape != (n, len(LANDMARK_NAMES), len(FIELDS)):
+            raise ValueError(f"landmarks must have shape ({n}, {len(LANDMARK_NAMES)}, {len(FIELDS)}), "
+                             f"got {self.landmarks.shape}")
+        if len(self.timestamps) != n or len(self.detected) != n:
+            raise ValueError("frame_numbers, timestamps and detected must have the same length")
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def empty(cls, frame_shape: Tuple[int, int] = (0, 0)) -> 'PoseTrack':
+        """Track with no frames."""
+        return cls(
+            np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros((0, len(LANDMARK_NAMES), len(FIELDS))),
+            np.zeros(0, dtype=bool), frame_shape
+        )
+
+    @classmethod
+    def from_frames(cls, pose_data: Sequence[Dict]) -> 'PoseTrack':
+        """Build a track from a list of per-frame dictionaries."""
+        if isinstance(pose_data, PoseTrack):
+            return pose_data
+        builder = PoseTrackBuilder()
+        for frame in pose_data:
+            builder.append(frame['frame_number'], frame['timestamp'], frame['pose'])
+        return builder.build()
+
+    @classmethod
+    def merge(cls, tracks: Sequence['PoseTrack']) -> 'PoseTrack':
+        """Concatenate tracks and order the result by frame number."""
+        tracks = [track for track in tracks if len(track)]
+        if not tracks:
+            return cls.empty()
+        frame_numbers = np.concatenate([t.frame_numbers for t in tracks])
+        order = np.argsort(frame_numbers, kind='stable')
+        frame_shape = next((t.frame_shape for t in tracks if t.detected.any()), tracks[0].frame_shape)
+        return cls(
+            frame_numbers[order],
+            np.concatenate([t.timestamps for t in tracks])[order],
+            np.concatenate([t.landmarks for t in tracks])[order],
+            np.concatenate([t.detected for t in tracks])[order],
+            frame_shape
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'PoseTrack':
+        """Read a track written by save()."""
+        with np.load(path) as data:
+            return cls(
+                data['frame_numbers'], data['timestamps'], data['landmarks'],
+                data['detected'], tuple(data['frame_shape'])
+            )
+
+    def save(self, path: str):
+        """Write the track to a single .npz file."""
+        np.savez(
+            path, frame_numbers=self.frame_numbers, timestamps=self.timestamps,
+            landmarks=self.landmarks, detected=self.detected, frame_shape=np.array(self.frame_shape)
+        )
+
+    # ------------------------------------------------------------------
+    # Array access
+    # ------------------------------------------------------------------
+    def landmark(self, name: str) -> np.ndarray:
+        """(N, 4) [x, y, z, visibility] rows for one landmark."""
+        return self.landmarks[:, LANDMARK_INDEX[name]]
+
+    def subset(self, mask: np.ndarray) -> 'PoseTrack':
+        """Track restricted to the rows selected by a boolean mask or index array."""
+        return PoseTrack(
+            self.frame_numbers[mask], self.timestamps[mask], self.landmarks[mask],
+            self.detected[mask], self.frame_shape
+        )
+
+    def valid(self) -> 'PoseTrack':
+        """Track restricted to frames with a detected pose."""
+        return self.subset(self.detected)
+
+    def index_of(self, frame_number: int) -> Optional[int]:
+        """Row index of `frame_number`, or None if that frame was not analyzed."""
+        i = int(np.searchsorted(self.frame_numbers, frame_number))
+        if i < len(self.frame_numbers) and self.frame_numbers[i] == frame_number:
+            return i
+        return None
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the track's arrays."""
+        return (self.frame_numbers.nbytes + self.timestamps.nbytes +
+                self.landmarks.nbytes + self.detected.nbytes)
+
+    # ------------------------------------------------------------------
+    # Dict-compatible view
+    # ------------------------------------------------------------------
+    def pose_at(self, i: int) -> Optional[Dict]:
+        """The ``pose`` dictionary of row `i` (None when nothing was detected)."""
+        if not self.detected[i]:
+            return None
+        row = self.landmarks[i].tolist()
+        return {
+            'landmarks': {
+                name: dict(zip(FIELDS, row[j]))
+                for j, name in enumerate(LANDMARK_NAMES)
+            },
+            'raw_landmarks': None,
+            'frame_shape': self.frame_shape,
+        }
+
+    def __len__(self) -> int:
+        return len(self.frame_numbers)
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Dict, List[Dict]]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("PoseTrack index out of range")
+        return {
+            'frame_number': int(self.frame_numbers[i]),
+            'timestamp': float(self.timestamps[i]),
+            'pose': self.pose_at(i),
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return f"PoseTrack({len(self)} frames, {int(self.detected.sum())} with pose)"
+
+
+class PoseTrackBuilder:
+    """Accumulates detector output frame by frame and produces a PoseTrack."""
+
+    def __init__(self, frame_shape: Tuple[int, int] = (0, 0)):
+        self._frame_numbers = []
+        self._timestamps = []
+        self._rows = []
+        self._detected = []
+        self._frame_shape = tuple(frame_shape)
+
+    def append(self, frame_number: int, timestamp: float, pose: Optional[Dict]):
+        """Add one analyzed frame (`pose` as returned by PoseDetector.detect_pose)."""
+        self._frame_numbers.append(frame_number)
+        self._timestamps.append(timestamp)
+        if pose is None:
+            self._rows.append(np.zeros((len(LANDMARK_NAMES), len(FIELDS)), dtype=np.float32))
+            self._detected.append(False)
+            return
+
+        landmarks = pose['landmarks']
+        self._rows.append(np.array(
+            [[landmarks[name][field] for field in FIELDS] for name in LANDMARK_NAMES],
+            dtype=np.float32
+        ))
+        self._detected.append(True)
+        self._frame_shape = tuple(pose['frame_shape'])
+
+    def __len__(self) -> int:
+        return len(self._frame_numbers)
+
+    def build(self) -> PoseTrack:
+        """Stack everything appended so far into a PoseTrack."""
+        if not self._rows:
+            return PoseTrack.empty(self._frame_shape)
+        return PoseTrack(
+            np.array(self._frame_numbers, dtype=np.int64),
+            np.array(self._timestamps, dtype=np.float64),
+            np.stack(self._rows),
+            np.array(self._detected, dtype=bool),
+            self._frame_shape
+        )
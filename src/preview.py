@@ -0,0 +1,117 @@
+"""Quick-look preview: a preliminary score from a short window of the video."""
+
+import time
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.feedback_generator import FeedbackGenerator
+from src.pose_detector import PoseDetector, clamp_frame_range
+from src.stroke_analyzer import StrokeAnalyzer
+from src.video_processor import KeyframeIndex
+
+# The preview analyzes PREVIEW_WINDOW_SECONDS of video at PREVIEW_FPS with
+# frames shrunk to PREVIEW_INFERENCE_SIZE.  The window is centred on the
+# best of PREVIEW_PROBES single-frame detections spread over the video.
+PREVIEW_WINDOW_SECONDS = 15.0
+PREVIEW_FPS = 8.0
+PREVIEW_INFERENCE_SIZE = 320
+PREVIEW_PROBES = 8
+# Stop probing once a frame's mean landmark visibility reaches this
+PREVIEW_GOOD_VISIBILITY = 0.9
+
+
+def choose_preview_window(
+    video_path: str,
+    detector: PoseDetector,
+    window_seconds: float = PREVIEW_WINDOW_SECONDS,
+    probes: int = PREVIEW_PROBES,
+    frame_range: Optional[Tuple[int, int]] = None
+) -> Tuple[int, int]:
+    """
+    Pick a (start_frame, end_frame) window in which the swimmer is visible.
+
+    The window lies inside `frame_range` (default: the whole video).
+
+    Single frames spread evenly over the video are run through the detector;
+    the window is centred on the probe with the highest mean landmark
+    visibility (the middle of the video if nobody is found).  Probes are
+    moved to the nearest KeyframeIndex.seek_point, where seeking decodes
+    least.
+    """
+    cap = cv2.VideoCapture(video_path)
+    first, last = clamp_frame_range(frame_range, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    window = int(round(window_seconds * fps))
+    if last - first <= window:
+        cap.release()
+        return first, last
+
+    # Probe the middle of each of `probes` equal stretches
+    keyframes = KeyframeIndex.for_video(video_path)
+    candidates = dict.fromkeys(
+        min(max(first, keyframes.seek_point(int(frame))), last - 1)
+        for frame in first + (np.arange(probes) + 0.5) * (last - first) / probes
+    )
+    best_frame, best_visibility = (first + last) // 2, -1.0
+    try:
+        for frame_number in candidates:
+            keyframes.seek(cap, frame_number)
+            ret, frame = cap.read()
+            if not ret:
+                continue
+            detector.reset_tracking()  # Probes are unrelated frames
+            pose = detector.detect_pose(frame)
+            if pose is None:
+                continue
+            visibility = float(np.mean([lm['visibility'] for lm in pose['landmarks'].values()]))
+            if visibility > best_visibility:
+                best_frame, best_visibility = int(frame_number), visibility
+            if visibility >= PREVIEW_GOOD_VISIBILITY:
+                break  # Clearly visible swimmer; good enough
+    finally:
+        cap.release()
+
+    start = min(max(first, best_frame - window // 2), last - window)
+    return start, start + window
+
+
+def quick_look(
+    video_path: str,
+    detector: Optional[PoseDetector] = None,
+    frame_range: Optional[Tuple[int, int]] = None
+) -> Dict:
+    """
+    Analyze a short representative window of a video for a preliminary result.
+
+    Args:
+        video_path: Path to video file
+        detector: Detector to use (default: one at PREVIEW_INFERENCE_SIZE
+            without ROI tracking)
+        frame_range: Only look inside these source frames [start, end)
+
+    Returns:
+        Dictionary with the analyzer ``results``, the ``summary`` and
+        ``score`` from FeedbackGenerator, the analyzed ``window`` as
+        (start_seconds, end_seconds) and the ``elapsed`` seconds.
+    """
+    t0 = time.perf_counter()
+    if detector is None:
+        detector = PoseDetector(inference_size=PREVIEW_INFERENCE_SIZE, track_roi=False)
+
+    start_frame, end_frame = choose_preview_window(video_path, detector, frame_range=frame_range)
+    track = detector.process_frame_range(
+        video_path, start_frame, end_frame, target_fps=PREVIEW_FPS, verbose=False
+    )
+    results = StrokeAnalyzer().analyze_video(track)
+
+    feedback = FeedbackGenerator()
+    ok = 'error' not in results
+    return {
+        'results': results,
+        'summary': feedback.generate_summary(results) if ok else None,
+        'score': feedback.calculate_score(results) if ok else None,
+        'window': (float(track.timestamps[0]), float(track.timestamps[-1])) if len(track) else None,
+        'elapsed': time.perf_counter() - t0,
+    }
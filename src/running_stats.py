@@ -0,0 +1,66 @@
+"""Incremental summary statistics."""
+
+import numpy as np
+
+
+class RunningStats:
+    """
+    Count, mean, population std, min and max of a stream of values.
+
+    Values are added in batches; each batch is folded in with the parallel
+    form of Welford's update (Chan et al.), so the state is O(1) no matter
+    how many values are seen and the result matches a single pass over all
+    of them up to rounding.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations from the mean
+        self._min = np.inf
+        self._max = -np.inf
+
+    def add(self, values: np.ndarray):
+        """Fold a batch of values into the statistics."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        n_b = values.size
+        if n_b == 0:
+            return
+        mean_b = values.mean()
+        m2_b = np.square(values - mean_b).sum()
+
+        n = self.count + n_b
+        delta = mean_b - self._mean
+        self._mean += delta * n_b / n
+        self._m2 += m2_b + delta * delta * self.count * n_b / n
+        self.count = n
+        self._min = min(self._min, values.min())
+        self._max = max(self._max, values.max())
+
+    def merge(self, other: 'RunningStats'):
+        """Fold another RunningStats into this one."""
+        if other.count == 0:
+            return
+        n = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / n
+        self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+
+    @property
+    def mean(self):
+        return np.float64(self._mean) if self.count else None
+
+    @property
+    def std(self):
+        return np.float64(np.sqrt(self._m2 / self.count)) if self.count else None
+
+    @property
+    def min(self):
+        return np.float64(self._min) if self.count else None
+
+    @property
+    def max(self):
+        return np.float64(self._max) if self.count else None
@@ -0,0 +1,200 @@
+"""Frame sampling policies for pose extraction."""
+
+import bisect
+import math
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.models.freestyle_rules import MIN_VISIBILITY
+from src.pose_track import PoseTrack, VISIBILITY, X
+
+# Adaptive sampling: a coarse pass at COARSE_ANALYSIS_FPS estimates the stroke
+# cycle frequency in windows of ADAPTIVE_SEGMENT_SECONDS, then each window is
+# analyzed at SAMPLES_PER_STROKE_CYCLE samples per (single-arm) cycle, clamped
+# to [MIN_ANALYSIS_FPS, MAX_ANALYSIS_FPS].
+COARSE_ANALYSIS_FPS = 5.0
+ADAPTIVE_SEGMENT_SECONDS = 10.0
+SAMPLES_PER_STROKE_CYCLE = 20
+MIN_ANALYSIS_FPS = 6.0
+MAX_ANALYSIS_FPS = 30.0
+
+# Plausible single-arm cycle frequencies: 20-120 SPM counts both arms, so one
+# arm completes 10-60 cycles per minute.
+MIN_CYCLE_HZ = 10 / 60
+MAX_CYCLE_HZ = 60 / 60
+
+
+class FrameSampler:
+    """
+    Decides which decoded frames are sent to pose detection.
+
+    Two policies are supported:
+
+    * every Nth frame (``skip_frames``), the original behaviour; and
+    * a target analysis rate (``target_fps``), which keeps the first frame in
+      each ``1 / target_fps`` time bin using container timestamps.  This gives
+      the same analysis density for 30, 60 or 120 fps sources and handles
+      variable-frame-rate phone videos correctly.
+
+    The keep decision only depends on the current and previous frame, so a
+    shard that starts a few frames early reproduces a single-pass run.
+    """
+
+    def __init__(self, skip_frames: int = 2, target_fps: Optional[float] = None):
+        """
+        Args:
+            skip_frames: Keep every Nth frame (ignored when target_fps is set)
+            target_fps: Analysis frames per second, independent of source fps
+        """
+        if target_fps is not None and target_fps <= 0:
+            raise ValueError(f"target_fps must be positive, got {target_fps}")
+        self.skip_frames = max(1, int(skip_frames))
+        self.target_fps = target_fps
+        self._last_bin = None
+
+    def reset(self):
+        """Forget the previous frame (call when seeking)."""
+        self._last_bin = None
+
+    def keep(self, frame_number: int, timestamp: float) -> bool:
+        """Return True if the frame at `frame_number` / `timestamp` should be analyzed."""
+        if self.target_fps is None:
+            return frame_number % self.skip_frames == 0
+
+        # Small epsilon so timestamps like 0.0666666 land in the intended bin
+        time_bin = math.floor(timestamp * self.target_fps + 1e-6)
+        keep = time_bin != self._last_bin
+        self._last_bin = time_bin
+        return keep
+
+    def stride(self, source_fps: float) -> int:
+        """Approximate number of source frames per analyzed frame."""
+        if self.target_fps is None:
+            return self.skip_frames
+        if source_fps <= 0:
+            return 1
+        return max(1, int(round(source_fps / self.target_fps)))
+
+    def describe(self, source_fps: float) -> str:
+        """Short description for progress output."""
+        if self.target_fps is None:
+            return f"analyzing every {self.skip_frames} frames"
+        return f"analyzing {min(self.target_fps, source_fps):.1f} frames/s"
+
+
+class AdaptiveSampler(FrameSampler):
+    """
+    Time-based sampler whose analysis rate changes per video segment.
+
+    Time bins that already hold a frame from the coarse pass are not sampled
+    again, so the coarse samples count towards the target density and no frame
+    is run through MediaPipe twice.
+    """
+
+    def __init__(self, schedule: List[Tuple[float, float]], covered_timestamps: Iterable[float] = ()):
+        """
+        Args:
+            schedule: (segment_start_seconds, analysis_fps) pairs sorted by start
+            covered_timestamps: Timestamps of frames that were already analyzed
+        """
+        if not schedule:
+            raise ValueError("schedule must contain at least one segment")
+        super().__init__(target_fps=max(rate for _, rate in schedule))
+        self.schedule = schedule
+        self._starts = [start for start, _ in schedule]
+        self._covered = {self._bin(timestamp) for timestamp in covered_timestamps}
+
+    def _bin(self, timestamp: float) -> Tuple[int, int]:
+        segment = max(0, bisect.bisect_right(self._starts, timestamp) - 1)
+        start, rate = self.schedule[segment]
+        return segment, math.floor((timestamp - start) * rate + 1e-6)
+
+    def keep(self, frame_number: int, timestamp: float) -> bool:
+        time_bin = self._bin(timestamp)
+        keep = time_bin != self._last_bin
+        self._last_bin = time_bin
+        return keep and time_bin not in self._covered
+
+    def describe(self, source_fps: float) -> str:
+        rates = [min(rate, source_fps) for _, rate in self.schedule]
+        return f"adaptive {min(rates):.1f}-{max(rates):.1f} frames/s over {len(rates)} segments"
+
+
+def estimate_cycle_frequency(timestamps: np.ndarray, wrist_x: np.ndarray) -> Optional[float]:
+    """
+    Estimate the dominant stroke-cycle frequency (Hz) of a wrist trajectory.
+
+    The samples are resampled onto a uniform grid, detrended and windowed, and
+    the strongest spectral peak inside [MIN_CYCLE_HZ, MAX_CYCLE_HZ] is returned.
+    Returns None when there is too little signal to tell.
+    """
+    if len(timestamps) < 8:
+        return None
+    duration = timestamps[-1] - timestamps[0]
+    if duration < 1.0 / MIN_CYCLE_HZ:
+        return None
+
+    rate = (len(timestamps) - 1) / duration
+    grid = np.arange(timestamps[0], timestamps[-1], 1.0 / rate)
+    signal = np.interp(grid, timestamps, wrist_x)
+    signal = signal - np.polyval(np.polyfit(grid, signal, 1), grid)
+    signal *= np.hanning(len(signal))
+
+    n_fft = max(256, 1 << int(math.ceil(math.log2(len(signal)))))
+    spectrum = np.abs(np.fft.rfft(signal, n_fft))
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / rate)
+    band = (freqs >= MIN_CYCLE_HZ) & (freqs <= MAX_CYCLE_HZ)
+    if not band.any() or spectrum[band].max() <= 0:
+        return None
+    return float(freqs[band][np.argmax(spectrum[band])])
+
+
+def plan_adaptive_rates(pose_track: PoseTrack, start_time: float, end_time: float) -> List[Tuple[float, float]]:
+    """
+    Choose an analysis rate for each ADAPTIVE_SEGMENT_SECONDS window of a video.
+
+    The cycle frequency of a window comes from whichever wrist has more
+    visible samples in it, so a swimmer filmed from one side is not left at
+    the rate floor because the far arm is occluded.
+
+    Args:
+        pose_track: Coarse-pass pose data (see PoseDetector.process_video)
+        start_time: Start of the analyzed part of the video in seconds
+        end_time: End of the analyzed part in seconds
+
+    Returns:
+        (segment_start_seconds, analysis_fps) pairs covering
+        [start_time, end_time).  Segments with no detected swimmer get
+        MIN_ANALYSIS_FPS; segments with a swimmer but no clear cycle
+        frequency get MAX_ANALYSIS_FPS so that no stroke is under-sampled.
+    """
+    detected = pose_track.timestamps[pose_track.detected]
+    wrists = []
+    for name in ('left_wrist', 'right_wrist'):
+        wrist = pose_track.landmark(name)
+        visible = pose_track.detected & (wrist[:, VISIBILITY] >= MIN_VISIBILITY)
+        wrists.append((pose_track.timestamps[visible], wrist[visible, X].astype(float)))
+
+    schedule = []
+    n_segments = max(1, int(math.ceil((end_time - start_time) / ADAPTIVE_SEGMENT_SECONDS)))
+    for i in range(n_segments):
+        start = start_time + i * ADAPTIVE_SEGMENT_SECONDS
+        masks = [(timestamps >= start) & (timestamps < start + ADAPTIVE_SEGMENT_SECONDS)
+                 for timestamps, _ in wrists]
+        side = int(np.argmax([mask.sum() for mask in masks]))
+        (timestamps, wrist_x), mask = wrists[side], masks[side]
+        cycle_hz = estimate_cycle_frequency(timestamps[mask], wrist_x[mask])
+        if not ((detected >= start) & (detected < start + ADAPTIVE_SEGMENT_SECONDS)).any():
+            rate = MIN_ANALYSIS_FPS
+        elif cycle_hz is None:
+            rate = MAX_ANALYSIS_FPS
+        else:
+            rate = min(MAX_ANALYSIS_FPS, max(MIN_ANALYSIS_FPS, cycle_hz * SAMPLES_PER_STROKE_CYCLE))
+
+        # Merge neighbouring segments that ended up with the same rate
+        if schedule and abs(schedule[-1][1] - rate) < 1e-6:
+            continue
+        schedule.append((start, rate))
+
+    return schedule
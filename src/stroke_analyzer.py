@@ -1,7 +1,7 @@
 """Analyzes swimming stroke metrics and detects technique issues."""
 
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from src.models.freestyle_rules import (
     ELBOW_ANGLE_OPTIMAL_MIN, ELBOW_ANGLE_OPTIMAL_MAX, ELBOW_ANGLE_DROPPED,
     BODY_ROTATION_OPTIMAL_MIN, BODY_ROTATION_OPTIMAL_MAX,
@@ -12,57 +12,275 @@ from src.models.freestyle_rules import (
     MIN_VISIBILITY, FreestyleIssue, ISSUE_TYPES,
     SEVERITY_CRITICAL, SEVERITY_MODERATE, SEVERITY_MINOR
 )
+from src.kinematics import KinematicsTable
+from src.pose_track import PoseTrack, PoseTrackBuilder, VISIBILITY, X, Y
+from src.running_stats import RunningStats
+from src.stroke_cycles import StrokeCycleIndex, detect_cycle_peaks
+
+# Streaming analysis buffers this many frames before folding them into the
+# running statistics, so per-frame cost stays vectorized and memory constant.
+STREAM_CHUNK_FRAMES = 256
+
+# Fractions of the video after which streaming analysis publishes provisional
+# results (the last one is the final result).
+PROGRESS_CHECKPOINTS = (0.10, 0.25, 0.50, 1.0)
+
+# Provisional results count as fully confident once this many left-arm stroke
+# cycles have been seen.
+CONFIDENT_STROKE_CYCLES = 8
 
 
 class StrokeAnalyzer:
     """Analyzes freestyle swimming technique from pose data."""
 
-    def __init__(self):
-        """Initialize stroke analyzer."""
+    def __init__(self, gaps: Sequence[Tuple[float, float]] = ()):
+        """
+        Initialize stroke analyzer.
+
+        Args:
+            gaps: (start, end) times (s) left out between analyzed segments
+                (src.activity.segment_gaps); the stroke rate duration and
+                stroke cycles skip them
+        """
+        self.gaps = gaps
         self.metrics = {}
         self.issues = []
+        self.cycles = None
+        self._state = None
+        self._chunk = None
+        self._chunks = None  # Streamed chunks, when the whole track is kept
+        self.track = None
 
-    def analyze_video(self, pose_data: List[Dict]) -> Dict:
+    def analyze_video(self, pose_data: Union[PoseTrack, List[Dict]]) -> Dict:
         """
         Analyze complete video pose data.
 
         Args:
-            pose_data: List of frame data with pose information
+            pose_data: PoseTrack from PoseDetector.process_video (a list of
+                per-frame dictionaries is also accepted)
 
         Returns:
             Dictionary containing metrics and detected issues
         """
         print("\nAnalyzing stroke mechanics...")
 
-        # Filter frames with valid pose data
-        valid_frames = [frame for frame in pose_data if frame['pose'] is not None]
+        pose_data = PoseTrack.from_frames(pose_data)
+        state = _AnalysisState(self.gaps)
+        state.add(pose_data)
+
+        # Stroke cycles over the full track, so its rows line up with the
+        # visualizer's (frames without a pose have zero visibility)
+        self.cycles = StrokeCycleIndex(pose_data, self.gaps) if state.valid_frames else None
+
+        return self._results(state)
+
+    # ------------------------------------------------------------------
+    # Streaming
+    # ------------------------------------------------------------------
+    def begin_stream(self, keep_track: bool = False):
+        """
+        Start an online analysis fed frame by frame through update().
+
+        Args:
+            keep_track: Also keep the streamed frames, so that finish_stream()
+                leaves the full PoseTrack in ``self.track`` and builds the
+                stroke cycle index (memory then grows with video length)
+        """
+        print("\nAnalyzing stroke mechanics (streaming)...")
+        self._state = _AnalysisState(self.gaps)
+        self._chunk = PoseTrackBuilder()
+        self._chunks = [] if keep_track else None
+        self.track = None
+        self.cycles = None
+
+    def update(self, frame: Dict):
+        """
+        Add one analyzed frame.
+
+        Args:
+            frame: ``{'frame_number', 'timestamp', 'pose'}`` dictionary as
+                yielded by PoseDetector.stream_video
+        """
+        self._chunk.append(frame['frame_number'], frame['timestamp'], frame['pose'])
+        if len(self._chunk) >= STREAM_CHUNK_FRAMES:
+            self._flush_chunk()
+
+    def add_track(self, track: PoseTrack):
+        """Add a block of analyzed frames in frame order (e.g. a shard from PoseDetector's ``on_shard``)."""
+        self._flush_chunk()
+        if len(track):
+            self._state.add(track)
+            if self._chunks is not None:
+                self._chunks.append(track)
+
+    def snapshot(self, progress: float) -> Dict:
+        """
+        Provisional results for the frames streamed so far.
+
+        Only the running statistics are summarized, so the cost does not grow
+        with the number of frames already analyzed (apart from the stroke
+        rate peak search over the left-wrist trajectory).
 
-        if len(valid_frames) == 0:
+        Args:
+            progress: Fraction of the video covered so far (0-1)
+
+        Returns:
+            Same dictionary as analyze_video, plus ``progress`` and a
+            ``confidence`` between 0 and 1 (see _confidence)
+        """
+        self._flush_chunk()
+        results = self._results(self._state)
+        results['progress'] = progress
+        results['confidence'] = self._confidence(self._state, progress)
+        return results
+
+    def finish_stream(self) -> Dict:
+        """Finish an online analysis; returns the same result as analyze_video."""
+        self._flush_chunk()
+        if self._chunks is not None:
+            self.track = PoseTrack.merge(self._chunks)
+            self._chunks = None
+            if self._state.valid_frames:
+                self.cycles = StrokeCycleIndex(self.track, self.gaps)
+        return self._results(self._state)
+
+    def analyze_stream(
+        self,
+        frames: Iterable[Dict],
+        total_frames: Optional[int] = None,
+        on_checkpoint: Optional[Callable[[Dict], None]] = None,
+        keep_track: bool = False,
+        start_frame: int = 0,
+        progress_of: Optional[Callable[[int], float]] = None
+    ) -> Dict:
+        """
+        Analyze frames as they are produced, in constant memory.
+
+        Running statistics are updated chunk by chunk instead of holding the
+        whole video's pose data, and the result matches analyze_video over
+        the same frames.  Only the visible left-wrist trajectory used for the
+        stroke rate (12 bytes per frame) is kept until the end.
+
+        Args:
+            frames: Per-frame dictionaries in frame order
+            total_frames: Source frame count, used to place PROGRESS_CHECKPOINTS
+                (frame count of the window when only part of the video is analyzed)
+            on_checkpoint: Called with snapshot() results at each checkpoint,
+                including the final one
+            keep_track: See begin_stream
+            start_frame: First source frame of the analyzed window
+            progress_of: Fraction of the job done once a frame number is
+                analyzed, replacing total_frames/start_frame (e.g.
+                src.activity.segment_progress for several segments)
+        """
+        self.begin_stream(keep_track)
+        report = self._checkpoint_reporter(on_checkpoint, total_frames, start_frame, progress_of)
+        for frame in frames:
+            self.update(frame)
+            report(frame['frame_number'])
+        return self._finish_with_checkpoint(on_checkpoint)
+
+    def analyze_shards(
+        self,
+        detect: Callable[[Callable[[PoseTrack], None]], None],
+        total_frames: Optional[int] = None,
+        on_checkpoint: Optional[Callable[[Dict], None]] = None,
+        keep_track: bool = False,
+        start_frame: int = 0,
+        progress_of: Optional[Callable[[int], float]] = None
+    ) -> Dict:
+        """
+        analyze_stream for detection that hands over blocks of frames.
+
+        `detect` runs the detection, calling the function it is given with
+        each block in frame order (e.g. PoseDetector.process_video with
+        ``on_shard``), so sharded detection still publishes checkpoints as
+        its shards complete.  The other arguments are as for analyze_stream.
+        """
+        self.begin_stream(keep_track)
+        report = self._checkpoint_reporter(on_checkpoint, total_frames, start_frame, progress_of)
+
+        def add(track: PoseTrack):
+            self.add_track(track)
+            if len(track):
+                report(int(track.frame_numbers[-1]))
+
+        detect(add)
+        return self._finish_with_checkpoint(on_checkpoint)
+
+    def _checkpoint_reporter(self, on_checkpoint, total_frames, start_frame, progress_of):
+        """Function of the last analyzed frame number that publishes snapshot() at PROGRESS_CHECKPOINTS."""
+        if progress_of is None and total_frames:
+            def progress_of(frame_number):
+                return (frame_number + 1 - start_frame) / total_frames
+        pending = list(PROGRESS_CHECKPOINTS[:-1]) if on_checkpoint and progress_of else []
+
+        def report(frame_number: int):
+            if not pending:
+                return
+            progress = progress_of(frame_number)
+            if progress >= pending[0]:
+                # Report once even if several checkpoints were passed
+                while pending and progress >= pending[0]:
+                    checkpoint = pending.pop(0)
+                on_checkpoint(self.snapshot(checkpoint))
+
+        return report
+
+    def _finish_with_checkpoint(self, on_checkpoint) -> Dict:
+        results = self.finish_stream()
+        if on_checkpoint:
+            results['progress'] = PROGRESS_CHECKPOINTS[-1]
+            results['confidence'] = self._confidence(self._state, PROGRESS_CHECKPOINTS[-1])
+            on_checkpoint(results)
+        return results
+
+    def _flush_chunk(self):
+        if len(self._chunk):
+            chunk = self._chunk.build()
+            self._state.add(chunk)
+            if self._chunks is not None:
+                self._chunks.append(chunk)
+            self._chunk = PoseTrackBuilder()
+
+    @staticmethod
+    def _confidence(state: '_AnalysisState', progress: float) -> float:
+        """
+        How far provisional results can be trusted (0-1).
+
+        The weakest of: share of the video covered, share of frames with a
+        detected swimmer, and stroke cycles seen relative to
+        CONFIDENT_STROKE_CYCLES.
+        """
+        if state.total_frames == 0:
+            return 0.0
+        detection = state.valid_frames / state.total_frames
+        strokes = min(1.0, state.left_peaks / CONFIDENT_STROKE_CYCLES)
+        return round(min(progress, detection, strokes), 2)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+    def _results(self, state: '_AnalysisState') -> Dict:
+        """Metrics and issues from accumulated analysis state."""
+        if state.valid_frames == 0:
             return {
                 'error': 'No valid pose data detected in video',
                 'metrics': {},
                 'issues': []
             }
 
-        print(f"Valid frames: {len(valid_frames)}/{len(pose_data)}")
-
-        # Analyze different aspects
-        elbow_metrics = self._analyze_elbow_angles(valid_frames)
-        rotation_metrics = self._analyze_body_rotation(valid_frames)
-        entry_metrics = self._analyze_arm_entry(valid_frames)
-        head_metrics = self._analyze_head_position(valid_frames)
-        stroke_rate_metrics = self._analyze_stroke_rate(valid_frames)
-        kick_metrics = self._analyze_kick(valid_frames)
+        print(f"Valid frames: {state.valid_frames}/{state.total_frames}")
 
         # Combine all metrics
         self.metrics = {
-            'elbow': elbow_metrics,
-            'rotation': rotation_metrics,
-            'entry': entry_metrics,
-            'head': head_metrics,
-            'stroke_rate': stroke_rate_metrics,
-            'kick': kick_metrics,
-            'valid_frame_ratio': len(valid_frames) / len(pose_data)
+            'elbow': self._elbow_metrics(state),
+            'rotation': self._rotation_metrics(state),
+            'entry': self._entry_metrics(state),
+            'head': self._head_metrics(state),
+            'stroke_rate': self._stroke_rate_metrics(state),
+            'kick': self._kick_metrics(state),
+            'valid_frame_ratio': state.valid_frames / state.total_frames
         }
 
         # Detect issues based on metrics
@@ -70,189 +288,73 @@ class StrokeAnalyzer:
 
         return {
             'metrics': self.metrics,
-            'issues': self.issues
+            'issues': self.issues,
+            'cycles': self.cycles
         }
 
-    def _analyze_elbow_angles(self, frames: List[Dict]) -> Dict:
-        """Analyze elbow angles during catch phase."""
-        left_elbow_angles = []
-        right_elbow_angles = []
-
-        for frame in frames:
-            landmarks = frame['pose']['landmarks']
-
-            # Check visibility
-            if (landmarks['left_shoulder']['visibility'] < MIN_VISIBILITY or
-                landmarks['left_elbow']['visibility'] < MIN_VISIBILITY or
-                landmarks['left_wrist']['visibility'] < MIN_VISIBILITY):
-                continue
-
-            # Calculate left elbow angle
-            angle = self._calculate_angle(
-                landmarks['left_shoulder'],
-                landmarks['left_elbow'],
-                landmarks['left_wrist']
-            )
-            left_elbow_angles.append(angle)
-
-            # Calculate right elbow angle
-            if (landmarks['right_shoulder']['visibility'] >= MIN_VISIBILITY and
-                landmarks['right_elbow']['visibility'] >= MIN_VISIBILITY and
-                landmarks['right_wrist']['visibility'] >= MIN_VISIBILITY):
-
-                angle = self._calculate_angle(
-                    landmarks['right_shoulder'],
-                    landmarks['right_elbow'],
-                    landmarks['right_wrist']
-                )
-                right_elbow_angles.append(angle)
-
-        all_angles = left_elbow_angles + right_elbow_angles
-
+    @staticmethod
+    def _elbow_metrics(state: '_AnalysisState') -> Dict:
+        """Elbow angles during catch phase."""
         return {
-            'avg_angle': np.mean(all_angles) if all_angles else None,
-            'min_angle': np.min(all_angles) if all_angles else None,
-            'max_angle': np.max(all_angles) if all_angles else None,
-            'left_avg': np.mean(left_elbow_angles) if left_elbow_angles else None,
-            'right_avg': np.mean(right_elbow_angles) if right_elbow_angles else None,
+            'avg_angle': state.elbow.mean,
+            'min_angle': state.elbow.min,
+            'max_angle': state.elbow.max,
+            'left_avg': state.left_elbow.mean,
+            'right_avg': state.right_elbow.mean,
         }
 
-    def _analyze_body_rotation(self, frames: List[Dict]) -> Dict:
-        """Analyze body rotation throughout stroke cycle."""
-        rotations = []
-
-        for frame in frames:
-            landmarks = frame['pose']['landmarks']
-
-            # Simplified rotation calculation using shoulder and hip width
-            shoulder_width = abs(landmarks['left_shoulder']['x'] - landmarks['right_shoulder']['x'])
-            hip_width = abs(landmarks['left_hip']['x'] - landmarks['right_hip']['x'])
-
-            # Average the two
-            avg_width = (shoulder_width + hip_width) / 2
-            frame_width = frame['pose']['frame_shape'][1]
-
-            # Normalize and estimate rotation
-            # This is approximate - proper rotation needs 3D or multiple angles
-            width_ratio = avg_width / frame_width
-            estimated_rotation = 90 - (width_ratio * 180)  # Heuristic
-
-            # Clamp to reasonable range
-            estimated_rotation = max(0, min(90, estimated_rotation))
-            rotations.append(estimated_rotation)
-
+    @staticmethod
+    def _rotation_metrics(state: '_AnalysisState') -> Dict:
+        """Body rotation throughout stroke cycle."""
         return {
-            'avg_rotation': np.mean(rotations) if rotations else None,
-            'min_rotation': np.min(rotations) if rotations else None,
-            'max_rotation': np.max(rotations) if rotations else None,
-            'std_rotation': np.std(rotations) if rotations else None,
+            'avg_rotation': state.rotation.mean,
+            'min_rotation': state.rotation.min,
+            'max_rotation': state.rotation.max,
+            'std_rotation': state.rotation.std,
         }
 
-    def _analyze_arm_entry(self, frames: List[Dict]) -> Dict:
-        """Analyze arm entry position relative to centerline."""
-        centerline_crossings = []
-
-        for frame in frames:
-            landmarks = frame['pose']['landmarks']
-            frame_width = frame['pose']['frame_shape'][1]
-
-            # Calculate body centerline (midpoint between shoulders)
-            center_x = (landmarks['left_shoulder']['x'] + landmarks['right_shoulder']['x']) / 2
-
-            # Check left wrist entry
-            if landmarks['left_wrist']['visibility'] >= MIN_VISIBILITY:
-                left_distance = abs(landmarks['left_wrist']['x'] - center_x)
-                left_crossing = left_distance / frame_width
-                centerline_crossings.append(left_crossing)
-
-            # Check right wrist entry
-            if landmarks['right_wrist']['visibility'] >= MIN_VISIBILITY:
-                right_distance = abs(landmarks['right_wrist']['x'] - center_x)
-                right_crossing = right_distance / frame_width
-                centerline_crossings.append(right_crossing)
-
+    @staticmethod
+    def _entry_metrics(state: '_AnalysisState') -> Dict:
+        """Arm entry position relative to centerline."""
         return {
-            'avg_centerline_distance': np.mean(centerline_crossings) if centerline_crossings else None,
-            'max_crossing': np.max(centerline_crossings) if centerline_crossings else None,
+            'avg_centerline_distance': state.entry.mean,
+            'max_crossing': state.entry.max,
         }
 
-    def _analyze_head_position(self, frames: List[Dict]) -> Dict:
-        """Analyze head stability and lifting during breathing."""
-        nose_y_positions = []
-
-        for frame in frames:
-            landmarks = frame['pose']['landmarks']
-            if landmarks['nose']['visibility'] >= MIN_VISIBILITY:
-                nose_y_positions.append(landmarks['nose']['y'])
-
-        if not nose_y_positions:
+    @staticmethod
+    def _head_metrics(state: '_AnalysisState') -> Dict:
+        """Head stability and lifting during breathing."""
+        if not state.nose_y.count:
             return {'stability': None}
 
-        # Calculate vertical movement range
-        y_range = np.max(nose_y_positions) - np.min(nose_y_positions)
-        frame_height = frames[0]['pose']['frame_shape'][0]
-        normalized_range = y_range / frame_height
+        # Vertical movement range
+        y_range = state.nose_y.max - state.nose_y.min
+        normalized_range = y_range / state.frame_shape[0]
 
         return {
             'vertical_movement': normalized_range,
-            'avg_y': np.mean(nose_y_positions),
+            'avg_y': state.nose_y.mean,
             'stability': 1.0 - normalized_range  # Higher = more stable
         }
 
-    def _analyze_stroke_rate(self, frames: List[Dict]) -> Dict:
+    @staticmethod
+    def _stroke_rate_metrics(state: '_AnalysisState') -> Dict:
         """
-        Analyze stroke rate (strokes per minute).
+        Stroke rate (strokes per minute).
 
-        Uses a smoothed wrist-x trajectory with minimum-distance peak detection
-        to avoid counting micro-jitters as stroke cycles.  Each detected peak in
-        the LEFT wrist trajectory represents one arm recovering forward, so
-        SPM = left-arm peaks × 2 (both arms) / duration_minutes.
+        Uses a smoothed left-wrist x trajectory with minimum-distance peak
+        detection (see src.stroke_cycles).  Each peak represents one arm
+        recovering forward, so SPM = left-arm peaks × 2 (both arms) /
+        duration_minutes.
         """
-        if len(frames) < 10:
+        timestamps, wrist_x = state.left_wrist_trajectory()
+        peaks, duration = detect_cycle_peaks(timestamps, wrist_x, state.gaps)
+        state.left_peaks = len(peaks)
+        if duration is None:
             return {'spm': None}
 
-        # Collect (frame_timestamp, wrist_x) pairs for the left wrist
-        samples = []
-        for frame in frames:
-            landmarks = frame['pose']['landmarks']
-            if landmarks['left_wrist']['visibility'] >= MIN_VISIBILITY:
-                samples.append((frame['timestamp'], landmarks['left_wrist']['x']))
-
-        if len(samples) < 10:
-            return {'spm': None}
-
-        timestamps = [s[0] for s in samples]
-        wrist_x = [s[1] for s in samples]
-        duration = timestamps[-1] - timestamps[0]
-
-        if duration <= 0:
-            return {'spm': None}
-
-        # --- Smooth the trajectory to remove frame-level jitter ---
-        window = max(3, len(wrist_x) // 20)  # ~5% of samples, at least 3
-        smoothed = self._moving_average(wrist_x, window)
-
-        # --- Estimate minimum gap between peaks ---
-        # Assume a maximum realistic stroke rate of 100 SPM = 0.6 s/stroke.
-        # With the processed frame rate (samples spread over `duration`), that
-        # translates to a minimum sample-index gap.
-        fps_equiv = len(smoothed) / duration  # samples per second
-        min_peak_gap = max(3, int(fps_equiv * 0.5))  # at least 0.5 s between peaks
-
-        # --- Find peaks with minimum distance enforcement ---
-        candidate_peaks = []
-        for i in range(1, len(smoothed) - 1):
-            if smoothed[i] >= smoothed[i - 1] and smoothed[i] >= smoothed[i + 1]:
-                candidate_peaks.append(i)
-
-        # Keep only peaks that are far enough apart (greedy: first peak wins)
-        filtered_peaks = []
-        for peak in candidate_peaks:
-            if not filtered_peaks or (peak - filtered_peaks[-1]) >= min_peak_gap:
-                filtered_peaks.append(peak)
-
         # Each left-wrist peak = one left-arm entry = 2 arm strokes total
-        total_strokes = len(filtered_peaks) * 2
+        total_strokes = len(peaks) * 2
         spm = (total_strokes / duration) * 60
 
         # Sanity check: clamp to a plausible swimming range (20–120 SPM)
@@ -266,52 +368,11 @@ class StrokeAnalyzer:
         }
 
     @staticmethod
-    def _moving_average(values: List[float], window: int) -> List[float]:
-        """Apply a simple centred moving average to smooth a 1-D signal."""
-        if window < 2 or len(values) < window:
-            return list(values)
-        half = window // 2
-        smoothed = []
-        for i in range(len(values)):
-            lo = max(0, i - half)
-            hi = min(len(values), i + half + 1)
-            smoothed.append(sum(values[lo:hi]) / (hi - lo))
-        return smoothed
-
-    def _analyze_kick(self, frames: List[Dict]) -> Dict:
-        """Analyze kick technique - knee bend."""
-        knee_angles = []
-
-        for frame in frames:
-            landmarks = frame['pose']['landmarks']
-
-            # Left leg
-            if (landmarks['left_hip']['visibility'] >= MIN_VISIBILITY and
-                landmarks['left_knee']['visibility'] >= MIN_VISIBILITY and
-                landmarks['left_ankle']['visibility'] >= MIN_VISIBILITY):
-
-                angle = self._calculate_angle(
-                    landmarks['left_hip'],
-                    landmarks['left_knee'],
-                    landmarks['left_ankle']
-                )
-                knee_angles.append(angle)
-
-            # Right leg
-            if (landmarks['right_hip']['visibility'] >= MIN_VISIBILITY and
-                landmarks['right_knee']['visibility'] >= MIN_VISIBILITY and
-                landmarks['right_ankle']['visibility'] >= MIN_VISIBILITY):
-
-                angle = self._calculate_angle(
-                    landmarks['right_hip'],
-                    landmarks['right_knee'],
-                    landmarks['right_ankle']
-                )
-                knee_angles.append(angle)
-
+    def _kick_metrics(state: '_AnalysisState') -> Dict:
+        """Kick technique - knee bend."""
         return {
-            'avg_knee_angle': np.mean(knee_angles) if knee_angles else None,
-            'min_knee_angle': np.min(knee_angles) if knee_angles else None,
+            'avg_knee_angle': state.knee.mean,
+            'min_knee_angle': state.knee.min,
         }
 
     def _detect_issues(self) -> List[FreestyleIssue]:
@@ -411,18 +472,111 @@ class StrokeAnalyzer:
 
         return issues
 
-    @staticmethod
-    def _calculate_angle(point1: Dict, point2: Dict, point3: Dict) -> float:
-        """Calculate angle between three points."""
-        p1 = np.array([point1['x'], point1['y']])
-        p2 = np.array([point2['x'], point2['y']])
-        p3 = np.array([point3['x'], point3['y']])
-
-        v1 = p1 - p2
-        v2 = p3 - p2
-
-        cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
-        cos_angle = np.clip(cos_angle, -1.0, 1.0)
-        angle = np.arccos(cos_angle)
 
-        return np.degrees(angle)
+class _AnalysisState:
+    """
+    Running statistics behind StrokeAnalyzer's metrics.
+
+    Updated one PoseTrack chunk at a time; analyze_video passes the whole
+    track as a single chunk and streaming passes fixed-size chunks, so both
+    compute every metric from the same per-frame samples.
+    """
+
+    def __init__(self, gaps: Sequence[Tuple[float, float]] = ()):
+        self.gaps = gaps
+        self.total_frames = 0
+        self.valid_frames = 0
+        self.frame_shape = None
+        self.elbow = RunningStats()  # Left and right together
+        self.left_elbow = RunningStats()
+        self.right_elbow = RunningStats()
+        self.rotation = RunningStats()
+        self.entry = RunningStats()
+        self.nose_y = RunningStats()
+        self.knee = RunningStats()
+        self._wrist_t = []
+        self._wrist_x = []
+        self.left_peaks = 0  # Set when the stroke rate is computed
+
+    def add(self, chunk: PoseTrack):
+        """Fold the frames of `chunk` into the statistics."""
+        self.total_frames += len(chunk)
+        track = chunk.valid()
+        if not len(track):
+            return
+        self.valid_frames += len(track)
+        self.frame_shape = track.frame_shape
+
+        # Joint angles for all frames in one batched pass
+        features = KinematicsTable(track)
+
+        # Elbow angles; the right arm is only measured on frames where the
+        # left arm is visible too
+        left_visible = features.angle_visible('left_elbow', MIN_VISIBILITY)
+        right_visible = left_visible & features.angle_visible('right_elbow', MIN_VISIBILITY)
+        left_angles = features.angle('left_elbow')[left_visible]
+        right_angles = features.angle('right_elbow')[right_visible]
+        self.left_elbow.add(left_angles)
+        self.right_elbow.add(right_angles)
+        self.elbow.add(left_angles)
+        self.elbow.add(right_angles)
+
+        self.rotation.add(body_rotation(track))
+
+        # Arm entry
+        for wrist in ('left_wrist', 'right_wrist'):
+            self.entry.add(centerline_distance(track, wrist)[_visible(track, wrist)])
+
+        # Head position
+        self.nose_y.add(_coord(track, 'nose', Y)[_visible(track, 'nose')])
+
+        # Kick: knee bend
+        for knee in ('left_knee', 'right_knee'):
+            self.knee.add(features.angle(knee)[features.angle_visible(knee, MIN_VISIBILITY)])
+
+        # Stroke rate needs the whole trajectory (the smoothing window scales with it)
+        visible = _visible(track, 'left_wrist')
+        self._wrist_t.append(track.timestamps[visible])
+        self._wrist_x.append(track.landmark('left_wrist')[visible, X])
+
+    def left_wrist_trajectory(self):
+        """(timestamps, x) of every frame so far with a visible left wrist."""
+        if not self._wrist_t:
+            return np.zeros(0), np.zeros(0, dtype=np.float32)
+        # Keep the concatenated arrays so later calls only append new chunks
+        self._wrist_t = [np.concatenate(self._wrist_t)]
+        self._wrist_x = [np.concatenate(self._wrist_x)]
+        return self._wrist_t[0], self._wrist_x[0]
+
+
+def body_rotation(track: PoseTrack) -> np.ndarray:
+    """
+    (N,) body rotation estimate in degrees per frame.
+
+    Simplified estimate from shoulder and hip width.  This is approximate -
+    proper rotation needs 3D or multiple angles.
+    """
+    frame_width = track.frame_shape[1]
+    shoulder_width = np.abs(_coord(track, 'left_shoulder', X) - _coord(track, 'right_shoulder', X))
+    hip_width = np.abs(_coord(track, 'left_hip', X) - _coord(track, 'right_hip', X))
+    width_ratio = ((shoulder_width + hip_width) / 2) / frame_width
+    return np.clip(90 - (width_ratio * 180), 0, 90)  # Heuristic, clamped to a reasonable range
+
+
+def centerline_distance(track: PoseTrack, wrist: str) -> np.ndarray:
+    """(N,) wrist distance from the body centerline (midpoint between shoulders) as a fraction of frame width."""
+    center_x = (_coord(track, 'left_shoulder', X) + _coord(track, 'right_shoulder', X)) / 2
+    return np.abs(_coord(track, wrist, X) - center_x) / track.frame_shape[1]
+
+
+def _coord(track: PoseTrack, name: str, field: int) -> np.ndarray:
+    """(N,) float64 column of one landmark field."""
+    return track.landmark(name)[:, field].astype(np.float64)
+
+
+def _visible(track: PoseTrack, *names: str) -> np.ndarray:
+    """(N,) mask of frames where every named landmark reaches MIN_VISIBILITY."""
+    mask = np.ones(len(track), dtype=bool)
+    for name in names:
+        mask &= track.landmark(name)[:, VISIBILITY] >= MIN_VISIBILITY
+    return mask
@@ -0,0 +1,217 @@
+"""Stroke cycle detection from wrist trajectories."""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.freestyle_rules import MIN_VISIBILITY
+from src.pose_track import VISIBILITY, X, PoseTrack
+
+# Fewest visible wrist samples needed before cycles are detected
+MIN_CYCLE_SAMPLES = 10
+
+# Peaks closer than this are one stroke (100 SPM = 0.6 s per stroke)
+MIN_PEAK_INTERVAL_S = 0.5
+
+
+def _gap_overlap(start: np.ndarray, end: np.ndarray, gaps: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """Seconds of `gaps` ((start, end) times that were not analyzed) inside each [start, end]."""
+    overlap = np.zeros(np.shape(start))
+    for gap_start, gap_end in gaps:
+        overlap += np.clip(np.minimum(end, gap_end) - np.maximum(start, gap_start), 0.0, None)
+    return overlap
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """Centred moving average (truncated at the ends) of a 1-D signal, via a prefix sum."""
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if window < 2 or n < window:
+        return values
+    half = window // 2
+    csum = np.concatenate([[0.0], np.cumsum(values)])
+    idx = np.arange(n)
+    lo = np.maximum(0, idx - half)
+    hi = np.minimum(n, idx + half + 1)
+    return (csum[hi] - csum[lo]) / (hi - lo)
+
+
+def find_peaks(signal: np.ndarray, min_distance: int, min_prominence: float = 0.0) -> np.ndarray:
+    """
+    Indices of local maxima of `signal`, filtered by prominence and distance.
+
+    A sample is a candidate when it is >= both neighbours.  Its prominence is
+    its height above the higher of the two troughs separating it from the
+    neighbouring candidates.  Of candidates closer than `min_distance`
+    samples the earliest wins, and the next kept peak is the first candidate
+    at least `min_distance` after it.
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    if len(signal) < 3:
+        return np.zeros(0, dtype=np.intp)
+
+    inner = signal[1:-1]
+    peaks = np.flatnonzero((inner >= signal[:-2]) & (inner >= signal[2:])) + 1
+
+    if min_prominence > 0 and len(peaks):
+        # Minimum of the signal on each stretch between consecutive candidates
+        bounds = np.concatenate([[0], peaks, [len(signal)]])
+        troughs = np.minimum.reduceat(signal, bounds[:-1])
+        prominence = signal[peaks] - np.maximum(troughs[:-1], troughs[1:])
+        peaks = peaks[prominence >= min_prominence]
+
+    if len(peaks) < 2 or min_distance <= 1:
+        return peaks
+
+    # next_kept[i]: first candidate at least min_distance after candidate i
+    next_kept = np.searchsorted(peaks, peaks + min_distance)
+    kept = []
+    i = 0
+    while i < len(peaks):
+        kept.append(i)
+        i = next_kept[i]
+    return peaks[kept]
+
+
+def detect_cycle_peaks(
+    timestamps: np.ndarray,
+    wrist_x: np.ndarray,
+    gaps: Sequence[Tuple[float, float]] = ()
+) -> Tuple[np.ndarray, Optional[float]]:
+    """
+    Peaks of a visible-wrist x trajectory, one per stroke cycle of that arm.
+
+    Args:
+        timestamps: Sample times (s)
+        wrist_x: Wrist x coordinate of each sample
+        gaps: (start, end) times between analyzed segments, left out of the
+            duration since no strokes can be counted in them
+
+    Returns:
+        (sample indices of the peaks, duration covered in seconds).  With
+        fewer than MIN_CYCLE_SAMPLES samples or no elapsed time there are no
+        peaks and the duration is None.
+    """
+    if len(timestamps) < MIN_CYCLE_SAMPLES:
+        return np.zeros(0, dtype=np.intp), None
+    duration = float(timestamps[-1] - timestamps[0])
+    if gaps:
+        duration -= float(_gap_overlap(timestamps[0], timestamps[-1], gaps))
+    if duration <= 0:
+        return np.zeros(0, dtype=np.intp), None
+
+    # Smooth over ~5% of samples (at least 3) to remove frame-level jitter
+    window = max(3, len(wrist_x) // 20)
+    smoothed = moving_average(wrist_x, window)
+    samples_per_second = len(smoothed) / duration
+    min_peak_gap = max(3, int(samples_per_second * MIN_PEAK_INTERVAL_S))
+    return find_peaks(smoothed, min_peak_gap), duration
+
+
+class StrokeCycleIndex:
+    """
+    Per-arm stroke cycles found in a PoseTrack.
+
+    Each arm's wrist x trajectory (frames where the wrist is visible) is
+    smoothed and its peaks found; one cycle runs from one peak to the next,
+    unless one of `gaps` (times between analyzed segments) lies between
+    them.  Cycle boundaries are stored as parallel arrays, and
+    ``cycle_of_row`` maps every track row to the cycle containing it so
+    per-frame lookups are a single array index.
+    """
+
+    ARMS = ('left', 'right')
+
+    def __init__(self, track: PoseTrack, gaps: Sequence[Tuple[float, float]] = ()):
+        self.frame_numbers = track.frame_numbers
+        self.timestamps = track.timestamps
+        self.gaps = gaps
+        self.peak_rows: Dict[str, np.ndarray] = {}
+        self._cycle_rows: Dict[str, np.ndarray] = {}
+        self.durations: Dict[str, Optional[float]] = {}
+        self._row_cycle: Dict[str, np.ndarray] = {}
+
+        for arm in self.ARMS:
+            self._index_arm(track, arm)
+
+    def _index_arm(self, track: PoseTrack, arm: str):
+        wrist = track.landmark(f'{arm}_wrist')
+        rows = np.flatnonzero(wrist[:, VISIBILITY] >= MIN_VISIBILITY)
+        peaks, duration = detect_cycle_peaks(track.timestamps[rows], wrist[rows, X], self.gaps)
+        self.peak_rows[arm] = rows[peaks]
+        self.durations[arm] = duration
+
+        # (C, 2) start/end rows of consecutive peak pairs that are one cycle
+        pairs = np.stack([self.peak_rows[arm][:-1], self.peak_rows[arm][1:]], axis=1)
+        if self.gaps:
+            times = track.timestamps[pairs]
+            pairs = pairs[_gap_overlap(times[:, 0], times[:, 1], self.gaps) == 0]
+        self._cycle_rows[arm] = pairs
+
+        starts, ends = self.start_rows(arm), self.end_rows(arm)
+        all_rows = np.arange(len(track))
+        if len(starts):
+            cycle = np.searchsorted(starts, all_rows, side='right') - 1
+            inside = (cycle >= 0) & (all_rows < ends[np.maximum(cycle, 0)])
+            self._row_cycle[arm] = np.where(inside, cycle, -1)
+        else:
+            self._row_cycle[arm] = np.full(len(track), -1, dtype=np.intp)
+
+    def count(self, arm: str) -> int:
+        """Number of complete cycles for an arm."""
+        return len(self._cycle_rows[arm])
+
+    def start_rows(self, arm: str) -> np.ndarray:
+        """(C,) track row where each cycle starts."""
+        return self._cycle_rows[arm][:, 0]
+
+    def end_rows(self, arm: str) -> np.ndarray:
+        """(C,) track row where each cycle ends (the next cycle's start, unless a gap follows)."""
+        return self._cycle_rows[arm][:, 1]
+
+    def start_frames(self, arm: str) -> np.ndarray:
+        """(C,) source frame number where each cycle starts."""
+        return self.frame_numbers[self.start_rows(arm)]
+
+    def end_frames(self, arm: str) -> np.ndarray:
+        """(C,) source frame number where each cycle ends."""
+        return self.frame_numbers[self.end_rows(arm)]
+
+    def start_times(self, arm: str) -> np.ndarray:
+        """(C,) timestamp (s) where each cycle starts."""
+        return self.timestamps[self.start_rows(arm)]
+
+    def end_times(self, arm: str) -> np.ndarray:
+        """(C,) timestamp (s) where each cycle ends."""
+        return self.timestamps[self.end_rows(arm)]
+
+    def cycle_of_row(self, arm: str) -> np.ndarray:
+        """(N,) cycle number containing each track row, -1 outside any cycle."""
+        return self._row_cycle[arm]
+
+    def per_cycle_mean(self, arm: str, values: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        (C,) mean of per-row `values` over each cycle's rows (NaN where no row counts).
+
+        Args:
+            values: (N,) per-track-row values, e.g. a KinematicsTable angle column
+            mask: (N,) rows to include (e.g. visibility), default all
+        """
+        cycle = self._row_cycle[arm]
+        keep = cycle >= 0 if mask is None else (cycle >= 0) & mask
+        n = self.count(arm)
+        sums = np.bincount(cycle[keep], weights=values[keep], minlength=n)
+        counts = np.bincount(cycle[keep], minlength=n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return sums / counts
+
+    def as_dict(self) -> Dict:
+        """Cycle boundaries per arm as plain lists (for JSON)."""
+        return {
+            arm: [
+                {'start_frame': int(sf), 'end_frame': int(ef), 'start_time': float(st), 'end_time': float(et)}
+                for sf, ef, st, et in zip(self.start_frames(arm), self.end_frames(arm),
+                                          self.start_times(arm), self.end_times(arm))
+            ]
+            for arm in self.ARMS
+        }
@@ -1,13 +1,410 @@
 """Video input/output processing utilities."""
 
+import contextlib
 import cv2
+import functools
+import hashlib
+import json
 import os
+import shutil
 import subprocess
+import tempfile
 import logging
-from typing import Tuple, Optional
+import zipfile
+import numpy as np
+from typing import List, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+# Streams browsers play as-is inside MP4: these only need +faststart
+BROWSER_VIDEO_CODECS = ('h264',)
+BROWSER_PIXEL_FORMATS = ('yuv420p', 'yuvj420p')
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_available(name: str) -> bool:
+    """Whether an ffmpeg-suite binary runs (checked once per process)."""
+    try:
+        subprocess.run([name, '-version'], capture_output=True, check=True, timeout=10)
+        return True
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+# OpenCV VideoWriter FourCCs in order of preference.  The H.264 ones work
+# natively on macOS and when OpenCV's ffmpeg has libx264; mp4v works
+# everywhere but needs reencode_for_browser() afterwards.
+OPENCV_FOURCCS = ('avc1', 'H264', 'X264', 'mp4v')
+
+
+class EncoderCapabilities:
+    """
+    Video encoding support of this process, probed once by get_capabilities().
+
+    Attributes:
+        ffmpeg: ffmpeg runs (re-encoding, remuxing, concatenation)
+        ffprobe: ffprobe runs (codec probing for the remux fast path)
+        libx264: ffmpeg has the libx264 encoder (FFmpegWriter)
+        opencv_fourcc: First FourCC of OPENCV_FOURCCS a cv2.VideoWriter
+            opens with, or None
+    """
+
+    def __init__(self, ffmpeg: bool, ffprobe: bool, libx264: bool, opencv_fourcc: Optional[str]):
+        self.ffmpeg = ffmpeg
+        self.ffprobe = ffprobe
+        self.libx264 = libx264
+        self.opencv_fourcc = opencv_fourcc
+
+    @property
+    def remux(self) -> bool:
+        """Already-H.264 output can be remuxed instead of transcoded."""
+        return self.ffmpeg and self.ffprobe
+
+    @classmethod
+    def probe(cls) -> 'EncoderCapabilities':
+        """Detect what is available (runs the tools and opens test writers)."""
+        ffmpeg = _tool_available('ffmpeg')
+        libx264 = False
+        if ffmpeg:
+            try:
+                result = subprocess.run(
+                    ['ffmpeg', '-hide_banner', '-encoders'], capture_output=True, timeout=10
+                )
+                libx264 = b'libx264' in result.stdout
+            except (OSError, subprocess.SubprocessError):
+                pass
+        return cls(ffmpeg, _tool_available('ffprobe'), libx264, cls._probe_opencv_fourcc())
+
+    @staticmethod
+    def _probe_opencv_fourcc() -> Optional[str]:
+        """First FourCC a VideoWriter opens with, tried on a tiny file in a temp directory."""
+        probe_dir = tempfile.mkdtemp(prefix='writer-probe-')
+        try:
+            path = os.path.join(probe_dir, 'probe.mp4')
+            for fourcc_str in OPENCV_FOURCCS:
+                writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc_str), 30.0, (64, 64))
+                opened = writer.isOpened()
+                writer.release()
+                if opened:
+                    return fourcc_str
+            return None
+        finally:
+            shutil.rmtree(probe_dir, ignore_errors=True)
+
+    def as_dict(self) -> dict:
+        return {
+            'ffmpeg': self.ffmpeg,
+            'ffprobe': self.ffprobe,
+            'libx264': self.libx264,
+            'remux': self.remux,
+            'opencv_fourcc': self.opencv_fourcc,
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def get_capabilities() -> EncoderCapabilities:
+    """Encoder capabilities of this process, probed on first use (call at startup to pay it early)."""
+    capabilities = EncoderCapabilities.probe()
+    logger.info(f"Video encoder capabilities: {capabilities.as_dict()}")
+    return capabilities
+
+
+@functools.lru_cache(maxsize=256)
+def _probe_video_stream(video_path: str, mtime: float, size: int) -> Optional[dict]:
+    """ffprobe codec_name/pix_fmt of the first video stream (cached per file version)."""
+    try:
+        result = subprocess.run(
+            [
+                'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+                '-show_entries', 'stream=codec_name,pix_fmt', '-of', 'json',
+                video_path
+            ],
+            capture_output=True, timeout=30
+        )
+        streams = json.loads(result.stdout or b'{}').get('streams') or []
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+    return streams[0] if streams else None
+
+
+# cv2.VideoCapture seeks to frame n by jumping to the last keyframe at or
+# before frame n - OPENCV_SEEK_BACKOFF and decoding forward from there, so
+# targets just after a keyframe decode the whole GOP before it.  Each seek
+# also restarts the decoder, which costs about SEEK_OVERHEAD_FRAMES grabs.
+OPENCV_SEEK_BACKOFF = 16
+SEEK_OVERHEAD_FRAMES = 10
+
+DEFAULT_KEYFRAME_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'swim_stroke_analyzer', 'keyframes')
+KEYFRAME_CACHE_MAX_ENTRIES = 512
+
+
+class KeyframeIndex:
+    """
+    Keyframe (GOP start) positions of a video's first video stream.
+
+    Built once per file from a demux-only pass (packets are read, nothing is
+    decoded) and numbered the way cv2.VideoCapture numbers frames, so its
+    frame numbers can be passed straight to CAP_PROP_POS_FRAMES.  Indexes
+    are cached in ``KeyframeIndex.cache_dir`` (None disables the cache),
+    keyed by the file's identity, size and mtime so renaming an upload
+    keeps its index.
+
+    seek() uses it to reach a frame with as little decoding as possible, and
+    seek_point() tells range planners where a seek is cheapest.  An index
+    without keyframes (the OpenCV build cannot demux) is valid: seek() then
+    does what CAP_PROP_POS_FRAMES does.
+
+    Attributes:
+        frame_numbers: (K,) frame number of each keyframe, ascending
+        timestamps: (K,) keyframe timestamps in seconds
+        frame_count: Number of frames (packets) in the stream
+    """
+
+    cache_dir: Optional[str] = DEFAULT_KEYFRAME_CACHE_DIR
+
+    def __init__(self, frame_numbers: np.ndarray, timestamps: np.ndarray, frame_count: int):
+        self.frame_numbers = np.asarray(frame_numbers, dtype=np.int64)
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.frame_count = int(frame_count)
+
+    def __len__(self) -> int:
+        return len(self.frame_numbers)
+
+    @classmethod
+    def empty(cls) -> 'KeyframeIndex':
+        return cls(np.zeros(0), np.zeros(0), 0)
+
+    @classmethod
+    def for_video(cls, video_path: str) -> 'KeyframeIndex':
+        """Keyframe index of a video: from memory, from the cache directory, or built."""
+        stat = os.stat(video_path)
+        return _keyframe_index(
+            os.path.abspath(video_path), cls.cache_dir,
+            (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        )
+
+    @classmethod
+    def build(cls, video_path: str) -> 'KeyframeIndex':
+        """Read the packets of the first video stream with OpenCV, without decoding them."""
+        cap = cv2.VideoCapture(video_path)
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            # Format -1 makes grab() return compressed packets
+            if fps <= 0 or not cap.set(cv2.CAP_PROP_FORMAT, -1):
+                return cls.empty()
+            frame_numbers, timestamps, count = [], [], 0
+            while cap.grab():
+                count += 1
+                if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                    seconds = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                    frame_numbers.append(int(round(seconds * fps)))
+                    timestamps.append(seconds)
+        finally:
+            cap.release()
+
+        # Packets come in decode order
+        order = np.argsort(frame_numbers, kind='stable')
+        return cls(np.asarray(frame_numbers)[order], np.asarray(timestamps)[order], count)
+
+    def save(self, path: str):
+        """Write the index to `path` atomically."""
+        fd, temp_path = tempfile.mkstemp(suffix='.npz', prefix='.tmp-', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                np.savez(fh, frame_numbers=self.frame_numbers, timestamps=self.timestamps,
+                         frame_count=self.frame_count)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> Optional['KeyframeIndex']:
+        """Read a cached index, or None if it is missing or unreadable."""
+        try:
+            with np.load(path) as data:
+                return cls(data['frame_numbers'], data['timestamps'], int(data['frame_count']))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+
+    def keyframe_at_or_before(self, frame_number: int) -> int:
+        """Frame number of the last keyframe at or before `frame_number` (0 if none)."""
+        i = int(np.searchsorted(self.frame_numbers, frame_number, side='right')) - 1
+        return int(self.frame_numbers[i]) if i >= 0 else 0
+
+    def gop_boundaries(self) -> List[Tuple[int, int]]:
+        """(start_frame, end_frame) of each group of pictures, end exclusive."""
+        ends = list(self.frame_numbers[1:]) + [self.frame_count]
+        return [(int(start), int(end)) for start, end in zip(self.frame_numbers, ends)]
+
+    def seek_point(self, frame_number: int) -> int:
+        """
+        Frame near `frame_number` that a capture reaches with the least decoding.
+
+        That is OPENCV_SEEK_BACKOFF frames after the nearest keyframe (frame 0
+        for the first GOP, which needs no seek at all); `frame_number` itself
+        without keyframes.
+        """
+        if not len(self):
+            return int(frame_number)
+        points = np.where(self.frame_numbers > 0, self.frame_numbers + OPENCV_SEEK_BACKOFF, 0)
+        return int(points[np.argmin(np.abs(points - frame_number))])
+
+    def seek(self, cap: cv2.VideoCapture, frame_number: int):
+        """
+        Position `cap` so its next read() returns frame `frame_number`.
+
+        Grabs forward from the current position when that decodes fewer
+        frames than CAP_PROP_POS_FRAMES would (from the keyframe before
+        frame_number - OPENCV_SEEK_BACKOFF, plus the decoder restart).
+        """
+        position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        if position == frame_number:
+            return
+        if len(self) and position < frame_number:
+            decode_from = self.keyframe_at_or_before(frame_number - OPENCV_SEEK_BACKOFF)
+            if frame_number - position <= frame_number - decode_from + SEEK_OVERHEAD_FRAMES:
+                for _ in range(frame_number - position):
+                    if not cap.grab():
+                        break
+                return
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+
+
+@functools.lru_cache(maxsize=64)
+def _keyframe_index(video_path: str, cache_dir: Optional[str], identity: Tuple[int, ...]) -> KeyframeIndex:
+    """KeyframeIndex.for_video for one version of a file (memoized per process)."""
+    if cache_dir is None:
+        return KeyframeIndex.build(video_path)
+
+    path = os.path.join(cache_dir, hashlib.sha256(repr(identity).encode()).hexdigest() + '.npz')
+    index = KeyframeIndex.load(path)
+    if index is not None:
+        try:
+            os.utime(path)  # Record the access for LRU eviction
+        except OSError:
+            pass
+        return index
+
+    index = KeyframeIndex.build(video_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        index.save(path)
+        _evict_keyframe_indexes(cache_dir)
+    except OSError as exc:
+        logger.warning(f"Could not cache the keyframe index of {video_path}: {exc}")
+    return index
+
+
+def _evict_keyframe_indexes(cache_dir: str):
+    """Delete the least recently used indexes beyond KEYFRAME_CACHE_MAX_ENTRIES."""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith('.npz') and not entry.name.startswith('.'):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
+    for _, path in sorted(entries)[:-KEYFRAME_CACHE_MAX_ENTRIES]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class FFmpegWriter:
+    """
+    VideoWriter-compatible sink that pipes raw BGR frames into ffmpeg.
+
+    Frames are encoded to H.264 (libx264, yuv420p) with the moov atom moved
+    to the front, so the output plays in browsers straight away and needs no
+    second encode through VideoProcessor.reencode_for_browser().
+    """
+
+    # The output is already browser-playable
+    browser_ready = True
+
+    def __init__(self, output_path: str, fps: float, width: int, height: int,
+                 preset: str = 'fast', crf: int = 23):
+        self.output_path = output_path
+        self._stderr = tempfile.TemporaryFile()  # A pipe could fill up and stall ffmpeg
+        self.proc = subprocess.Popen(
+            [
+                'ffmpeg', '-y', '-loglevel', 'error',
+                '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+                '-s', f'{width}x{height}', '-r', f'{fps:.6g}',
+                '-i', '-',
+                '-an',
+                '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',  # yuv420p needs even dimensions
+                '-vcodec', 'libx264',
+                '-preset', preset,
+                '-crf', str(crf),
+                '-pix_fmt', 'yuv420p',
+                '-movflags', '+faststart',  # Progressive download / streaming
+                output_path
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=self._stderr
+        )
+
+    def isOpened(self) -> bool:
+        return self.proc.poll() is None
+
+    def write(self, frame: np.ndarray):
+        """Send one BGR frame to the encoder."""
+        try:
+            self.proc.stdin.write(np.ascontiguousarray(frame).data)
+        except (BrokenPipeError, ValueError):
+            self.proc.wait()
+            raise RuntimeError(f"ffmpeg encoder exited early: {self._error()}")
+
+    def release(self):
+        """
+        Flush the encoder and wait for the file to be finalized.
+
+        Raises:
+            RuntimeError: If ffmpeg failed (see releasing() to release
+                without masking an exception already in flight)
+        """
+        if self.proc.stdin.closed:
+            return
+        try:
+            try:
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = self.proc.wait()
+            if returncode != 0:
+                raise RuntimeError(f"ffmpeg encode failed (exit {returncode}): {self._error()}")
+        finally:
+            self._stderr.close()
+
+    def _error(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read().decode(errors='replace')[:500]
+
+
+@contextlib.contextmanager
+def releasing(writer):
+    """
+    Release a video writer (FFmpegWriter or cv2.VideoWriter) when the block exits.
+
+    Unlike ``try/finally``, an encoder failure on release is only raised
+    when the block succeeded; if the block raised, that exception
+    propagates and the release failure is logged.
+    """
+    try:
+        yield writer
+    except BaseException:
+        try:
+            writer.release()
+        except Exception as exc:
+            logger.warning(f"Video writer release failed after an earlier error: {exc}")
+        raise
+    writer.release()
+
 
 class VideoProcessor:
     """Handles video file operations."""
@@ -32,6 +429,27 @@ class VideoProcessor:
 
         self.cap.release()  # Close until needed
 
+    def frame_range(self, start_seconds: Optional[float] = None,
+                    end_seconds: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Source frame range [start, end) of a time window of the video.
+
+        Args:
+            start_seconds: Window start (default: beginning of the video)
+            end_seconds: Window end (default: end of the video)
+
+        Raises:
+            ValueError: If the window is empty or starts after the video ends
+        """
+        start = 0 if start_seconds is None else int(round(start_seconds * self.fps))
+        end = self.frame_count if end_seconds is None else int(round(end_seconds * self.fps))
+        end = min(end, self.frame_count)
+        if start < 0 or start >= end:
+            raise ValueError(
+                f"Empty time range {start_seconds}-{end_seconds}s (video is {self.duration:.1f}s long)"
+            )
+        return start, end
+
     def get_video_info(self) -> dict:
         """Get video metadata."""
         return {
@@ -44,7 +462,7 @@ class VideoProcessor:
         }
 
     @staticmethod
-    def create_video_writer(output_path: str, fps: float, width: int, height: int) -> cv2.VideoWriter:
+    def create_video_writer(output_path: str, fps: float, width: int, height: int, use_ffmpeg: bool = True):
         """
         Create video writer for output.
 
@@ -53,37 +471,85 @@ class VideoProcessor:
             fps: Frames per second
             width: Frame width
             height: Frame height
+            use_ffmpeg: Stream frames into ffmpeg when it is installed
 
         Returns:
-            OpenCV VideoWriter object
+            FFmpegWriter (single-pass, browser-ready H.264) when ffmpeg is
+            available, otherwise an OpenCV VideoWriter.  Both have
+            write()/release()/isOpened(); check ``getattr(writer,
+            'browser_ready', False)`` to know whether reencode_for_browser()
+            is still needed.
         """
         # Create output directory if it doesn't exist
         os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
 
-        # Try H.264 first — works natively on macOS and when libx264 is installed.
-        # On Linux servers H.264 often requires ffmpeg; we fall back to mp4v and
-        # re-encode afterwards via VideoProcessor.reencode_for_browser().
-        for fourcc_str in ('avc1', 'H264', 'X264'):
+        capabilities = get_capabilities()
+        if use_ffmpeg and capabilities.libx264:
+            try:
+                writer = FFmpegWriter(output_path, fps, width, height)
+                if writer.isOpened():
+                    logger.debug("Streaming frames into ffmpeg (libx264)")
+                    return writer
+            except OSError as exc:
+                logger.warning(f"Could not start ffmpeg, falling back to OpenCV: {exc}")
+
+        # The FourCC found by the capability probe, and mp4v (supported
+        # everywhere by OpenCV) should that ever fail for this output
+        for fourcc_str in dict.fromkeys(filter(None, (capabilities.opencv_fourcc, 'mp4v'))):
             fourcc = cv2.VideoWriter_fourcc(*fourcc_str)
             writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
             if writer.isOpened():
-                logger.debug(f"VideoWriter opened with codec '{fourcc_str}'")
+                if fourcc_str == 'mp4v':
+                    # Call reencode_for_browser() after writing to make it playable in browsers.
+                    logger.warning(
+                        "VideoWriter fell back to mp4v codec. "
+                        "Call reencode_for_browser() after writing for browser compatibility."
+                    )
+                else:
+                    logger.debug(f"VideoWriter opened with codec '{fourcc_str}'")
                 return writer
             writer.release()
 
-        # Universal fallback — supported everywhere by OpenCV.
-        # Call reencode_for_browser() after writing to make it playable in browsers.
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-        if writer.isOpened():
-            logger.warning(
-                "VideoWriter fell back to mp4v codec. "
-                "Call reencode_for_browser() after writing for browser compatibility."
-            )
-            return writer
-
         raise ValueError(f"Failed to create video writer for: {output_path}")
 
+    @staticmethod
+    def concat_segments(segment_paths, output_path: str):
+        """
+        Join MP4 segments with identical encoder settings into one file.
+
+        Uses ffmpeg's concat demuxer with stream copy, so nothing is
+        re-encoded; the result gets +faststart like the segments.
+
+        Raises:
+            RuntimeError: If ffmpeg fails
+        """
+        list_fd, list_path = tempfile.mkstemp(suffix='.txt')
+        try:
+            with os.fdopen(list_fd, 'w') as fh:
+                for path in segment_paths:
+                    escaped = os.path.abspath(path).replace("'", "'\\''")
+                    fh.write(f"file '{escaped}'\n")
+
+            result = subprocess.run(
+                [
+                    'ffmpeg', '-y', '-loglevel', 'error',
+                    '-f', 'concat', '-safe', '0',
+                    '-i', list_path,
+                    '-c', 'copy',
+                    '-movflags', '+faststart',
+                    output_path
+                ],
+                capture_output=True,
+                timeout=900
+            )
+            if result.returncode != 0:
+                raise RuntimeError(
+                    f"ffmpeg concat failed (exit {result.returncode}): "
+                    f"{result.stderr.decode(errors='replace')[:500]}"
+                )
+        finally:
+            os.remove(list_path)
+
     @staticmethod
     def generate_output_path(input_path: str, suffix: str = "_analyzed") -> str:
         """
@@ -99,10 +565,35 @@ class VideoProcessor:
         base, ext = os.path.splitext(input_path)
         return f"{base}{suffix}{ext}"
 
+    @staticmethod
+    def probe_video_stream(video_path: str) -> Optional[dict]:
+        """
+        Codec of a video file's first video stream via ffprobe.
+
+        Returns:
+            ``{'codec_name', 'pix_fmt'}`` (e.g. h264 / yuv420p), or None if
+            ffprobe is unavailable or finds no video stream.  Results are
+            cached per process for each version (mtime, size) of the file.
+        """
+        if not get_capabilities().ffprobe:
+            return None
+        stat = os.stat(video_path)
+        return _probe_video_stream(os.path.abspath(video_path), stat.st_mtime, stat.st_size)
+
+    @staticmethod
+    def is_browser_compatible(stream: Optional[dict]) -> bool:
+        """Whether a probed stream plays in browsers without transcoding."""
+        return (stream is not None and stream.get('codec_name') in BROWSER_VIDEO_CODECS
+                and stream.get('pix_fmt') in BROWSER_PIXEL_FORMATS)
+
     @staticmethod
     def reencode_for_browser(video_path: str) -> bool:
         """
-        Re-encode a video to H.264 MP4 using ffmpeg so it plays in browsers.
+        Make a video play in browsers as an H.264 MP4 using ffmpeg.
+
+        Streams that are already H.264 (e.g. written by an avc1 VideoWriter)
+        are only remuxed with stream copy to move the index to the front;
+        anything else (mp4v) is transcoded with libx264.
 
         Performs an in-place replacement: writes to a temp file then atomically
         renames it over the original.  Safe to call even if ffmpeg is absent —
@@ -117,21 +608,23 @@ class VideoProcessor:
         base, ext = os.path.splitext(video_path)
         temp_path = f"{base}_reenc{ext}"
 
+        if not get_capabilities().ffmpeg:
+            logger.warning("ffmpeg not found — skipping browser re-encode")
+            return False
+
         try:
-            # Verify ffmpeg is available
-            subprocess.run(
-                ['ffmpeg', '-version'],
-                capture_output=True, check=True, timeout=10
-            )
+            remux = VideoProcessor.is_browser_compatible(VideoProcessor.probe_video_stream(video_path))
+            if remux:
+                codec_args = ['-c', 'copy']
+            else:
+                codec_args = ['-vcodec', 'libx264', '-preset', 'fast', '-crf', '23', '-pix_fmt', 'yuv420p',
+                              '-acodec', 'aac']
 
             result = subprocess.run(
                 [
                     'ffmpeg', '-y',
                     '-i', video_path,
-                    '-vcodec', 'libx264',
-                    '-preset', 'fast',
-                    '-crf', '23',
-                    '-acodec', 'aac',
+                    *codec_args,
                     '-movflags', '+faststart',  # Progressive download / streaming
                     temp_path
                 ],
@@ -141,7 +634,7 @@ class VideoProcessor:
 
             if result.returncode == 0 and os.path.exists(temp_path):
                 os.replace(temp_path, video_path)
-                logger.info(f"Re-encoded for browser: {video_path}")
+                logger.info(f"{'Remuxed' if remux else 'Re-encoded'} for browser: {video_path}")
                 return True
 
             logger.warning(
@@ -150,9 +643,6 @@ class VideoProcessor:
             )
             return False
 
-        except FileNotFoundError:
-            logger.warning("ffmpeg not found — skipping browser re-encode")
-            return False
         except subprocess.TimeoutExpired:
             logger.warning("ffmpeg re-encode timed out")
             return False
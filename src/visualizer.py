@@ -1,21 +1,95 @@
 """Visualizes pose data and annotations on video."""
 
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
 import cv2
 import numpy as np
-import mediapipe as mp
-from typing import List, Dict, Optional
-from src.video_processor import VideoProcessor
+from typing import Callable, Iterable, List, Dict, Optional, Tuple, Union
+from src.highlights import find_highlights
+from src.kinematics import KinematicsTable
+from src.pose_track import LANDMARK_INDEX, SKELETON_CONNECTIONS, VISIBILITY, X, Y, PoseTrack
+from src.video_processor import FFmpegWriter, KeyframeIndex, VideoProcessor, get_capabilities, releasing
 from src.models.freestyle_rules import get_severity_emoji
 
+# Stats panel geometry: a 70% black box in the top-left corner (inclusive
+# corner coordinates, as drawn by cv2.rectangle) with a progress bar near
+# its bottom edge.
+STATS_PANEL_WIDTH = 400
+STATS_PANEL_HEIGHT = 200
+STATS_PANEL_OPACITY = 0.7
+
+# Parallel rendering: chunks shorter than this are not worth a process
+MIN_RENDER_CHUNK_FRAMES = 300
+RENDER_PROGRESS_EVERY = 30
+
+# An analyzed pose is drawn on the frames after it for at most this long, so
+# nothing stale is shown between analyzed segments (rest at the wall)
+POSE_HOLD_SECONDS = 1.0
+
+
+class _PoseLayer:
+    """
+    Pose overlay of one track row, rasterized once and stamped onto frames.
+
+    Skipped (unanalyzed) frames reuse the previous row's pose, so the same
+    skeleton and annotations are copied from the cached layer instead of
+    being redrawn.  Drawing happens on a frame-sized canvas pre-filled with
+    a key colour that no overlay uses; only a box around the landmarks is
+    filled and read back.
+    """
+
+    KEY = (255, 0, 255)  # Magenta: not used by any overlay
+    PAD = 100  # Pixels around the landmarks covered by the layer (angle labels included)
+
+    def __init__(self, frame_shape):
+        self.canvas = np.empty((frame_shape[0], frame_shape[1], 3), dtype=np.uint8)
+        self.row = None
+        self.region = None
+        self.mask = None
+
+    def render(self, row: int, points: np.ndarray, draw):
+        """Rasterize the overlay of `row` with `draw(canvas)` unless it is already cached."""
+        if row == self.row:
+            return
+        self.row = row
+        self.region = None
+        if not len(points):
+            return
+
+        h, w = self.canvas.shape[:2]
+        x0, y0 = np.maximum(points.min(axis=0).astype(int) - self.PAD, 0)
+        x1 = min(w, int(points[:, 0].max()) + self.PAD + 1)
+        y1 = min(h, int(points[:, 1].max()) + self.PAD + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        self.region = (slice(y0, y1), slice(x0, x1))
+        view = self.canvas[self.region]
+        view[:] = self.KEY
+        draw(self.canvas)
+        self.mask = np.any(view != self.KEY, axis=-1)
+
+    def apply(self, frame: np.ndarray):
+        """Copy the cached overlay pixels onto `frame`."""
+        if self.region is not None:
+            np.copyto(frame[self.region], self.canvas[self.region], where=self.mask[..., None])
+
 
 class Visualizer:
     """Creates annotated videos with pose overlays and metrics."""
 
     def __init__(self):
         """Initialize visualizer."""
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_pose = mp.solutions.pose
-        self.drawing_spec = self.mp_drawing.DrawingSpec(thickness=2, circle_radius=2)
+        # Same visibility cut-off MediaPipe's drawing utils use
+        self.skeleton_min_visibility = 0.5
+        self.skeleton_edges = [(LANDMARK_INDEX[a], LANDMARK_INDEX[b]) for a, b in SKELETON_CONNECTIONS]
+        # Set by create_annotated_video: True when the output is already
+        # browser-playable H.264, so reencode_for_browser() can be skipped
+        self.encoded_for_browser = False
 
         # Colors (BGR format)
         self.COLOR_SKELETON = (0, 255, 0)  # Green
@@ -27,10 +101,12 @@ class Visualizer:
 
     def create_annotated_video(
         self,
-        pose_data: List[Dict],
+        pose_data: Union[PoseTrack, List[Dict]],
         output_path: str,
         analysis_results: Dict,
-        original_video_path: str
+        original_video_path: str,
+        workers: int = 1,
+        frame_range: Optional[Tuple[int, int]] = None
     ) -> str:
         """
         Create annotated video with pose overlay and metrics.
@@ -39,24 +115,47 @@ class Visualizer:
         stores frames) to avoid memory exhaustion on long videos.
 
         Args:
-            pose_data: List of frame data with pose information (no 'frame' key)
+            pose_data: PoseTrack (or list of per-frame dictionaries) from the detector
             output_path: Path to save annotated video
             analysis_results: Results from stroke analyzer
             original_video_path: Path to original video for metadata
+            workers: Number of render processes.  Values above 1 split the
+                timeline into contiguous chunks that are rendered and encoded
+                in parallel, then joined without re-encoding (needs ffmpeg).
+            frame_range: Only render source frames [start, end), seeking
+                straight to ``start`` (default: the whole video)
 
         Returns:
             Path to created video
         """
-        if not pose_data:
+        if not len(pose_data):
             raise ValueError("No pose data to visualize")
 
-        # Build a fast lookup: frame_number -> pose
-        pose_lookup = {fd['frame_number']: fd['pose'] for fd in pose_data}
+        track = PoseTrack.from_frames(pose_data)
 
         # Get video properties
         video_info = VideoProcessor(original_video_path).get_video_info()
         total_frames = video_info['frame_count']
 
+        print(f"\nCreating annotated video...")
+        print(f"Output: {output_path}")
+
+        start_frame, end_frame = frame_range if frame_range is not None else (0, None)
+        parallel = workers > 1 and get_capabilities().libx264
+        keyframes = None
+        if start_frame > 0 or parallel:
+            keyframes = KeyframeIndex.for_video(original_video_path)
+        chunks = [(start_frame, end_frame)]
+        if parallel:
+            chunks = self._plan_chunks(total_frames, workers, frame_range, keyframes)
+        if len(chunks) > 1:
+            self._render_parallel(
+                track, analysis_results, original_video_path, video_info, chunks, output_path, keyframes
+            )
+            self.encoded_for_browser = True
+            print(f"Completed: {output_path}")
+            return output_path
+
         # Create video writer
         writer = VideoProcessor.create_video_writer(
             output_path,
@@ -65,85 +164,281 @@ class Visualizer:
             video_info['height']
         )
 
-        # Re-open original video for frame-by-frame reading
-        cap = cv2.VideoCapture(original_video_path)
+        frames = self._read_video(original_video_path, start_frame, end_frame, keyframes)
 
-        print(f"\nCreating annotated video...")
-        print(f"Output: {output_path}")
+        render_frames = (end_frame or total_frames) - start_frame
 
-        frame_idx = 0
-        last_pose = None  # Forward-fill pose on frames that were skipped during analysis
+        def report(frame_idx):
+            print(f"Rendered {frame_idx - start_frame}/{render_frames} frames")
 
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
+        with releasing(writer):
+            self._render_frames(
+                frames, writer, track, KinematicsTable(track), analysis_results, video_info,
+                start_frame=start_frame, on_progress=report
+            )
+        self.encoded_for_browser = getattr(writer, 'browser_ready', False)
+        print(f"Completed: {output_path}")
 
-            # Use analyzed pose for this frame, or forward-fill from last known pose
-            if frame_idx in pose_lookup:
-                last_pose = pose_lookup[frame_idx]
-            pose = last_pose
+        return output_path
+
+    def create_highlight_clips(
+        self,
+        pose_data: Union[PoseTrack, List[Dict]],
+        analysis_results: Dict,
+        original_video_path: str,
+        output_prefix: str,
+        summary_path: Optional[str] = None,
+        highlights: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        Render short annotated clips around the worst moment of each issue.
+
+        Only the frames inside the clip windows are decoded and encoded,
+        instead of the whole video.  Clips the writer could not encode for
+        browsers are re-encoded with ffmpeg, so the reel can always be
+        joined without re-encoding; without ffmpeg there is no reel.
 
-            # Draw pose if detected
-            if pose is not None:
-                frame = self._draw_pose(frame, pose)
-                frame = self._draw_metrics_overlay(frame, pose, analysis_results)
+        Args:
+            pose_data: PoseTrack (or list of per-frame dictionaries) from the detector
+            analysis_results: Results from stroke analyzer
+            original_video_path: Path to original video
+            output_prefix: Clips are written to ``<output_prefix>_<n>_<issue>.mp4``
+            summary_path: Also join all clips into one summary reel here
+            highlights: Clip windows (default: src.highlights.find_highlights)
+
+        Returns:
+            Dictionary with ``clips`` (the highlight dictionaries, each with
+            its ``path`` added) and ``summary`` (reel path or None)
+        """
+        track = PoseTrack.from_frames(pose_data)
+        if highlights is None:
+            highlights = find_highlights(track, analysis_results)
+        if not highlights:
+            return {'clips': [], 'summary': None}
+
+        features = KinematicsTable(track)
+        video_info = VideoProcessor(original_video_path).get_video_info()
+        keyframes = KeyframeIndex.for_video(original_video_path)
+        print(f"\nCreating {len(highlights)} highlight clips...")
+
+        clips = []
+        browser_ready = True
+        for n, highlight in enumerate(highlights, start=1):
+            path = f"{output_prefix}_{n}_{highlight['issue'].issue_type}.mp4"
+            writer = VideoProcessor.create_video_writer(
+                path, video_info['fps'], video_info['width'], video_info['height']
+            )
+            with releasing(writer):
+                self._render_frames(
+                    self._read_video(
+                        original_video_path, highlight['start_frame'], highlight['end_frame'], keyframes
+                    ),
+                    writer, track, features, analysis_results, video_info,
+                    start_frame=highlight['start_frame']
+                )
+            if not getattr(writer, 'browser_ready', False):
+                browser_ready &= VideoProcessor.reencode_for_browser(path)
+            clips.append(dict(highlight, path=path))
+            print(f"  {path} ({highlight['start_time']:.1f}-{highlight['end_time']:.1f}s)")
+
+        self.encoded_for_browser = browser_ready
+        summary = None
+        if summary_path is not None:
+            if browser_ready:
+                # Same encoder settings for every clip, so they join without re-encoding
+                VideoProcessor.concat_segments([clip['path'] for clip in clips], summary_path)
+                summary = summary_path
+                print(f"  Summary reel: {summary_path}")
+            else:
+                print("  (ffmpeg not found — skipping browser re-encode and summary reel)")
+
+        return {'clips': clips, 'summary': summary}
+
+    def _render_frames(
+        self,
+        frames: Iterable[np.ndarray],
+        writer,
+        track: PoseTrack,
+        features: KinematicsTable,
+        analysis_results: Dict,
+        video_info: Dict,
+        start_frame: int = 0,
+        on_progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Annotate `frames` (source frames from `start_frame` on) and write them.
+
+        Calls ``on_progress(frame_idx)`` every RENDER_PROGRESS_EVERY frames;
+        returns the number of frames written.
+        """
+        total_frames = video_info['frame_count']
+        hold_frames = max(1, int(round(video_info['fps'] * POSE_HOLD_SECONDS)))
+
+        # Forward-fill pose on frames that were skipped during analysis,
+        # starting from the last analyzed frame before this range
+        last_row = int(np.searchsorted(track.frame_numbers, start_frame, side='right')) - 1
+        if last_row < 0:
+            last_row = None
+
+        # Static parts of the overlays, rendered once per video
+        frame_shape = (video_info['height'], video_info['width'])
+        panel = self._build_stats_panel(analysis_results, frame_shape)
+        pose_layer = _PoseLayer(frame_shape)
+
+        def draw_row(canvas):
+            self._draw_pose(canvas, track.landmarks[last_row])
+            self._draw_metrics_overlay(canvas, track, features, last_row, analysis_results)
+
+        frame_idx = start_frame
+        for frame in frames:
+            # Use analyzed pose for this frame, or forward-fill from last known pose
+            row = track.index_of(frame_idx)
+            if row is not None:
+                last_row = row
+
+            # Draw pose if detected (and recent)
+            if (last_row is not None and track.detected[last_row]
+                    and frame_idx - track.frame_numbers[last_row] < hold_frames):
+                landmarks = track.landmarks[last_row]
+                visible = landmarks[:, VISIBILITY] >= self.skeleton_min_visibility
+                pose_layer.render(last_row, landmarks[visible][:, [X, Y]], draw_row)
+                pose_layer.apply(frame)
 
             # Draw overall stats in corner
-            frame = self._draw_stats_panel(frame, analysis_results, frame_idx, total_frames)
+            frame = self._draw_stats_panel(frame, analysis_results, frame_idx, total_frames, last_row, panel)
 
             writer.write(frame)
             frame_idx += 1
 
-            if frame_idx % 30 == 0:
-                print(f"Rendered {frame_idx}/{total_frames} frames")
+            if on_progress is not None and (frame_idx - start_frame) % RENDER_PROGRESS_EVERY == 0:
+                on_progress(frame_idx)
 
-        cap.release()
-        writer.release()
-        print(f"Completed: {output_path}")
+        return frame_idx - start_frame
 
-        return output_path
+    @staticmethod
+    def _plan_chunks(
+        total_frames: int,
+        workers: int,
+        frame_range: Optional[Tuple[int, int]] = None,
+        keyframes: Optional[KeyframeIndex] = None
+    ) -> List[Tuple[int, Optional[int]]]:
+        """
+        Split the timeline (or `frame_range`) into at most `workers` (start, end) frame ranges.
 
-    def _draw_pose(self, frame: np.ndarray, pose: Dict) -> np.ndarray:
-        """Draw pose skeleton on frame."""
-        if pose['raw_landmarks'] is None:
-            return frame
-
-        # Draw landmarks and connections
-        self.mp_drawing.draw_landmarks(
-            frame,
-            pose['raw_landmarks'],
-            self.mp_pose.POSE_CONNECTIONS,
-            landmark_drawing_spec=self.mp_drawing.DrawingSpec(
-                color=self.COLOR_SKELETON,
-                thickness=2,
-                circle_radius=3
-            ),
-            connection_drawing_spec=self.mp_drawing.DrawingSpec(
-                color=self.COLOR_SKELETON,
-                thickness=2
-            )
+        With `keyframes` every chunk after the first starts at the
+        KeyframeIndex.seek_point nearest an even split, so its worker
+        decodes only from the keyframe before it instead of a whole
+        previous GOP.  The last range of the whole timeline runs to EOF
+        (end None).
+        """
+        start, end = frame_range if frame_range is not None else (0, total_frames)
+        last = end if frame_range is not None else None
+        workers = max(1, min(workers, (end - start) // MIN_RENDER_CHUNK_FRAMES))
+        if workers <= 1:
+            return [(start, last)]
+        bounds = [start + round(i * (end - start) / workers) for i in range(workers)]
+        if keyframes is not None and len(keyframes):
+            moved = (keyframes.seek_point(bound) for bound in bounds[1:])
+            bounds = sorted({start, *(bound for bound in moved if start < bound < end)})
+        return list(zip(bounds, bounds[1:] + [last]))
+
+    def _render_parallel(
+        self,
+        track: PoseTrack,
+        analysis_results: Dict,
+        video_path: str,
+        video_info: Dict,
+        chunks: List[Tuple[int, Optional[int]]],
+        output_path: str,
+        keyframes: Optional[KeyframeIndex] = None
+    ):
+        """Render chunks in worker processes, each to its own H.264 segment, and concatenate them."""
+        total_frames = (chunks[-1][1] or video_info['frame_count']) - chunks[0][0]
+        print(f"Rendering {len(chunks)} chunks in parallel")
+
+        # 'spawn' matches pose detection sharding (no fork of a process holding MediaPipe)
+        ctx = multiprocessing.get_context('spawn')
+        rendered = ctx.Value('l', 0)  # Frames rendered so far across all chunks
+        segment_dir = tempfile.mkdtemp(
+            prefix='.render-', dir=os.path.dirname(os.path.abspath(output_path))
         )
+        try:
+            segments = [os.path.join(segment_dir, f'{i:04d}.mp4') for i in range(len(chunks))]
+            with ProcessPoolExecutor(
+                max_workers=len(chunks), mp_context=ctx, initializer=_init_render_worker,
+                initargs=(track, analysis_results, video_path, video_info, rendered, keyframes)
+            ) as pool:
+                pending = {
+                    pool.submit(_render_chunk, start, end, segment)
+                    for (start, end), segment in zip(chunks, segments)
+                }
+                while pending:
+                    done, pending = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()  # Surface worker errors
+                    print(f"Rendered {rendered.value}/{total_frames} frames "
+                          f"({len(chunks) - len(pending)}/{len(chunks)} chunks done)")
+
+            VideoProcessor.concat_segments(segments, output_path)
+        finally:
+            shutil.rmtree(segment_dir, ignore_errors=True)
 
-        return frame
+    @staticmethod
+    def _read_video(video_path: str, start_frame: int = 0, end_frame: Optional[int] = None,
+                    keyframes: Optional[KeyframeIndex] = None):
+        """
+        Yield the frames of a video file in order, from `start_frame` up to `end_frame` (None = EOF).
+
+        `keyframes` (the video's KeyframeIndex) makes the seek to `start_frame` decode less.
+        """
+        cap = cv2.VideoCapture(video_path)
+        try:
+            (keyframes or KeyframeIndex.empty()).seek(cap, start_frame)
+            frame_idx = start_frame
+            while cap.isOpened() and (end_frame is None or frame_idx < end_frame):
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                yield frame
+                frame_idx += 1
+        finally:
+            cap.release()
+
+    def _draw_pose(self, frame: np.ndarray, landmarks: np.ndarray) -> np.ndarray:
+        """
+        Draw pose skeleton on frame.
+
+        Args:
+            landmarks: (L, 4) PoseTrack row of [x, y, z, visibility] in pixels
+        """
+        visible = landmarks[:, VISIBILITY] >= self.skeleton_min_visibility
+        points = np.rint(landmarks[:, [X, Y]]).astype(int)
 
-    def _draw_metrics_overlay(self, frame: np.ndarray, pose: Dict, analysis: Dict) -> np.ndarray:
-        """Draw real-time metrics overlay on frame."""
-        landmarks = pose['landmarks']
+        # Draw connections, then landmarks on top
+        for a, b in self.skeleton_edges:
+            if visible[a] and visible[b]:
+                cv2.line(frame, tuple(points[a]), tuple(points[b]), self.COLOR_SKELETON, 2)
+        for point in points[visible]:
+            cv2.circle(frame, tuple(point), 3, self.COLOR_SKELETON, 2)
 
+        return frame
+
+    def _draw_metrics_overlay(
+        self,
+        frame: np.ndarray,
+        track: PoseTrack,
+        features: KinematicsTable,
+        row: int,
+        analysis: Dict
+    ) -> np.ndarray:
+        """Draw real-time metrics overlay on frame for row `row` of the track."""
         # Draw elbow angle
         if analysis['metrics'].get('elbow', {}).get('avg_angle') is not None:
             # Left elbow
-            left_shoulder = landmarks['left_shoulder']
-            left_elbow = landmarks['left_elbow']
-            left_wrist = landmarks['left_wrist']
-
-            if (left_shoulder['visibility'] > 0.5 and
-                left_elbow['visibility'] > 0.5 and
-                left_wrist['visibility'] > 0.5):
-
-                angle = self._calculate_angle(left_shoulder, left_elbow, left_wrist)
-                elbow_pos = (int(left_elbow['x']), int(left_elbow['y']))
+            if features.angle_min_visibility('left_elbow')[row] > 0.5:
+                angle = features.angle('left_elbow')[row]
+                left_elbow = track.landmarks[row, LANDMARK_INDEX['left_elbow']]
+                elbow_pos = (int(left_elbow[X]), int(left_elbow[Y]))
 
                 # Color based on angle quality
                 color = self._get_angle_color(angle, 80, 100, 120)
@@ -151,28 +446,44 @@ class Visualizer:
 
         return frame
 
-    def _draw_stats_panel(
-        self,
-        frame: np.ndarray,
-        analysis: Dict,
-        current_frame: int,
-        total_frames: int
-    ) -> np.ndarray:
-        """Draw stats panel in corner of frame."""
-        h, w = frame.shape[:2]
+    def _build_stats_panel(self, analysis: Dict, frame_shape) -> Dict:
+        """
+        Pre-render the parts of the stats panel that are the same on every frame.
 
-        # Semi-transparent overlay
-        overlay = frame.copy()
-        panel_height = 200
-        cv2.rectangle(overlay, (0, 0), (400, panel_height), self.COLOR_TEXT_BG, -1)
-        frame = cv2.addWeighted(overlay, 0.7, frame, 0.3, 0)
+        The panel box and its title and metric lines are drawn once on a
+        black and on a white canvas; the two renderings give each pixel's
+        text coverage, so the panel reduces to ``frame * keep + add`` over
+        its region.
 
-        # Draw text
+        Returns:
+            Dictionary with the ``keep`` and ``add`` float32 layers (clipped
+            to the frame) and ``text_y``, the baseline for the next line.
+        """
+        h = min(frame_shape[0], STATS_PANEL_HEIGHT + 1)
+        w = min(frame_shape[1], STATS_PANEL_WIDTH + 1)
+
+        renders = []
+        for background in (0, 255):
+            canvas = np.full((STATS_PANEL_HEIGHT + 1, STATS_PANEL_WIDTH + 1, 3), background, dtype=np.uint8)
+            text_y = self._draw_stats_text(canvas, analysis)
+            renders.append(canvas[:h, :w].astype(np.float32))
+        on_black, on_white = renders
+
+        # Text over the box: out = coverage * color + (1 - coverage) * (1 - opacity) * frame
+        uncovered = (on_white - on_black) / 255.0
+        return {
+            'keep': uncovered * (1.0 - STATS_PANEL_OPACITY),
+            'add': on_black + 0.5,  # Rounds when truncated to uint8
+            'text_y': text_y,
+        }
+
+    def _draw_stats_text(self, canvas: np.ndarray, analysis: Dict) -> int:
+        """Draw the panel title and video-level metrics; returns the y offset for the next line."""
         y_offset = 30
         line_height = 25
 
         # Title
-        self._draw_text(frame, "FREESTYLE ANALYSIS", (10, y_offset), scale=0.6, thickness=2)
+        self._draw_text(canvas, "FREESTYLE ANALYSIS", (10, y_offset), scale=0.6, thickness=2)
         y_offset += line_height + 5
 
         # Metrics
@@ -182,7 +493,7 @@ class Visualizer:
             elbow_avg = metrics['elbow']['avg_angle']
             color = self._get_angle_color(elbow_avg, 80, 100, 120)
             self._draw_text(
-                frame,
+                canvas,
                 f"Elbow Angle: {elbow_avg:.0f}deg",
                 (10, y_offset),
                 scale=0.5,
@@ -194,7 +505,7 @@ class Visualizer:
             rotation_avg = metrics['rotation']['avg_rotation']
             color = self._get_angle_color(rotation_avg, 45, 60, 30, reverse=True)
             self._draw_text(
-                frame,
+                canvas,
                 f"Body Rotation: {rotation_avg:.0f}deg",
                 (10, y_offset),
                 scale=0.5,
@@ -205,19 +516,61 @@ class Visualizer:
         if metrics.get('stroke_rate', {}).get('spm') is not None:
             spm = metrics['stroke_rate']['spm']
             self._draw_text(
-                frame,
+                canvas,
                 f"Stroke Rate: {spm:.0f} SPM",
                 (10, y_offset),
                 scale=0.5
             )
             y_offset += line_height
 
+        return y_offset
+
+    def _draw_stats_panel(
+        self,
+        frame: np.ndarray,
+        analysis: Dict,
+        current_frame: int,
+        total_frames: int,
+        row: Optional[int] = None,
+        panel: Optional[Dict] = None
+    ) -> np.ndarray:
+        """
+        Draw stats panel in corner of frame.
+
+        Args:
+            row: Current pose track row, for the cycle counter
+            panel: Result of _build_stats_panel for this video (built here if omitted)
+        """
+        if panel is None:
+            panel = self._build_stats_panel(analysis, frame.shape)
+
+        # Blend the pre-rendered panel into its region only
+        keep, add = panel['keep'], panel['add']
+        roi = frame[:keep.shape[0], :keep.shape[1]]
+        np.copyto(roi, roi * keep + add, casting='unsafe')
+
+        line_height = 25
+        y_offset = panel['text_y']
+
+        # Current left-arm stroke cycle, an O(1) lookup into the cycle index
+        cycles = analysis.get('cycles')
+        if cycles is not None and row is not None and cycles.count('left'):
+            cycle = cycles.cycle_of_row('left')[row]
+            if cycle >= 0:
+                self._draw_text(
+                    frame,
+                    f"Stroke Cycle: {cycle + 1}/{cycles.count('left')}",
+                    (10, y_offset),
+                    scale=0.5
+                )
+                y_offset += line_height
+
         # Progress bar
         progress = current_frame / total_frames
         bar_width = 380
         bar_height = 10
         bar_x = 10
-        bar_y = panel_height - 30
+        bar_y = STATS_PANEL_HEIGHT - 30
 
         cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), (100, 100, 100), -1)
         cv2.rectangle(frame, (bar_x, bar_y), (bar_x + int(bar_width * progress), bar_y + bar_height), (0, 255, 0), -1)
@@ -293,18 +646,45 @@ class Visualizer:
             else:
                 return self.COLOR_MODERATE
 
-    @staticmethod
-    def _calculate_angle(point1: Dict, point2: Dict, point3: Dict) -> float:
-        """Calculate angle between three points."""
-        p1 = np.array([point1['x'], point1['y']])
-        p2 = np.array([point2['x'], point2['y']])
-        p3 = np.array([point3['x'], point3['y']])
 
-        v1 = p1 - p2
-        v2 = p3 - p2
-
-        cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
-        cos_angle = np.clip(cos_angle, -1.0, 1.0)
-        angle = np.arccos(cos_angle)
+# Per-process state of parallel render workers, set once by _init_render_worker
+_render_worker = {}
+
+
+def _init_render_worker(track: PoseTrack, analysis_results: Dict, video_path: str,
+                        video_info: Dict, rendered, keyframes: Optional[KeyframeIndex] = None):
+    """Worker-process initializer: receive the shared render inputs once per process."""
+    _render_worker.update(
+        visualizer=Visualizer(),
+        track=track,
+        features=KinematicsTable(track),
+        analysis_results=analysis_results,
+        video_path=video_path,
+        video_info=video_info,
+        rendered=rendered,
+        keyframes=keyframes,
+    )
+
+
+def _render_chunk(start_frame: int, end_frame: Optional[int], segment_path: str) -> int:
+    """Worker-process entry point: render frames [start_frame, end_frame) to an H.264 segment."""
+    state = _render_worker
+    visualizer = state['visualizer']
+    video_info = state['video_info']
+
+    def report(frame_idx):
+        with state['rendered'].get_lock():
+            state['rendered'].value += RENDER_PROGRESS_EVERY
+
+    # Every segment uses the same encoder settings so they concatenate without re-encoding
+    writer = FFmpegWriter(segment_path, video_info['fps'], video_info['width'], video_info['height'])
+    with releasing(writer):
+        count = visualizer._render_frames(
+            visualizer._read_video(state['video_path'], start_frame, end_frame, state['keyframes']),
+            writer, state['track'], state['features'], state['analysis_results'], video_info,
+            start_frame=start_frame, on_progress=report
+        )
 
-        return np.degrees(angle)
+    with state['rendered'].get_lock():
+        state['rendered'].value += count % RENDER_PROGRESS_EVERY
+    return count